@@ -6,6 +6,8 @@ from user_profile.profile_api import router as user_profile_router
 from food_info.info_api import router as food_info_router
 from recommender.recs_api import router as recommender_router
 from vapi.vapi_endpoints import router as vapi_router
+from util.chat.gpt_client import close_async_anthropic_clients
+from recommender.audit import recommendation_audit
 from config import settings
 from database import init_db
 import uvicorn
@@ -26,8 +28,11 @@ async def lifespan(app: FastAPI):
     logger.info("Initializing database...")
     init_db()
     logger.info("Database initialized successfully")
+    await recommendation_audit.start()
     yield
     # Shutdown
+    await recommendation_audit.stop()
+    await close_async_anthropic_clients()
     logger.info("Application shutdown")
 
 
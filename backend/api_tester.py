@@ -22,6 +22,7 @@ import argparse
 import sys
 import random
 import os
+import time
 from typing import Optional
 
 
@@ -311,7 +312,51 @@ class APITester:
                 print(f"❌ Recommendation error: {str(e)}\nTraceback:\n{tb_str}")
                 return False
 
-    async def run_full_test(self, google_id_token: str) -> bool:
+    async def test_concurrent_recommendations(
+        self, restaurant_id: str, concurrency: int = 5
+    ) -> bool:
+        """Test that parallel recommendation calls overlap instead of queueing"""
+        print(
+            f"\n⚡ Testing {concurrency} concurrent recommendations for restaurant {restaurant_id}..."
+        )
+
+        async def timed_request(client: httpx.AsyncClient, index: int) -> float:
+            start = time.perf_counter()
+            response = await client.post(
+                f"{self.base_url}/recs/{restaurant_id}",
+                # Distinct dislikes so no request can be answered from another's work
+                json={"curr_dislikes": [f"concurrency probe {index}"]},
+                headers=self._get_headers(),
+            )
+            response.raise_for_status()
+            return time.perf_counter() - start
+
+        async with httpx.AsyncClient(timeout=120.0) as client:
+            try:
+                wall_start = time.perf_counter()
+                latencies = await asyncio.gather(
+                    *(timed_request(client, i) for i in range(concurrency))
+                )
+                wall_time = time.perf_counter() - wall_start
+
+                serial_time = sum(latencies)
+                # If the server handled the calls one after another, the wall
+                # time would be close to the sum of the individual latencies
+                overlapped = concurrency < 2 or wall_time < serial_time * 0.6
+
+                print(f"   Individual latencies: {[round(l, 2) for l in latencies]}s")
+                print(f"   Wall time: {wall_time:.2f}s (serial would be ~{serial_time:.2f}s)")
+                if overlapped:
+                    print("✅ Concurrent recommendations overlapped!")
+                else:
+                    print("❌ Recommendations ran one after another")
+                return overlapped
+
+            except Exception as e:
+                print(f"❌ Concurrent recommendation error: {str(e)}")
+                return False
+
+    async def run_full_test(self, google_id_token: str, concurrency: int = 0) -> bool:
         """Run the complete test suite"""
         print("🚀 Starting Food Recommender API Test Suite")
         print("=" * 50)
@@ -346,6 +391,12 @@ class APITester:
         if not await self.test_get_recommendation(restaurant_id):
             return False
 
+        # Step 7: Check that parallel recommendations don't block each other
+        if concurrency and not await self.test_concurrent_recommendations(
+            restaurant_id, concurrency
+        ):
+            return False
+
         print("\n" + "=" * 50)
         print("🎉 All tests completed successfully!")
         return True
@@ -358,6 +409,12 @@ async def main():
     parser.add_argument(
         "--base-url", default="http://localhost:8000", help="API base URL"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=5,
+        help="Number of parallel /recs calls for the concurrency test (0 to skip)",
+    )
 
     args = parser.parse_args()
 
@@ -372,7 +429,7 @@ async def main():
     tester = APITester(args.base_url)
 
     try:
-        success = await tester.run_full_test(google_token)
+        success = await tester.run_full_test(google_token, args.concurrency)
         sys.exit(0 if success else 1)
     except KeyboardInterrupt:
         print("\n⚠️ Test interrupted by user")
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the recommendation hot paths.
+
+Runs against the processed restaurant catalog loaded in memory, with no
+network calls. Usage:
+
+    python benchmarks.py local-engine [--iterations N]
+    python benchmarks.py prompt [--iterations N]
+    python benchmarks.py fuzzy [--iterations N]
+    python benchmarks.py fuzzy-batch [--iterations N]
+    python benchmarks.py fuzzy-topk [--iterations N]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from food_info.info_api import RESTAURANTS_CACHE, get_catalog_version
+from recommender.local_engine import MenuFeatures, local_recommender
+from util.chat.gpt_client import ClaudeClient
+from util.formatting.prompt_builder import PromptBuilder
+from util.fuzzy_match import FuzzyIndex, FuzzyMatcher
+
+# A profile that exercises every scoring signal
+SAMPLE_PROFILE = {
+    "dietary_restrictions": [{"name": "vegetarian", "severity": "preference"}],
+    "cuisine_preferences": [{"cuisine_type": "Italian", "preference_level": 5}],
+    "flavor_profile": {"spicy_tolerance": 4, "sweet_preference": 2, "umami_preference": 5},
+    "liked_foods": [{"name": "mushroom pizza"}, {"name": "dumplings"}],
+    "disliked_foods": [{"name": "olives"}],
+    "price_range_preference": "mid-range",
+}
+
+
+def _time_per_call(func: Callable[[], object], iterations: int) -> List[float]:
+    """Wall time of each call in microseconds"""
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1e6)
+    return timings
+
+
+def _report(label: str, timings: List[float]) -> None:
+    timings = sorted(timings)
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(
+        f"  {label:<22} median {statistics.median(timings):9.1f} us"
+        f"   p99 {p99:9.1f} us"
+    )
+
+
+def bench_local_engine(iterations: int) -> None:
+    """Local engine scoring vs. the old first-item mock, per restaurant"""
+    mock = ClaudeClient(api_key=None)._mock_claude_response
+
+    for restaurant_id, restaurant_data in RESTAURANTS_CACHE.items():
+        menu_items = restaurant_data.get("menu_items", [])
+        dislikes = [item["name"] for item in menu_items[:3]]
+
+        started = time.perf_counter()
+        MenuFeatures(restaurant_data)
+        build_ms = (time.perf_counter() - started) * 1e3
+
+        features = local_recommender.get_features(
+            restaurant_id, restaurant_data, get_catalog_version(restaurant_id)
+        )
+        print(
+            f"{restaurant_data.get('name', restaurant_id)} "
+            f"({len(features)} items x {len(features.vocabulary)} words, "
+            f"feature build {build_ms:.1f} ms)"
+        )
+        _report(
+            "mock",
+            _time_per_call(lambda: mock(menu_items, dislikes), iterations),
+        )
+        _report(
+            "local engine",
+            _time_per_call(
+                lambda: local_recommender.recommend(features, SAMPLE_PROFILE, dislikes),
+                iterations,
+            ),
+        )
+        _report(
+            "local engine (top 5)",
+            _time_per_call(
+                lambda: local_recommender.recommend(
+                    features, SAMPLE_PROFILE, dislikes, num_items=5
+                ),
+                iterations,
+            ),
+        )
+
+
+def bench_prompt(iterations: int) -> None:
+    """Per-request system prompt construction for the largest menu"""
+    restaurant_id, restaurant_data = max(
+        RESTAURANTS_CACHE.items(),
+        key=lambda entry: len(entry[1].get("menu_items", [])),
+    )
+    menu_items = restaurant_data.get("menu_items", [])
+    dislikes = [item["name"] for item in menu_items[:3]]
+    features = local_recommender.get_features(
+        restaurant_id, restaurant_data, get_catalog_version(restaurant_id)
+    )
+    candidates = local_recommender.rank(features, SAMPLE_PROFILE, dislikes, 15)
+    builder = PromptBuilder()
+
+    def build(catalog_key):
+        return builder.build_system(
+            SAMPLE_PROFILE,
+            candidates,
+            restaurant_data.get("reviews", []),
+            restaurant_data.get("top_items", []),
+            dislikes,
+            restaurant_data.get("name", restaurant_id),
+            menu_items,
+            structured=True,
+            catalog_key=catalog_key,
+        )
+
+    print(
+        f"{restaurant_data.get('name', restaurant_id)} "
+        f"({len(menu_items)} menu items, {len(candidates)} candidates)"
+    )
+    _report("full render", _time_per_call(lambda: build(None), iterations))
+    catalog_key = (restaurant_id, get_catalog_version(restaurant_id))
+    build(catalog_key)
+    _report("memoized sections", _time_per_call(lambda: build(catalog_key), iterations))
+
+
+def _catalog_sized_names(count: int, rng: random.Random) -> List[str]:
+    """Catalog item names, padded out with plausible variants up to count"""
+    names = sorted(
+        {
+            item["name"]
+            for restaurant_data in RESTAURANTS_CACHE.values()
+            for item in restaurant_data.get("menu_items", [])
+            if item.get("name")
+        }
+    )
+    sizes = ["Small", "Medium", "Large", "Family", "Half", "Party"]
+    extras = ["Combo", "Platter", "Special", "with Fries", "Deluxe", "Bowl", "Wrap"]
+    candidates = list(names[:count])
+    while len(candidates) < count:
+        name = rng.choice(names)
+        if rng.random() < 0.5:
+            name = f"{rng.choice(sizes)} {name}"
+        if rng.random() < 0.5:
+            name = f"{name} {rng.choice(extras)}"
+        candidates.append(f"{name} #{len(candidates)}" if rng.random() < 0.3 else name)
+    return candidates
+
+
+def _misspell(name: str, rng: random.Random) -> str:
+    """A name as a user (or OCR) might type it: one character dropped or swapped"""
+    if len(name) < 4:
+        return name.lower()
+    position = rng.randrange(1, len(name) - 2)
+    if rng.random() < 0.5:
+        return (name[:position] + name[position + 1 :]).lower()
+    return (name[:position] + name[position + 1] + name[position] + name[position + 2 :]).lower()
+
+
+def bench_fuzzy(iterations: int) -> None:
+    """Indexed fuzzy search vs. scanning every candidate"""
+    rng = random.Random(0)
+    for size in (1_000, 10_000, 100_000):
+        candidates = _catalog_sized_names(size, rng)
+        # A scan of 100k candidates takes seconds, so fewer queries at larger sizes
+        num_queries = min(iterations, max(5, 50_000 // size))
+        queries = [_misspell(rng.choice(candidates), rng) for _ in range(num_queries)]
+
+        started = time.perf_counter()
+        index = FuzzyIndex(candidates)
+        build_ms = (time.perf_counter() - started) * 1e3
+
+        started = time.perf_counter()
+        prepared = FuzzyMatcher.prepare_candidates(candidates)
+        prepare_ms = (time.perf_counter() - started) * 1e3
+
+        brute_results, brute_timings = [], []
+        prepared_results, prepared_timings = [], []
+        indexed_results, indexed_timings = [], []
+        for query in queries:
+            brute_timings += _time_per_call(
+                lambda: brute_results.append(FuzzyMatcher.find_all_matches(query, candidates)), 1
+            )
+            prepared_timings += _time_per_call(
+                lambda: prepared_results.append(FuzzyMatcher.find_all_matches(query, prepared)), 1
+            )
+            indexed_timings += _time_per_call(
+                lambda: indexed_results.append(index.find_all_matches(query)), 1
+            )
+        shortlisted = statistics.mean(
+            len(index.shortlist(FuzzyMatcher._clean_string(query), 0.6)) for query in queries
+        )
+        same = brute_results == prepared_results == indexed_results
+        print(
+            f"{size} candidates ({len(queries)} queries, prepare {prepare_ms:.0f} ms, "
+            f"index build {build_ms:.0f} ms, {shortlisted:.0f} shortlisted per query, "
+            f"{'same' if same else 'DIFFERENT'} results)"
+        )
+        _report("scan", brute_timings)
+        _report("scan (prepared)", prepared_timings)
+        _report("index", indexed_timings)
+
+
+def bench_fuzzy_batch(iterations: int) -> None:
+    """Many-to-many fuzzy matching: one match_many call vs. a query loop"""
+    rng = random.Random(0)
+    candidates = FuzzyMatcher.prepare_candidates(_catalog_sized_names(10_000, rng))
+    queries = [_misspell(rng.choice(candidates).text, rng) for _ in range(min(iterations, 500))]
+    # The loop takes ~1 s per query at this size, so it only runs on a sample
+    sample = queries[:20]
+
+    started = time.perf_counter()
+    batched = FuzzyMatcher.match_many(queries, candidates, top_k=5)
+    batch_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    looped = [FuzzyMatcher.find_all_matches(query, candidates, limit=5) for query in sample]
+    loop_seconds = time.perf_counter() - started
+
+    top_1 = sum(b[:1] == l[:1] for b, l in zip(batched, looped))
+    top_5 = sum(b == l for b, l in zip(batched, looped))
+    print(
+        f"{len(queries)} queries x {len(candidates)} candidates "
+        f"(top-1 same on {top_1}/{len(sample)}, top-5 same on {top_5}/{len(sample)})"
+    )
+    print(f"  {'find_all_matches loop':<22} {len(sample) / loop_seconds:9.1f} queries/s")
+    print(f"  {'match_many':<22} {len(queries) / batch_seconds:9.1f} queries/s")
+
+
+def bench_fuzzy_topk(iterations: int) -> None:
+    """Top-k fuzzy search with ratio() pruning vs. scoring every candidate"""
+    rng = random.Random(0)
+    largest_menu = max(
+        RESTAURANTS_CACHE.values(), key=lambda data: len(data.get("menu_items", []))
+    )
+    catalog_names = [
+        item["name"]
+        for restaurant_data in RESTAURANTS_CACHE.values()
+        for item in restaurant_data.get("menu_items", [])
+    ]
+    inputs = [
+        ("largest menu", [item["name"] for item in largest_menu["menu_items"]], 50),
+        ("whole catalog", catalog_names, 50),
+        ("10k names", _catalog_sized_names(10_000, rng), 5),
+    ]
+
+    for label, names, num_queries in inputs:
+        candidates = FuzzyMatcher.prepare_candidates(names)
+        queries = [
+            FuzzyMatcher.prepare(_misspell(rng.choice(names), rng))
+            for _ in range(min(iterations, num_queries))
+        ]
+
+        def exhaustive(query, limit):
+            matches = [
+                (candidate.text, FuzzyMatcher._prepared_similarity(query, candidate))
+                for candidate in candidates
+            ]
+            matches = [match for match in matches if match[1] >= 0.6]
+            matches.sort(key=lambda x: x[1], reverse=True)
+            return matches[:limit]
+
+        timings: Dict[str, List[float]] = {}
+        same = True
+        for query in queries:
+            for limit in (1, 5):
+                results = []
+                timings.setdefault(f"exhaustive top-{limit}", []).extend(
+                    _time_per_call(lambda: results.append(exhaustive(query, limit)), 1)
+                )
+                timings.setdefault(f"pruned top-{limit}", []).extend(
+                    _time_per_call(
+                        lambda: results.append(
+                            FuzzyMatcher._ranked_matches(query, candidates, 0.6, limit)
+                        ),
+                        1,
+                    )
+                )
+                same = same and results[0] == results[1]
+
+        print(
+            f"{label} ({len(candidates)} candidates, {len(queries)} queries, "
+            f"{'same' if same else 'DIFFERENT'} results)"
+        )
+        for name, values in timings.items():
+            _report(name, values)
+
+
+BENCHMARKS: Dict[str, Callable[[int], None]] = {
+    "fuzzy": bench_fuzzy,
+    "fuzzy-batch": bench_fuzzy_batch,
+    "fuzzy-topk": bench_fuzzy_topk,
+    "local-engine": bench_local_engine,
+    "prompt": bench_prompt,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommendation micro-benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    BENCHMARKS[args.benchmark](args.iterations)
+
+
+if __name__ == "__main__":
+    main()
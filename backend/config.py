@@ -28,6 +28,66 @@ class Settings:
     # Anthropic Claude Configuration
     ANTHROPIC_API_KEY: Optional[str] = os.getenv("ANTHROPIC_API_KEY")
 
+    # Recommendation result cache
+    RECS_CACHE_TTL_SECONDS: int = int(os.getenv("RECS_CACHE_TTL_SECONDS", "900"))
+    RECS_CACHE_MAX_ENTRIES: int = int(os.getenv("RECS_CACHE_MAX_ENTRIES", "2048"))
+
+    # Speculative prefetch of the next swipe card
+    RECS_PREFETCH_ENABLED: bool = (
+        os.getenv("RECS_PREFETCH_ENABLED", "true").lower() == "true"
+    )
+    RECS_PREFETCH_MAX_PER_USER: int = int(
+        os.getenv("RECS_PREFETCH_MAX_PER_USER", "2")
+    )
+
+    # Number of locally pre-ranked menu items sent to Claude (0 = whole menu)
+    RECS_PRERANK_TOP_K: int = int(os.getenv("RECS_PRERANK_TOP_K", "30"))
+
+    # Candidates at least this similar (TF-IDF cosine) to an item rejected in
+    # the session are moved to the back of the shortlist (0 disables)
+    RECS_DISLIKE_SIMILARITY_THRESHOLD: float = float(
+        os.getenv("RECS_DISLIKE_SIMILARITY_THRESHOLD", "0.4")
+    )
+
+    # Recommendation engine: "llm" (Claude, local engine on failure), "local"
+    # (no LLM calls) or "hybrid" (local engine shortlists candidates for Claude)
+    RECS_ENGINE_MODE: str = os.getenv("RECS_ENGINE_MODE", "llm").lower()
+
+    # Deadline for the LLM per recommendation request (0 = wait indefinitely).
+    # Past it the local engine answers; the LLM call may finish in the
+    # background to warm the cache.
+    RECS_LATENCY_BUDGET_MS: int = int(os.getenv("RECS_LATENCY_BUDGET_MS", "8000"))
+    RECS_BACKGROUND_COMPLETION: bool = (
+        os.getenv("RECS_BACKGROUND_COMPLETION", "true").lower() == "true"
+    )
+
+    # Server-side swipe sessions (accumulated likes/dislikes per restaurant)
+    RECS_SESSION_TTL_SECONDS: int = int(os.getenv("RECS_SESSION_TTL_SECONDS", "1800"))
+    RECS_SESSION_MAX: int = int(os.getenv("RECS_SESSION_MAX", "10000"))
+    RECS_SESSION_MAX_SWIPES: int = int(os.getenv("RECS_SESSION_MAX_SWIPES", "500"))
+
+    # Online preference model learned from swipes: SGD step size, L2
+    # shrinkage, and its weight in local ranking (0 ignores it)
+    RECS_PREFERENCE_LEARNING_RATE: float = float(
+        os.getenv("RECS_PREFERENCE_LEARNING_RATE", "0.5")
+    )
+    RECS_PREFERENCE_L2: float = float(os.getenv("RECS_PREFERENCE_L2", "0.01"))
+    RECS_PREFERENCE_WEIGHT: float = float(os.getenv("RECS_PREFERENCE_WEIGHT", "2.0"))
+
+    # Write-behind audit rows of served recommendations: bulk insert every
+    # batch size events or flush interval, whichever comes first
+    RECS_AUDIT_ENABLED: bool = os.getenv("RECS_AUDIT_ENABLED", "true").lower() == "true"
+    RECS_AUDIT_BATCH_SIZE: int = int(os.getenv("RECS_AUDIT_BATCH_SIZE", "100"))
+    RECS_AUDIT_FLUSH_SECONDS: float = float(os.getenv("RECS_AUDIT_FLUSH_SECONDS", "2"))
+    RECS_AUDIT_MAX_PENDING: int = int(os.getenv("RECS_AUDIT_MAX_PENDING", "10000"))
+
+    # /recs/nearby: restaurants fanned out to, parallel recommendation calls,
+    # overall deadline and default search radius
+    RECS_NEARBY_MAX_RESTAURANTS: int = int(os.getenv("RECS_NEARBY_MAX_RESTAURANTS", "5"))
+    RECS_NEARBY_CONCURRENCY: int = int(os.getenv("RECS_NEARBY_CONCURRENCY", "3"))
+    RECS_NEARBY_DEADLINE_MS: int = int(os.getenv("RECS_NEARBY_DEADLINE_MS", "10000"))
+    RECS_NEARBY_RADIUS_KM: float = float(os.getenv("RECS_NEARBY_RADIUS_KM", "10"))
+
     # External API Keys (only needed if using official APIs instead of scraping)
     GOOGLE_MAPS_API_KEY: Optional[str] = os.getenv("GOOGLE_MAPS_API_KEY")
 
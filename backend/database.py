@@ -2,7 +2,9 @@
 Database configuration and setup for the Food Recommender API
 """
 
-from sqlalchemy import create_engine, MetaData
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import Column, create_engine, inspect, MetaData
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from config import settings
@@ -33,10 +35,71 @@ def get_db():
         db.close()
 
 
+def upgrade_schema():
+    """
+    Bring tables created by older versions of the models up to date
+
+    create_all only creates missing tables, so columns added to an existing
+    table (and columns that became nullable) are applied here. Batch mode
+    rebuilds the table on SQLite, which can't alter columns in place.
+    Anything else, like a new required column, fails startup.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    changes = {}
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {column["name"]: column for column in inspector.get_columns(table.name)}
+        added = [column for column in table.columns if column.name not in existing]
+        relaxed = [
+            column
+            for column in table.columns
+            if column.name in existing
+            and column.nullable
+            and not existing[column.name]["nullable"]
+        ]
+        for column in added:
+            if not column.nullable and column.server_default is None:
+                raise RuntimeError(
+                    f"Table {table.name} is missing required column {column.name}; "
+                    "migrate the database by hand"
+                )
+        if added or relaxed:
+            changes[table.name] = (added, relaxed)
+    if not changes:
+        return
+
+    with engine.begin() as connection:
+        operations = Operations(MigrationContext.configure(connection))
+        for table_name, (added, relaxed) in changes.items():
+            with operations.batch_alter_table(table_name) as batch:
+                for column in added:
+                    batch.add_column(
+                        Column(
+                            column.name,
+                            column.type,
+                            nullable=column.nullable,
+                            server_default=column.server_default,
+                        )
+                    )
+                    if column.index:
+                        batch.create_index(f"ix_{table_name}_{column.name}", [column.name])
+                for column in relaxed:
+                    batch.alter_column(
+                        column.name, existing_type=column.type, nullable=True
+                    )
+            print(
+                f"Upgraded table {table_name}: added {[c.name for c in added]}, "
+                f"made nullable {[c.name for c in relaxed]}"
+            )
+
+
 def init_db():
     """Initialize database tables"""
     try:
         Base.metadata.create_all(bind=engine)
+        upgrade_schema()
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Anthropic Messages and Groq chat-completions APIs.
+
+Lets /recs and /restaurants/upload-menu be load-tested with production-like
+timing and no API quota or network access. Responses are canned but shaped
+like the real ones: forced tool calls get input generated from the tool's
+JSON schema (so item ids are real candidates), plain answers pick from the
+candidate list in the system prompt, and both APIs support streaming.
+
+Usage:
+
+    python fake_llm_server.py [--port 8787] \\
+        [--anthropic-latency lognormal:2500,0.4] [--groq-latency uniform:3000,6000] \\
+        [--stream-chunk-ms 15] [--error-rate 0.02] [--seed 1]
+
+then point the backend at it:
+
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8787 ANTHROPIC_API_KEY=fake
+    GROQ_BASE_URL=http://127.0.0.1:8787 GROQ_KEY=fake
+
+Latency specs: fixed:MS, uniform:MIN_MS,MAX_MS, normal:MEAN_MS,STD_MS or
+lognormal:MEDIAN_MS,SIGMA. For streams the sampled latency is the time to
+the first token and --stream-chunk-ms the delay between chunks.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+CHARS_PER_TOKEN = 4
+
+_CANDIDATE_RE = re.compile(r"^- id: (\d+) name: (.+?)(?: description: | price: |$)", re.M)
+
+# Returned by the Groq endpoint unless --groq-response-file is given
+DEFAULT_MENU = [
+    {"name": "Chicken Over Rice", "price": 12.99},
+    {"name": "Lamb Over Rice", "price": 13.99},
+    {"name": "Falafel Wrap", "price": 9.5},
+    {"name": "Baklava", "price": 4.25},
+]
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Sampler of a latency in seconds from a spec like "lognormal:2500,0.4" """
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",") if value]
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0] / 1000
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "normal" and len(values) == 2:
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1])) / 1000
+    if kind == "lognormal" and len(values) == 2:
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1]) / 1000
+    raise argparse.ArgumentTypeError(f"invalid latency spec: {spec}")
+
+
+def _estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _system_blocks(system: Any) -> List[Dict[str, Any]]:
+    if isinstance(system, str):
+        return [{"type": "text", "text": system}]
+    return list(system or [])
+
+
+def _chunks(text: str, size: int = 12) -> List[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)] or [""]
+
+
+def _sse(event: Optional[str], data: Any) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data) if not isinstance(data, str) else data}\n\n"
+
+
+class FakeLLMServer:
+    def __init__(self, args: argparse.Namespace):
+        self.rng = random.Random(args.seed)
+        self.anthropic_latency = args.anthropic_latency
+        self.groq_latency = args.groq_latency
+        self.stream_chunk = args.stream_chunk_ms / 1000
+        self.error_rate = args.error_rate
+        self.canned_text = (
+            open(args.anthropic_response_file).read() if args.anthropic_response_file else None
+        )
+        self.groq_text = (
+            open(args.groq_response_file).read()
+            if args.groq_response_file
+            else json.dumps(DEFAULT_MENU)
+        )
+        # Hashes of cacheable system prefixes seen so far (simulated prompt cache)
+        self.cached_prefixes = set()
+        self.stats: Dict[str, int] = {
+            "anthropic_requests": 0,
+            "anthropic_streams": 0,
+            "groq_requests": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "max_in_flight": 0,
+        }
+
+    # -- shared ------------------------------------------------------------
+
+    def _fail(self) -> bool:
+        if self.rng.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return True
+        return False
+
+    def _enter(self) -> None:
+        self.stats["in_flight"] += 1
+        self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+
+    def _leave(self) -> None:
+        self.stats["in_flight"] -= 1
+
+    # -- Anthropic Messages --------------------------------------------------
+
+    def _usage(self, body: Dict[str, Any], output_text: str) -> Dict[str, int]:
+        """Token usage, reporting cache reads for repeated cache_control prefixes"""
+        prompt = ""
+        cached = created = 0
+        for block in _system_blocks(body.get("system")):
+            prompt += block.get("text", "")
+            if block.get("cache_control"):
+                key = hashlib.sha256(prompt.encode()).hexdigest()
+                if key in self.cached_prefixes:
+                    cached = _estimate_tokens(prompt)
+                else:
+                    self.cached_prefixes.add(key)
+                    created = _estimate_tokens(prompt) - cached
+        total = (
+            _estimate_tokens(prompt)
+            + _estimate_tokens(json.dumps(body.get("messages", [])))
+            + _estimate_tokens(json.dumps(body.get("tools") or []))
+        )
+        return {
+            "input_tokens": total - cached - created,
+            "output_tokens": _estimate_tokens(output_text),
+            "cache_read_input_tokens": cached,
+            "cache_creation_input_tokens": created,
+        }
+
+    def _instance(self, schema: Dict[str, Any]) -> Any:
+        """A value matching a (simple) JSON schema"""
+        if "enum" in schema:
+            return self.rng.choice(schema["enum"])
+        kind = schema.get("type")
+        if kind == "object":
+            return {
+                name: self._instance(prop)
+                for name, prop in schema.get("properties", {}).items()
+            }
+        if kind == "array":
+            low = schema.get("minItems", 1)
+            high = max(low, schema.get("maxItems", low))
+            items = schema.get("items", {})
+            # Keep enum picks (e.g. item ids) distinct, like a well-behaved model
+            enum_fields = [
+                name
+                for name, prop in items.get("properties", {}).items()
+                if "enum" in prop
+            ]
+            values, seen = [], set()
+            for _ in range(self.rng.randint(low, high)):
+                for _ in range(5):
+                    value = self._instance(items)
+                    key = tuple(value.get(name) for name in enum_fields) if enum_fields else None
+                    if key is None or key not in seen:
+                        break
+                seen.add(key)
+                values.append(value)
+            return values
+        if kind == "integer":
+            return self.rng.randint(schema.get("minimum", 0), schema.get("maximum", 100))
+        if kind == "number":
+            # Confidence-like values
+            low = max(schema.get("minimum", 0.0), 0.6)
+            high = min(schema.get("maximum", 1.0), 0.95)
+            return round(self.rng.uniform(low, high), 2)
+        if kind == "boolean":
+            return self.rng.random() < 0.5
+        return "It matches the flavors and dishes this user has liked before."
+
+    def _text_answer(self, body: Dict[str, Any]) -> str:
+        """JSON text answer naming candidates from the system prompt"""
+        if self.canned_text is not None:
+            return self.canned_text
+        system = "".join(block.get("text", "") for block in _system_blocks(body.get("system")))
+        section = system.split("CANDIDATE ITEMS", 1)[-1]
+        candidates = _CANDIDATE_RE.findall(section) or [("0", "Chef's Special")]
+        picks = self.rng.sample(candidates, min(len(candidates), 3))
+        recommendations = [
+            {
+                "recommended_item": name.strip(),
+                "reasoning": "It matches the flavors and dishes this user has liked before.",
+                "confidence": round(self.rng.uniform(0.6, 0.95), 2),
+                "id": item_id,
+            }
+            for item_id, name in picks
+        ]
+        if '"recommendations"' in system:
+            return json.dumps({"recommendations": recommendations})
+        return json.dumps(recommendations[0])
+
+    def _anthropic_content(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        tool_choice = body.get("tool_choice") or {}
+        tools = {tool.get("name"): tool for tool in body.get("tools") or []}
+        if tool_choice.get("type") == "tool" and tool_choice.get("name") in tools:
+            tool = tools[tool_choice["name"]]
+            return {
+                "type": "tool_use",
+                "id": f"toolu_{uuid.uuid4().hex[:24]}",
+                "name": tool["name"],
+                "input": self._instance(tool.get("input_schema", {})),
+            }
+        return {"type": "text", "text": self._text_answer(body)}
+
+    async def messages(self, request: Request):
+        body = await request.json()
+        self.stats["anthropic_requests"] += 1
+        latency = self.anthropic_latency(self.rng)
+        if self._fail():
+            await asyncio.sleep(latency / 4)
+            return JSONResponse(
+                status_code=529,
+                content={
+                    "type": "error",
+                    "error": {"type": "overloaded_error", "message": "Overloaded (fake)"},
+                },
+            )
+
+        content = self._anthropic_content(body)
+        output = content.get("text") or json.dumps(content.get("input"))
+        usage = self._usage(body, output)
+        stop_reason = "tool_use" if content["type"] == "tool_use" else "end_turn"
+        message = {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "fake"),
+            "stop_sequence": None,
+        }
+        if body.get("stream"):
+            self.stats["anthropic_streams"] += 1
+            return StreamingResponse(
+                self._anthropic_stream(message, content, output, usage, stop_reason, latency),
+                media_type="text/event-stream",
+            )
+
+        self._enter()
+        try:
+            await asyncio.sleep(latency)
+        finally:
+            self._leave()
+        return {**message, "content": [content], "stop_reason": stop_reason, "usage": usage}
+
+    async def _anthropic_stream(
+        self,
+        message: Dict[str, Any],
+        content: Dict[str, Any],
+        output: str,
+        usage: Dict[str, int],
+        stop_reason: str,
+        latency: float,
+    ) -> AsyncIterator[str]:
+        self._enter()
+        try:
+            await asyncio.sleep(latency)
+            yield _sse(
+                "message_start",
+                {
+                    "type": "message_start",
+                    "message": {
+                        **message,
+                        "content": [],
+                        "stop_reason": None,
+                        "usage": {**usage, "output_tokens": 1},
+                    },
+                },
+            )
+            if content["type"] == "tool_use":
+                start = {**content, "input": {}}
+                delta_type, delta_key = "input_json_delta", "partial_json"
+            else:
+                start = {"type": "text", "text": ""}
+                delta_type, delta_key = "text_delta", "text"
+            yield _sse(
+                "content_block_start",
+                {"type": "content_block_start", "index": 0, "content_block": start},
+            )
+            for chunk in _chunks(output):
+                await asyncio.sleep(self.stream_chunk)
+                yield _sse(
+                    "content_block_delta",
+                    {
+                        "type": "content_block_delta",
+                        "index": 0,
+                        "delta": {"type": delta_type, delta_key: chunk},
+                    },
+                )
+            yield _sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+            yield _sse(
+                "message_delta",
+                {
+                    "type": "message_delta",
+                    "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+                    "usage": {"output_tokens": usage["output_tokens"]},
+                },
+            )
+            yield _sse("message_stop", {"type": "message_stop"})
+        finally:
+            self._leave()
+
+    # -- Groq chat completions -----------------------------------------------
+
+    async def chat_completions(self, request: Request):
+        body = await request.json()
+        self.stats["groq_requests"] += 1
+        latency = self.groq_latency(self.rng)
+        if self._fail():
+            await asyncio.sleep(latency / 4)
+            return JSONResponse(
+                status_code=503,
+                content={"error": {"message": "Service unavailable (fake)", "type": "internal_server_error"}},
+            )
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        model = body.get("model", "fake")
+        prompt_tokens = _estimate_tokens(json.dumps(body.get("messages", [])))
+        completion_tokens = _estimate_tokens(self.groq_text)
+        if body.get("stream"):
+            return StreamingResponse(
+                self._groq_stream(completion_id, created, model, latency),
+                media_type="text/event-stream",
+            )
+
+        self._enter()
+        try:
+            await asyncio.sleep(latency)
+        finally:
+            self._leave()
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": self.groq_text},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    async def _groq_stream(
+        self, completion_id: str, created: int, model: str, latency: float
+    ) -> AsyncIterator[str]:
+        self._enter()
+        try:
+            await asyncio.sleep(latency)
+            chunks = _chunks(self.groq_text)
+            for index, chunk in enumerate(chunks):
+                if index:
+                    await asyncio.sleep(self.stream_chunk)
+                delta = {"content": chunk}
+                if index == 0:
+                    delta["role"] = "assistant"
+                yield _sse(
+                    None,
+                    {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": model,
+                        "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+                    },
+                )
+            yield _sse(
+                None,
+                {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                },
+            )
+            yield _sse(None, "[DONE]")
+        finally:
+            self._leave()
+
+
+def create_app(args: argparse.Namespace) -> FastAPI:
+    server = FakeLLMServer(args)
+    app = FastAPI(title="Fake Anthropic/Groq API")
+    app.add_api_route("/v1/messages", server.messages, methods=["POST"])
+    app.add_api_route(
+        "/openai/v1/chat/completions", server.chat_completions, methods=["POST"]
+    )
+    app.add_api_route("/stats", lambda: server.stats, methods=["GET"])
+    return app
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fake Anthropic/Groq API server for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--anthropic-latency", type=parse_latency, default="lognormal:2500,0.4")
+    parser.add_argument("--groq-latency", type=parse_latency, default="lognormal:4000,0.3")
+    parser.add_argument("--stream-chunk-ms", type=float, default=15.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failed with 529 (Anthropic) / 503 (Groq)")
+    parser.add_argument("--anthropic-response-file", help="Canned text answer for non-tool requests")
+    parser.add_argument("--groq-response-file", help="Canned menu JSON for the Groq endpoint")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
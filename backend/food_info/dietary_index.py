@@ -0,0 +1,83 @@
+"""
+Per-restaurant dietary restriction index.
+
+Built once per restaurant when the catalog loads (and again on menu upload).
+Every canonical restriction (nut, dairy, gluten, shellfish, pork, ...) maps to
+a bitset of the menu items that are safe for it, bit i being the item with
+item_id i. A user's whole restriction list is then one AND per restriction
+instead of matching words against every item on every request.
+"""
+
+from typing import Any, Dict, Iterable, List, Set
+
+import numpy as np
+
+from recommender.ranking import RESTRICTION_CONFLICTS, text_words
+
+# Item fields whose words can reveal a conflicting ingredient
+_TEXT_FIELDS = ("name", "description", "category")
+_LIST_FIELDS = ("allergens", "ingredients")
+
+
+def canonical_restrictions(restrictions: Iterable[Any]) -> List[str]:
+    """
+    Canonical restriction keys named by a profile's dietary_restrictions
+
+    Entries may be DietaryRestriction dicts or plain strings; a key matches
+    as a substring of the name (e.g. "gluten-free" -> "gluten").
+    """
+    keys = []
+    for restriction in restrictions or []:
+        name = restriction.get("name", "") if isinstance(restriction, dict) else restriction
+        name = str(name or "").lower()
+        for key in RESTRICTION_CONFLICTS:
+            if key in name and key not in keys:
+                keys.append(key)
+    return keys
+
+
+def _item_words(item: Dict[str, Any]) -> Set[str]:
+    words = set()
+    for field in _TEXT_FIELDS:
+        words |= text_words(item.get(field))
+    for field in _LIST_FIELDS:
+        for entry in item.get(field) or []:
+            words |= text_words(entry)
+    return words
+
+
+class DietaryIndex:
+    """Safe-item bitsets of one restaurant's menu, per canonical restriction"""
+
+    def __init__(self, menu_items: List[Dict[str, Any]]):
+        # Catalog items are numbered by menu position
+        bits = [
+            item["item_id"] if item.get("item_id") is not None else row
+            for row, item in enumerate(menu_items)
+        ]
+        self.size = max(bits, default=-1) + 1
+        self.all_items = 0
+        for bit in bits:
+            self.all_items |= 1 << bit
+
+        unsafe = {key: 0 for key in RESTRICTION_CONFLICTS}
+        for bit, item in zip(bits, menu_items):
+            words = _item_words(item)
+            for key, conflicts in RESTRICTION_CONFLICTS.items():
+                if words & conflicts:
+                    unsafe[key] |= 1 << bit
+        self.safe: Dict[str, int] = {
+            key: self.all_items & ~mask for key, mask in unsafe.items()
+        }
+
+    def safe_mask(self, restrictions: Iterable[Any]) -> int:
+        """Bitset of the items that conflict with none of the restrictions"""
+        mask = self.all_items
+        for key in canonical_restrictions(restrictions):
+            mask &= self.safe[key]
+        return mask
+
+    def allowed(self, mask: int) -> np.ndarray:
+        """A bitset as a boolean array indexed by item_id"""
+        packed = np.frombuffer(mask.to_bytes((self.size + 7) // 8, "little"), dtype=np.uint8)
+        return np.unpackbits(packed, bitorder="little")[: self.size].astype(bool)
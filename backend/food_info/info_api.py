@@ -16,6 +16,11 @@ import traceback
 # Add path for OCR imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from ocr.lib import get_restaurant_data
+from recommender.rec_cache import recommendation_cache
+from recommender.local_engine import local_recommender
+from .menu_index import MenuIndex
+from .dietary_index import DietaryIndex
+from .item_vectors import item_vectors
 import json
 import os
 import glob
@@ -29,11 +34,17 @@ router = APIRouter(prefix="/restaurants", tags=["restaurants"])
 # In-memory restaurant data storage
 RESTAURANTS_CACHE: Dict[str, Dict[str, Any]] = {}
 RESTAURANTS_LIST_CACHE: List[Dict[str, Any]] = []
+# Bumped whenever a restaurant's data is replaced, so derived caches can key on it
+CATALOG_VERSIONS: Dict[str, int] = {}
+# Name/item_id lookups per restaurant, rebuilt whenever its menu changes
+MENU_INDEXES: Dict[str, MenuIndex] = {}
+# Safe-item bitsets per dietary restriction, rebuilt with the menu indexes
+DIETARY_INDEXES: Dict[str, DietaryIndex] = {}
 
 
 def load_all_restaurants_on_startup():
     """Load all restaurant data into memory on startup"""
-    global RESTAURANTS_CACHE, RESTAURANTS_LIST_CACHE
+    global RESTAURANTS_CACHE, RESTAURANTS_LIST_CACHE, CATALOG_VERSIONS, MENU_INDEXES, DIETARY_INDEXES
 
     processed_dir = os.path.join(os.path.dirname(__file__), "processed")
     json_files = glob.glob(os.path.join(processed_dir, "*.json"))
@@ -76,6 +87,18 @@ def load_all_restaurants_on_startup():
 
     RESTAURANTS_CACHE = restaurants_dict
     RESTAURANTS_LIST_CACHE = restaurants_list
+    CATALOG_VERSIONS = {restaurant_id: 1 for restaurant_id in restaurants_dict}
+    MENU_INDEXES = {
+        restaurant_id: MenuIndex(data["menu_items"])
+        for restaurant_id, data in restaurants_dict.items()
+    }
+    DIETARY_INDEXES = {
+        restaurant_id: DietaryIndex(data["menu_items"])
+        for restaurant_id, data in restaurants_dict.items()
+    }
+    for restaurant_id, data in restaurants_dict.items():
+        local_recommender.index_restaurant(restaurant_id, data, 1)
+        item_vectors.index_restaurant(restaurant_id, data["menu_items"])
     print(f"Loaded {len(restaurants_dict), len(restaurants_list)} restaurants into memory")
 
 
@@ -109,6 +132,38 @@ def get_restaurant_by_id(restaurant_id: str) -> Optional[Dict[str, Any]]:
     return RESTAURANTS_CACHE.get(restaurant_id)
 
 
+def get_restaurant_summaries() -> List[Dict[str, Any]]:
+    """Get the summaries of all restaurants (as listed by GET /restaurants/)"""
+    return RESTAURANTS_LIST_CACHE
+
+
+def get_menu_index(restaurant_id: str) -> MenuIndex:
+    """Get the menu lookup index of a restaurant (empty if unknown)"""
+    menu_index = MENU_INDEXES.get(restaurant_id)
+    if menu_index is None:
+        restaurant_data = RESTAURANTS_CACHE.get(restaurant_id) or {}
+        menu_index = MenuIndex(restaurant_data.get("menu_items", []))
+        if restaurant_data:
+            MENU_INDEXES[restaurant_id] = menu_index
+    return menu_index
+
+
+def get_dietary_index(restaurant_id: str) -> DietaryIndex:
+    """Get the dietary restriction index of a restaurant (empty if unknown)"""
+    dietary_index = DIETARY_INDEXES.get(restaurant_id)
+    if dietary_index is None:
+        restaurant_data = RESTAURANTS_CACHE.get(restaurant_id) or {}
+        dietary_index = DietaryIndex(restaurant_data.get("menu_items", []))
+        if restaurant_data:
+            DIETARY_INDEXES[restaurant_id] = dietary_index
+    return dietary_index
+
+
+def get_catalog_version(restaurant_id: str) -> int:
+    """Get the current catalog version of a restaurant (0 if unknown)"""
+    return CATALOG_VERSIONS.get(restaurant_id, 0)
+
+
 @router.post("/upload-menu", 
             summary="Upload Menu Image and Create Restaurant",
             description="Upload a menu image along with restaurant details to extract menu items and create restaurant data",
@@ -163,10 +218,22 @@ async def upload_menu_and_create_restaurant(
         
         # Convert RestaurantInfo object to dictionary for caching
         restaurant_dict = restaurant_data.dict()
+        restaurant_dict["menu_items"] = [
+            {**itm, "item_id": i}
+            for i, itm in enumerate(restaurant_dict.get("menu_items", []))
+        ]
         
         # Store in cache using the restaurant ID
         restaurant_id = restaurant_dict['google_id'] if restaurant_dict.get('google_id') else restaurant_dict['id']
         RESTAURANTS_CACHE[restaurant_id] = restaurant_dict
+        CATALOG_VERSIONS[restaurant_id] = get_catalog_version(restaurant_id) + 1
+        MENU_INDEXES[restaurant_id] = MenuIndex(restaurant_dict["menu_items"])
+        DIETARY_INDEXES[restaurant_id] = DietaryIndex(restaurant_dict["menu_items"])
+        recommendation_cache.invalidate_restaurant(restaurant_id)
+        local_recommender.index_restaurant(
+            restaurant_id, restaurant_dict, CATALOG_VERSIONS[restaurant_id]
+        )
+        item_vectors.index_restaurant(restaurant_id, restaurant_dict["menu_items"])
         
         data = restaurant_dict
         restaurant_summary = {
@@ -211,3 +278,26 @@ async def upload_menu_and_create_restaurant(
             os.unlink(temp_image_path)
 
 
+@router.get(
+    "/{restaurant_id}/items/{item_id}/similar",
+    summary="Get Similar Menu Items",
+    description="Find the menu items most similar to one item (TF-IDF over name, description and category)",
+    response_description="Similar menu items with their cosine similarity",
+)
+async def get_similar_items(restaurant_id: str, item_id: int, limit: int = 5):
+    """Get the items of a restaurant's menu that are most like the given item"""
+    menu_index = get_menu_index(restaurant_id)
+    entry = menu_index.get(item_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Menu item not found")
+
+    return {
+        "restaurant_id": restaurant_id,
+        "item": entry.item,
+        "similar_items": [
+            {**item, "similarity": round(similarity, 4)}
+            for item, similarity in item_vectors.similar(
+                restaurant_id, item_id, max(1, min(limit, 50))
+            )
+        ],
+    }
@@ -0,0 +1,217 @@
+"""
+TF-IDF vectors of menu items for item-to-item similarity.
+
+Every menu item is a sparse TF-IDF vector over the words of its name,
+description and category. Document frequencies are shared across all
+restaurants and updated incrementally when a restaurant is (re)indexed; the
+weighted, L2-normalized matrix of a restaurant is rebuilt lazily on its next
+query after the frequencies change.
+"""
+
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .menu_index import normalize_name
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Words too common on menus to say anything about an item
+_STOP_WORDS = {
+    "a", "an", "and", "the", "of", "with", "in", "on", "or", "for", "to",
+    "our", "your", "served", "choice", "comes", "side", "made", "fresh",
+    "topped", "w",
+}
+
+# Name words count more than description words
+_FIELD_WEIGHTS = (("name", 2.0), ("category", 1.0), ("description", 1.0))
+
+
+def item_terms(item: Dict[str, Any]) -> Counter:
+    """Weighted term counts of a menu item"""
+    terms: Counter = Counter()
+    for field, weight in _FIELD_WEIGHTS:
+        text = item.get(field)
+        if not isinstance(text, str):
+            continue
+        for word in _WORD_RE.findall(text.lower()):
+            if len(word) > 1 and word not in _STOP_WORDS:
+                terms[word] += weight
+    return terms
+
+
+class _RestaurantVectors:
+    """Raw term counts of one restaurant's menu, plus its cached TF-IDF matrix"""
+
+    def __init__(self, menu_items: List[Dict[str, Any]], counts: sparse.csr_matrix):
+        self.items = menu_items
+        self.counts = counts
+        self.row_by_id = {
+            item["item_id"]: row
+            for row, item in enumerate(menu_items)
+            if item.get("item_id") is not None
+        }
+        self.row_by_name: Dict[str, int] = {}
+        for row, item in enumerate(menu_items):
+            self.row_by_name.setdefault(normalize_name(item.get("name")), row)
+        # (generation, matrix) of the last weighting
+        self.weighted: Optional[Tuple[int, sparse.csr_matrix]] = None
+
+
+class ItemVectorIndex:
+    """TF-IDF item vectors for every indexed restaurant"""
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        # Number of items containing each term (indexed by vocabulary column)
+        self._df: List[int] = []
+        self._num_items = 0
+        self._restaurants: Dict[str, _RestaurantVectors] = {}
+        # Bumped whenever document frequencies change
+        self._generation = 0
+
+    def index_restaurant(self, restaurant_id: str, menu_items: List[Dict[str, Any]]) -> None:
+        """Add (or replace) a restaurant's menu in the index"""
+        self.remove_restaurant(restaurant_id)
+
+        rows, cols, values = [], [], []
+        for row, item in enumerate(menu_items):
+            for term, count in item_terms(item).items():
+                col = self.vocabulary.get(term)
+                if col is None:
+                    col = self.vocabulary[term] = len(self._df)
+                    self._df.append(0)
+                self._df[col] += 1
+                rows.append(row)
+                cols.append(col)
+                values.append(count)
+
+        counts = sparse.csr_matrix(
+            (np.asarray(values, dtype=np.float32), (rows, cols)),
+            shape=(len(menu_items), len(self._df)),
+        )
+        self._restaurants[restaurant_id] = _RestaurantVectors(menu_items, counts)
+        self._num_items += len(menu_items)
+        self._generation += 1
+
+    def remove_restaurant(self, restaurant_id: str) -> None:
+        """Drop a restaurant and its contribution to the document frequencies"""
+        vectors = self._restaurants.pop(restaurant_id, None)
+        if vectors is None:
+            return
+        # Each nonzero is one (item, term) pair, i.e. one document occurrence
+        for col in vectors.counts.indices:
+            self._df[col] -= 1
+        self._num_items -= len(vectors.items)
+        self._generation += 1
+
+    def __contains__(self, restaurant_id: str) -> bool:
+        return restaurant_id in self._restaurants
+
+    def _idf(self) -> np.ndarray:
+        df = np.asarray(self._df, dtype=np.float32)
+        # Smoothed idf, as in scikit-learn
+        return np.log((1.0 + self._num_items) / (1.0 + df)) + 1.0
+
+    def vectors(self, restaurant_id: str) -> Optional[sparse.csr_matrix]:
+        """L2-normalized TF-IDF matrix of a restaurant (one row per menu item)"""
+        entry = self._restaurants.get(restaurant_id)
+        if entry is None:
+            return None
+        if entry.weighted is None or entry.weighted[0] != self._generation:
+            idf = self._idf()
+            counts = entry.counts
+            weighted = counts.multiply(idf[: counts.shape[1]]).tocsr()
+            norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1))).ravel()
+            norms[norms == 0] = 1.0
+            weighted = sparse.diags(1.0 / norms) @ weighted
+            entry.weighted = (self._generation, weighted.astype(np.float32).tocsr())
+        return entry.weighted[1]
+
+    def rows_for_names(self, restaurant_id: str, names: Iterable[str]) -> List[int]:
+        """Matrix rows of the named items (unknown names are skipped)"""
+        entry = self._restaurants.get(restaurant_id)
+        if entry is None:
+            return []
+        rows = (entry.row_by_name.get(normalize_name(name)) for name in names)
+        return [row for row in rows if row is not None]
+
+    def similarity_to(self, restaurant_id: str, query_rows: List[int]) -> Optional[np.ndarray]:
+        """
+        Cosine similarity of every item to each query item, as an (items x queries) array
+
+        All queries are answered with one sparse matrix product.
+        """
+        matrix = self.vectors(restaurant_id)
+        if matrix is None or not query_rows:
+            return None
+        return (matrix @ matrix[query_rows].T).toarray()
+
+    def similar(
+        self, restaurant_id: str, item_id: int, top_k: int = 5
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Most similar other items to a menu item, with their cosine similarity"""
+        entry = self._restaurants.get(restaurant_id)
+        row = entry.row_by_id.get(item_id) if entry is not None else None
+        if row is None:
+            return []
+
+        scores = self.similarity_to(restaurant_id, [row])[:, 0]
+        scores[row] = -1.0
+        # The same dish listed twice (e.g. under "Most Ordered") isn't "more like this"
+        name = normalize_name(entry.items[row].get("name"))
+        order = np.argsort(-scores, kind="stable")
+        results = []
+        seen = {name}
+        for candidate in order:
+            if len(results) >= top_k or scores[candidate] <= 0:
+                break
+            candidate_name = normalize_name(entry.items[candidate].get("name"))
+            if candidate_name in seen:
+                continue
+            seen.add(candidate_name)
+            results.append((entry.items[candidate], float(scores[candidate])))
+        return results
+
+    def demote_similar(
+        self,
+        restaurant_id: str,
+        ranked_items: List[Dict[str, Any]],
+        dislikes: List[str],
+        threshold: float,
+    ) -> List[Dict[str, Any]]:
+        """
+        Move items too similar to a disliked item behind all the others
+
+        Order is otherwise kept, so this can run on an already ranked list.
+        """
+        dislike_rows = self.rows_for_names(restaurant_id, dislikes)
+        if not dislike_rows or not ranked_items:
+            return ranked_items
+        entry = self._restaurants[restaurant_id]
+        similarity = self.similarity_to(restaurant_id, dislike_rows).max(axis=1)
+
+        kept, demoted = [], []
+        for item in ranked_items:
+            row = entry.row_by_id.get(item.get("item_id"))
+            if row is None:
+                row = entry.row_by_name.get(normalize_name(item.get("name")))
+            if row is not None and similarity[row] >= threshold:
+                demoted.append(item)
+            else:
+                kept.append(item)
+        return kept + demoted
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "restaurants": len(self._restaurants),
+            "items": self._num_items,
+            "vocabulary": len(self.vocabulary),
+        }
+
+
+# Global item vector index, filled when the catalog loads
+item_vectors = ItemVectorIndex()
@@ -0,0 +1,87 @@
+"""
+Per-restaurant menu lookup index.
+
+Built once per restaurant when the catalog loads (and again on menu upload)
+so resolving an item by name or item_id is a dict lookup, with the price
+already parsed to a float. Item names are also prepared for fuzzy lookups
+of names that are slightly off.
+"""
+
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from util.fuzzy_match import FuzzyIndex
+
+# Price shown when a menu item has no parseable price
+DEFAULT_PRICE = 15.99
+
+# Minimum FuzzyMatcher score for an inexact name to resolve to a menu item
+FUZZY_NAME_THRESHOLD = 0.85
+
+_PRICE_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def normalize_name(name: Any) -> str:
+    """Lookup key for an item name (case and surrounding whitespace ignored)"""
+    return str(name or "").strip().lower()
+
+
+def parse_price(price: Any) -> Optional[float]:
+    """Numeric price from values like "$12.99", "$14.95+" or 9.5 (None if absent)"""
+    if isinstance(price, (int, float)) and not isinstance(price, bool):
+        return float(price)
+    if not isinstance(price, str):
+        return None
+    match = _PRICE_RE.search(price.replace(",", ""))
+    return float(match.group()) if match else None
+
+
+class MenuEntry(NamedTuple):
+    item: Dict[str, Any]
+    # Parsed price, None if the menu doesn't list one
+    price: Optional[float]
+
+    @property
+    def display_price(self) -> float:
+        return self.price if self.price is not None else DEFAULT_PRICE
+
+
+class MenuIndex:
+    """Name and item_id lookups over one restaurant's menu"""
+
+    def __init__(self, menu_items: List[Dict[str, Any]]):
+        self.by_name: Dict[str, MenuEntry] = {}
+        self.by_id: Dict[int, MenuEntry] = {}
+        for item in menu_items:
+            entry = MenuEntry(item, parse_price(item.get("price")))
+            # Items repeated under "Most Ordered" resolve to their last listing
+            self.by_name[normalize_name(item.get("name"))] = entry
+            if item.get("item_id") is not None:
+                self.by_id[item["item_id"]] = entry
+        self._fuzzy_names = FuzzyIndex(
+            entry.item.get("name") or "" for entry in self.by_name.values()
+        )
+
+    def find(self, name: Any) -> Optional[MenuEntry]:
+        """Entry for an item name, or None if it isn't on the menu"""
+        return self.by_name.get(normalize_name(name))
+
+    def find_closest(
+        self, name: Any, threshold: float = FUZZY_NAME_THRESHOLD
+    ) -> Optional[MenuEntry]:
+        """Entry for an item name, falling back to the closest fuzzy match"""
+        entry = self.find(name)
+        if entry is not None or not isinstance(name, str):
+            return entry
+        match = self._fuzzy_names.find_best_match(name, threshold)
+        return self.find(match[0]) if match else None
+
+    def get(self, item_id: int) -> Optional[MenuEntry]:
+        """Entry for an item_id, or None if there is no such item"""
+        return self.by_id.get(item_id)
+
+    def __contains__(self, name: Any) -> bool:
+        return normalize_name(name) in self.by_name
+
+    def __len__(self) -> int:
+        return len(self.by_name)
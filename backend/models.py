@@ -12,6 +12,7 @@ from sqlalchemy import (
     Float,
     ForeignKey,
     JSON,
+    LargeBinary,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -144,17 +145,42 @@ class UserSwipe(Base):
     menu_item = relationship("MenuItem")
 
 
+class UserPreferenceModel(Base):
+    __tablename__ = "user_preference_models"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+
+    # Logistic regression over 2**feature_bits hashed item features
+    feature_bits = Column(Integer, nullable=False)
+    weights = Column(LargeBinary, nullable=False)  # float32 array
+    bias = Column(Float, default=0.0)
+    updates = Column(Integer, default=0)  # Swipes learned from
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationship
+    user = relationship("User")
+
+
 class Recommendation(Base):
     __tablename__ = "recommendations"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    menu_item_id = Column(String, ForeignKey("menu_items.id"), nullable=False)
+    # Served items come from the in-memory catalog, which doesn't populate
+    # menu_items, so they are identified by restaurant and item instead
+    menu_item_id = Column(String, ForeignKey("menu_items.id"), nullable=True)
+    restaurant_id = Column(String, nullable=True, index=True)
+    item_id = Column(Integer, nullable=True)  # item_id within the restaurant's menu
+    item_name = Column(String, nullable=True)
 
     # Recommendation data
     confidence_score = Column(Float, nullable=False)
     reasoning = Column(Text, nullable=True)
     session_id = Column(String, nullable=True)
+    source = Column(String, nullable=True)  # "llm", "local", "local_fallback", ...
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -76,7 +76,8 @@ def detect_with_groq(image_path):
         if not groq_api_key:
             raise ValueError("GROQ_KEY environment variable not found.")
             
-        client = Groq(api_key=groq_api_key)
+        # GROQ_BASE_URL points at another server, e.g. fake_llm_server.py for load tests
+        client = Groq(api_key=groq_api_key, base_url=os.environ.get("GROQ_BASE_URL") or None)
     except Exception as e:
         return f"Error initializing Groq client: {e}"
 
@@ -0,0 +1,145 @@
+"""
+Write-behind audit log of served recommendations.
+
+Requests only append a row to an in-memory buffer. A background task writes
+the buffer to the recommendations table in one bulk insert when it reaches
+the batch size or the flush interval elapses, and the FastAPI lifespan
+drains it on shutdown.
+"""
+
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from config import settings
+from database import SessionLocal
+from models import Recommendation
+
+
+class RecommendationAuditLog:
+    """Buffer of recommendation events flushed to the database in batches"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        batch_size: int = 100,
+        flush_seconds: float = 2.0,
+        max_pending: int = 10000,
+    ):
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.write_errors = 0
+
+    def record(
+        self,
+        user_id: str,
+        restaurant_id: str,
+        recommendation: Dict[str, Any],
+        session_id: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> None:
+        """Queue one served recommendation (never blocks on the database)"""
+        if not self.enabled:
+            return
+        if len(self._pending) >= self.max_pending:
+            # The database is falling behind; keep the newest events
+            self._pending.popleft()
+            self.dropped += 1
+        item_id = recommendation.get("item_id")
+        self._pending.append(
+            {
+                "user_id": user_id,
+                "restaurant_id": restaurant_id,
+                "item_id": item_id if isinstance(item_id, int) else None,
+                "item_name": recommendation.get("recommended_item"),
+                "confidence_score": float(recommendation.get("confidence", 0.0)),
+                "reasoning": recommendation.get("reasoning"),
+                "session_id": session_id,
+                "source": source,
+                "created_at": datetime.now(timezone.utc),
+            }
+        )
+        self.recorded += 1
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        """Start the background flusher (called from the app lifespan)"""
+        if not self.enabled or self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and write everything still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Write all buffered events in one bulk insert; returns rows written"""
+        if not self._pending:
+            return 0
+        rows = list(self._pending)
+        self._pending.clear()
+        self.flushes += 1
+        try:
+            await asyncio.to_thread(self._write, rows)
+        except Exception as e:
+            self.write_errors += 1
+            self.dropped += len(rows)
+            print(f"Failed to write {len(rows)} recommendation audit rows: {e}")
+            return 0
+        self.written += len(rows)
+        return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        with SessionLocal() as db:
+            db.execute(insert(Recommendation), rows)
+            db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "write_errors": self.write_errors,
+        }
+
+
+# Global audit log for the recommendation endpoints
+recommendation_audit = RecommendationAuditLog(
+    enabled=settings.RECS_AUDIT_ENABLED,
+    batch_size=settings.RECS_AUDIT_BATCH_SIZE,
+    flush_seconds=settings.RECS_AUDIT_FLUSH_SECONDS,
+    max_pending=settings.RECS_AUDIT_MAX_PENDING,
+)
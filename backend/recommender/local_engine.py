@@ -0,0 +1,292 @@
+"""
+Deterministic local recommendation engine.
+
+Each restaurant's menu is turned into a NumPy feature matrix once at catalog
+load: a binary bag of words over item name/description/category plus a few
+numeric columns (community rank, review mentions, popularity, drink flag,
+price). A user profile becomes weights over the same columns, so recommending
+is a single vectorized scoring pass with no network calls. The weights and
+signals are the ones prerank_menu_items uses (see ranking.py). A user's
+learned swipe preferences (see preference_model) add one sparse product over
+hashed item features.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from config import settings
+from .preference_model import PreferenceModel, hashed_item_matrix
+from .ranking import (
+    COMMUNITY_WEIGHT,
+    DRINK_WEIGHT,
+    FLAVOR_KEYWORDS,
+    MENTION_WEIGHT,
+    ProfileWeights,
+    community_score,
+    entry_names,
+    is_drink,
+    item_words,
+    popularity_score,
+    price_positions,
+    profile_weights,
+    review_mentions,
+    text_words,
+)
+
+# Numeric feature columns (order of MenuFeatures.numeric)
+_NUMERIC_COLUMNS = ("community", "mentions", "popularity", "drink", "price")
+_DRINK_COLUMN = _NUMERIC_COLUMNS.index("drink")
+
+
+class MenuFeatures:
+    """Feature matrix for one restaurant's menu"""
+
+    def __init__(self, restaurant_data: Dict[str, Any]):
+        menu_items = restaurant_data.get("menu_items", [])
+        favorites = entry_names(restaurant_data.get("top_items", []))
+        reviews = [r.lower() for r in restaurant_data.get("reviews", []) if isinstance(r, str)]
+
+        self.items: List[Dict[str, Any]] = []
+        self.names: List[str] = []
+        self.index_by_name: Dict[str, int] = {}
+        self.item_ids: List[int] = []
+        self.item_words: List[Set[str]] = []
+        vocabulary: Dict[str, int] = {}
+        numeric_rows = []
+
+        for item in menu_items:
+            name = str(item.get("name", "")).strip().lower()
+            # DoorDash menus repeat "Most Ordered" items in their own category
+            if not name or name in self.index_by_name:
+                continue
+            self.index_by_name[name] = len(self.items)
+            self.items.append(item)
+            self.item_ids.append(item.get("item_id", len(self.items) - 1))
+            self.names.append(name)
+
+            words = item_words(item)
+            self.item_words.append(words)
+            for word in sorted(words):
+                vocabulary.setdefault(word, len(vocabulary))
+
+            numeric_rows.append(
+                [
+                    community_score(name, favorites),
+                    review_mentions(name, reviews),
+                    popularity_score(item),
+                    float(is_drink(words)),
+                    0.0,
+                ]
+            )
+
+        self.vocabulary = vocabulary
+        self.words = np.zeros((len(self.items), len(vocabulary)), dtype=np.float32)
+        for row, words in enumerate(self.item_words):
+            self.words[row, [vocabulary[w] for w in words]] = 1.0
+
+        self.numeric = np.array(numeric_rows, dtype=np.float32).reshape(
+            len(self.items), len(_NUMERIC_COLUMNS)
+        )
+        self.numeric[:, _NUMERIC_COLUMNS.index("price")] = price_positions(self.items)
+        # Hashed features the per-user preference models are trained on
+        self.hashed = hashed_item_matrix(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def columns(self, words: Iterable[str]) -> List[int]:
+        """Word columns of the words that occur on this menu"""
+        return [self.vocabulary[word] for word in words if word in self.vocabulary]
+
+    def has_any(self, words: Iterable[str]) -> np.ndarray:
+        """Per item, whether it has any of the words"""
+        columns = self.columns(words)
+        if not columns:
+            return np.zeros(len(self.items), dtype=bool)
+        return self.words[:, columns].any(axis=1)
+
+
+class LocalRecommender:
+    """Vectorized profile-vs-menu scoring over precomputed MenuFeatures"""
+
+    def __init__(self, preference_weight: float = 2.0):
+        # Scale of a user's learned log-odds relative to the profile score
+        self.preference_weight = preference_weight
+        # restaurant_id -> (catalog_version, features)
+        self._features: Dict[str, Tuple[int, MenuFeatures]] = {}
+
+    def index_restaurant(
+        self, restaurant_id: str, restaurant_data: Dict[str, Any], catalog_version: int
+    ) -> MenuFeatures:
+        """Build (or rebuild) the feature matrix for a restaurant"""
+        features = MenuFeatures(restaurant_data)
+        self._features[restaurant_id] = (catalog_version, features)
+        return features
+
+    def get_features(
+        self, restaurant_id: str, restaurant_data: Dict[str, Any], catalog_version: int
+    ) -> MenuFeatures:
+        """Features for a restaurant, rebuilt if the catalog changed since indexing"""
+        entry = self._features.get(restaurant_id)
+        if entry is None or entry[0] != catalog_version:
+            return self.index_restaurant(restaurant_id, restaurant_data, catalog_version)
+        return entry[1]
+
+    def profile_vector(
+        self, features: MenuFeatures, weights: ProfileWeights
+    ) -> np.ndarray:
+        """Per-word profile weights over a restaurant's word columns"""
+        vector = np.zeros(len(features.vocabulary), dtype=np.float32)
+        for word, weight in weights.words.items():
+            column = features.vocabulary.get(word)
+            if column is not None:
+                vector[column] = weight
+        return vector
+
+    def score(
+        self,
+        features: MenuFeatures,
+        user_profile: Dict[str, Any],
+        current_dislikes: List[str],
+        preference: Optional[PreferenceModel] = None,
+        allowed: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Score every menu item; rejected items get -inf
+
+        allowed, a boolean array indexed by item_id (see DietaryIndex), also
+        gives -inf to every item it doesn't allow.
+        """
+        weights = profile_weights(user_profile)
+        scores = features.words @ self.profile_vector(features, weights)
+        for keywords, weight in weights.keyword_groups:
+            scores += weight * features.has_any(keywords)
+        scores += features.numeric @ np.array(
+            [COMMUNITY_WEIGHT, MENTION_WEIGHT, 1.0, 0.0, weights.price], dtype=np.float32
+        )
+        # Drinks sharing a word with a liked food aren't penalized
+        scores += DRINK_WEIGHT * (
+            features.numeric[:, _DRINK_COLUMN] * ~features.has_any(weights.liked_words)
+        )
+        scores += self.learned_scores(features, preference)
+
+        for name in current_dislikes:
+            row = features.index_by_name.get(name.strip().lower())
+            if row is not None:
+                scores[row] = -np.inf
+        if allowed is not None:
+            scores[~allowed[features.item_ids]] = -np.inf
+        return scores
+
+    def learned_scores(
+        self, features: MenuFeatures, preference: Optional[PreferenceModel]
+    ) -> np.ndarray:
+        """Weighted swipe-learned score of every menu item (zeros without a model)"""
+        if preference is None or not preference.updates or not self.preference_weight:
+            return np.zeros(len(features), dtype=np.float32)
+        return self.preference_weight * preference.scores(features.hashed)
+
+    def rank(
+        self,
+        features: MenuFeatures,
+        user_profile: Dict[str, Any],
+        current_dislikes: List[str],
+        top_k: int,
+        preference: Optional[PreferenceModel] = None,
+        allowed: Optional[np.ndarray] = None,
+    ) -> List[Dict[str, Any]]:
+        """Top-K menu items by local score (rejected and disallowed items excluded)"""
+        scores = self.score(features, user_profile, current_dislikes, preference, allowed)
+        order = self._top_rows(scores, top_k)
+        return [features.items[row] for row in order]
+
+    def recommend(
+        self,
+        features: MenuFeatures,
+        user_profile: Dict[str, Any],
+        current_dislikes: List[str],
+        num_items: int = 1,
+        preference: Optional[PreferenceModel] = None,
+        allowed: Optional[np.ndarray] = None,
+    ) -> Dict[str, Any]:
+        """Recommendation in the same shape as ClaudeClient.generate_food_recommendation"""
+        scores = self.score(features, user_profile, current_dislikes, preference, allowed)
+        learned = self.learned_scores(features, preference)
+        rows = self._top_rows(scores, max(num_items, 1))
+        if not rows:
+            return {
+                "recommended_item": "Chef's Special",
+                "reasoning": "You've seen everything on this menu - the chef's special is a fresh take.",
+                "confidence": 0.5,
+                "alternatives": [],
+            }
+
+        picks = [
+            {
+                "recommended_item": features.items[row].get("name", "Chef's Special"),
+                "item_id": features.items[row].get("item_id"),
+                "reasoning": self._explain(features, row, user_profile, learned[row]),
+                "confidence": round(float(0.6 + 0.35 * np.tanh(scores[row] / 4.0)), 2),
+            }
+            for row in rows
+        ]
+        return {**picks[0], "alternatives": picks[1:]}
+
+    def _top_rows(self, scores: np.ndarray, k: int) -> List[int]:
+        """Indices of the k best finite scores, ties broken by menu order"""
+        finite = np.flatnonzero(np.isfinite(scores))
+        if len(finite) == 0:
+            return []
+        # Stable sort on negated scores keeps menu order among ties
+        order = finite[np.argsort(-scores[finite], kind="stable")]
+        return order[:k].tolist()
+
+    def _explain(
+        self,
+        features: MenuFeatures,
+        row: int,
+        user_profile: Dict[str, Any],
+        learned: float = 0.0,
+    ) -> str:
+        """Short human-readable reason built from the strongest signals"""
+        item = features.items[row]
+        words = features.item_words[row]
+        reasons = []
+
+        liked = [
+            name
+            for name in entry_names(user_profile.get("liked_foods"))
+            if text_words(name) & words
+        ]
+        if liked:
+            reasons.append(f"it lines up with foods you like ({', '.join(liked[:2])})")
+        elif learned > 0.5:
+            reasons.append("it's like the dishes you swiped right on")
+
+        flavor_profile = user_profile.get("flavor_profile") or {}
+        if isinstance(flavor_profile, dict):
+            for field, keywords in FLAVOR_KEYWORDS.items():
+                level = flavor_profile.get(field)
+                if isinstance(level, (int, float)) and level >= 4 and words & keywords:
+                    flavor = field.split("_")[0]
+                    reasons.append(f"it suits your {flavor} preference")
+                    break
+
+        community, mentions, popularity = features.numeric[row, :3]
+        if community > 0:
+            reasons.append("it's a community favorite on Beli")
+        if mentions > 0:
+            reasons.append("reviewers mention it")
+        if popularity > 0.5:
+            reasons.append("it's one of the most ordered items")
+
+        if not reasons:
+            reasons.append("it's a well-rounded pick that fits your profile")
+        if len(reasons) > 1:
+            reasons = [", ".join(reasons[:-1]) + " and " + reasons[-1]]
+        return f"We picked {item.get('name', 'this item')} because {reasons[0]}."
+
+
+# Global engine shared by the catalog loader and the recommendation endpoints
+local_recommender = LocalRecommender(preference_weight=settings.RECS_PREFERENCE_WEIGHT)
@@ -0,0 +1,145 @@
+"""
+Restaurant selection and bounded fan-out for "what should I eat nearby".
+
+Restaurants are ranked locally by distance and fit with the user's profile,
+then the top few are asked for recommendations in parallel, with a cap on
+concurrent calls and one deadline for the whole fan-out.
+"""
+
+import asyncio
+import math
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+EARTH_RADIUS_KM = 6371.0
+
+# Weights of the restaurant fit components (each scored in [0, 1])
+_FIT_WEIGHTS = {"distance": 0.4, "cuisine": 0.3, "rating": 0.2, "price": 0.1}
+
+# Dollar signs matching each price_range_preference
+_PRICE_LEVELS = {"budget": 1, "low": 1, "mid-range": 2, "medium": 2, "upscale": 3, "high": 3}
+
+
+class RankedRestaurant(NamedTuple):
+    summary: Dict[str, Any]
+    distance_km: float
+    # Fit in [0, 1]: distance, cuisine match, rating and price level
+    fit: float
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometers"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _as_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _cuisine_score(tags: List[str], user_profile: Dict[str, Any]) -> float:
+    """Strongest cuisine preference matching one of the restaurant's tags"""
+    tags = [str(tag).lower() for tag in tags]
+    best = 0.0
+    for preference in user_profile.get("cuisine_preferences") or []:
+        # Plain strings name a cuisine without a preference level
+        if not isinstance(preference, dict):
+            preference = {"cuisine_type": preference}
+        cuisine = str(preference.get("cuisine_type") or "").lower()
+        if cuisine and any(cuisine in tag or tag in cuisine for tag in tags):
+            level = _as_float(preference.get("preference_level")) or 3.0
+            best = max(best, min(level, 5.0) / 5.0)
+    return best
+
+
+def _price_score(price_range: Any, user_profile: Dict[str, Any]) -> float:
+    """1 when the restaurant's $-level matches the preference, 0.5 if either is unknown"""
+    wanted = _PRICE_LEVELS.get(str(user_profile.get("price_range_preference") or "").lower())
+    level = str(price_range or "").count("$")
+    if wanted is None or level == 0:
+        return 0.5
+    return max(0.0, 1.0 - abs(level - wanted) / 2.0)
+
+
+def restaurant_fit(
+    summary: Dict[str, Any], distance_km: float, radius_km: float, user_profile: Dict[str, Any]
+) -> float:
+    """Weighted fit of a restaurant summary for the user, in [0, 1]"""
+    rating = _as_float(summary.get("average_rating"))
+    scores = {
+        "distance": max(0.0, 1.0 - distance_km / radius_km),
+        "cuisine": _cuisine_score(summary.get("tags") or [], user_profile),
+        "rating": min(rating, 5.0) / 5.0 if rating is not None else 0.5,
+        "price": _price_score(summary.get("price_range"), user_profile),
+    }
+    return sum(_FIT_WEIGHTS[name] * score for name, score in scores.items())
+
+
+def rank_restaurants(
+    summaries: List[Dict[str, Any]],
+    latitude: float,
+    longitude: float,
+    user_profile: Dict[str, Any],
+    radius_km: float,
+    top_m: int,
+) -> List[RankedRestaurant]:
+    """Best top_m restaurants within radius_km, by fit (closest first on ties)"""
+    ranked = []
+    for summary in summaries:
+        lat = _as_float(summary.get("latitude"))
+        lon = _as_float(summary.get("longitude"))
+        if lat is None or lon is None or not summary.get("id"):
+            continue
+        distance_km = haversine_km(latitude, longitude, lat, lon)
+        if distance_km > radius_km:
+            continue
+        ranked.append(
+            RankedRestaurant(
+                summary, distance_km, restaurant_fit(summary, distance_km, radius_km, user_profile)
+            )
+        )
+    ranked.sort(key=lambda restaurant: (-restaurant.fit, restaurant.distance_km))
+    return ranked[:top_m]
+
+
+async def fan_out(
+    calls: Dict[str, Callable[[], Awaitable[T]]],
+    concurrency: int,
+    timeout: Optional[float],
+) -> Tuple[Dict[str, T], List[str]]:
+    """
+    Run calls with at most `concurrency` in flight, all within `timeout` seconds
+
+    Returns the results by key and the keys that missed the deadline (those
+    are cancelled). Calls that fail are logged and left out of both.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def bounded(call: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await call()
+
+    tasks = {key: asyncio.create_task(bounded(call)) for key, call in calls.items()}
+    if not tasks:
+        return {}, []
+    _, pending = await asyncio.wait(tasks.values(), timeout=timeout or None)
+    for task in pending:
+        task.cancel()
+
+    results: Dict[str, T] = {}
+    timed_out: List[str] = []
+    for key, task in tasks.items():
+        if task in pending:
+            timed_out.append(key)
+        elif task.exception() is not None:
+            print(f"Nearby recommendation for {key} failed: {task.exception()}")
+        else:
+            results[key] = task.result()
+    return results, timed_out
@@ -0,0 +1,243 @@
+"""
+Online per-user preference model learned from swipes.
+
+Each user has a logistic regression over hashed menu item features (the
+words of the item's name, description and category, plus its category as a
+whole). Every like or dislike is one SGD step that touches only that item's
+features, and scoring a menu is one sparse matrix-vector product against the
+restaurant's precomputed feature matrix. Weights are loaded lazily from the
+database and written back after each update, both off the event loop.
+"""
+
+import asyncio
+import re
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from config import settings
+from database import SessionLocal
+from models import UserPreferenceModel
+from util.singleflight import SingleFlight
+
+FEATURE_BITS = 12
+FEATURE_DIM = 1 << FEATURE_BITS
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+def item_feature_indices(item: Dict[str, Any]) -> np.ndarray:
+    """Hashed feature columns of a menu item (sorted, unique)"""
+    text = " ".join(
+        str(item.get(field) or "") for field in ("name", "description", "category")
+    ).lower()
+    tokens = {f"w:{word}" for word in _WORD_RE.findall(text)}
+    category = str(item.get("category") or "").strip().lower()
+    if category:
+        tokens.add(f"c:{category}")
+    # crc32 rather than hash(): str hashes are salted per process
+    return np.unique(
+        np.fromiter(
+            (zlib.crc32(token.encode()) & (FEATURE_DIM - 1) for token in tokens),
+            dtype=np.int32,
+            count=len(tokens),
+        )
+    )
+
+
+def _feature_value(indices: np.ndarray) -> float:
+    """Value of each active feature, so every item vector has unit length"""
+    return 1.0 / np.sqrt(len(indices)) if len(indices) else 0.0
+
+
+def hashed_item_matrix(items: Iterable[Dict[str, Any]]) -> sparse.csr_matrix:
+    """Sparse (items x FEATURE_DIM) matrix of hashed item features"""
+    indptr = [0]
+    indices: List[np.ndarray] = []
+    values: List[np.ndarray] = []
+    for item in items:
+        columns = item_feature_indices(item)
+        indices.append(columns)
+        values.append(np.full(len(columns), _feature_value(columns), dtype=np.float32))
+        indptr.append(indptr[-1] + len(columns))
+    return sparse.csr_matrix(
+        (
+            np.concatenate(values) if values else np.zeros(0, dtype=np.float32),
+            np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32),
+            np.asarray(indptr),
+        ),
+        shape=(len(indptr) - 1, FEATURE_DIM),
+    )
+
+
+class PreferenceModel:
+    """Logistic regression weights of one user"""
+
+    def __init__(self, weights: Optional[np.ndarray] = None, bias: float = 0.0, updates: int = 0):
+        self.weights = (
+            weights if weights is not None else np.zeros(FEATURE_DIM, dtype=np.float32)
+        )
+        self.bias = bias
+        self.updates = updates
+
+    def update(
+        self, item: Dict[str, Any], liked: bool, learning_rate: float, l2: float
+    ) -> float:
+        """One SGD step on a swipe; returns the like probability before the update"""
+        columns = item_feature_indices(item)
+        value = _feature_value(columns)
+        margin = self.bias + value * float(self.weights[columns].sum())
+        probability = 1.0 / (1.0 + np.exp(-margin))
+        gradient = (1.0 if liked else 0.0) - probability
+        # Only the swiped item's features move (L2 shrinkage applied lazily, per feature)
+        self.weights[columns] += learning_rate * (
+            gradient * value - l2 * self.weights[columns]
+        )
+        self.bias += learning_rate * gradient
+        self.updates += 1
+        return float(probability)
+
+    def scores(self, item_matrix: sparse.csr_matrix) -> np.ndarray:
+        """Learned log-odds of a like, per row of a hashed item matrix (bias excluded)"""
+        return item_matrix @ self.weights
+
+
+class PreferenceStore:
+    """Per-user preference models, loaded lazily and kept in a bounded LRU"""
+
+    def __init__(self, learning_rate: float = 0.5, l2: float = 0.01, max_models: int = 10000):
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.max_models = max_models
+        # user_id -> model, or None once the database is known to have none
+        self._models: "OrderedDict[str, Optional[PreferenceModel]]" = OrderedDict()
+        # Concurrent first requests of a user share one database read
+        self._reads = SingleFlight()
+        # user_id -> newest (weights, bias, updates) not yet written, and the
+        # task writing it; one writer per user keeps writes in swipe order
+        self._unsaved: Dict[str, Tuple[bytes, float, int]] = {}
+        self._writers: Dict[str, asyncio.Task] = {}
+        self.loads = 0
+        self.saves = 0
+        self.save_errors = 0
+        self.updates = 0
+
+    async def load(self, user_id: str) -> Optional[PreferenceModel]:
+        """
+        The user's model, read from the database in a worker thread on first use
+
+        Endpoints await this before calling get() or record_swipe(), which
+        only look at models already in memory.
+        """
+        if user_id not in self._models:
+
+            async def read() -> Optional[PreferenceModel]:
+                return await asyncio.to_thread(self._load, user_id)
+
+            model = await self._reads.do(user_id, read)
+            # A swipe may have started a model while the read was running
+            if user_id not in self._models:
+                self._remember(user_id, model)
+        return self.get(user_id)
+
+    def get(self, user_id: str) -> Optional[PreferenceModel]:
+        """The user's model if they have swiped before and it is loaded (see load)"""
+        if user_id not in self._models:
+            return None
+        self._models.move_to_end(user_id)
+        return self._models[user_id]
+
+    def record_swipe(self, user_id: str, item: Dict[str, Any], liked: bool) -> PreferenceModel:
+        """Learn from one like/dislike of a menu item and persist the new weights"""
+        model = self.get(user_id)
+        if model is None:
+            model = PreferenceModel()
+            self._remember(user_id, model)
+        model.update(item, liked, self.learning_rate, self.l2)
+        self.updates += 1
+        self._schedule_save(user_id, model)
+        return model
+
+    def _remember(self, user_id: str, model: Optional[PreferenceModel]) -> None:
+        self._models[user_id] = model
+        self._models.move_to_end(user_id)
+        while len(self._models) > self.max_models:
+            self._models.popitem(last=False)
+
+    def _load(self, user_id: str) -> Optional[PreferenceModel]:
+        self.loads += 1
+        try:
+            with SessionLocal() as db:
+                row = db.get(UserPreferenceModel, user_id)
+                if row is None or row.feature_bits != FEATURE_BITS:
+                    return None
+                return PreferenceModel(
+                    np.frombuffer(row.weights, dtype=np.float32).copy(),
+                    row.bias,
+                    row.updates,
+                )
+        except Exception as e:
+            print(f"Failed to load preference model for {user_id}: {e}")
+            return None
+
+    def _schedule_save(self, user_id: str, model: PreferenceModel) -> None:
+        # Snapshot now; the write itself runs off the event loop
+        snapshot = (model.weights.tobytes(), model.bias, model.updates)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._save(user_id, *snapshot)
+            return
+        # Swipes arriving while a write runs replace each other: only the
+        # newest snapshot is written next
+        self._unsaved[user_id] = snapshot
+        if user_id not in self._writers:
+            self._writers[user_id] = asyncio.create_task(self._write_unsaved(user_id))
+
+    async def _write_unsaved(self, user_id: str) -> None:
+        try:
+            while user_id in self._unsaved:
+                snapshot = self._unsaved.pop(user_id)
+                await asyncio.to_thread(self._save, user_id, *snapshot)
+        finally:
+            del self._writers[user_id]
+
+    def _save(self, user_id: str, weights: bytes, bias: float, updates: int) -> None:
+        try:
+            with SessionLocal() as db:
+                row = db.get(UserPreferenceModel, user_id)
+                if row is None:
+                    row = UserPreferenceModel(user_id=user_id)
+                    db.add(row)
+                elif row.updates > updates:
+                    # A later swipe was already written
+                    return
+                row.feature_bits = FEATURE_BITS
+                row.weights = weights
+                row.bias = bias
+                row.updates = updates
+                db.commit()
+            self.saves += 1
+        except Exception as e:
+            self.save_errors += 1
+            print(f"Failed to save preference model for {user_id}: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "cached_users": len(self._models),
+            "updates": self.updates,
+            "loads": self.loads,
+            "saves": self.saves,
+            "save_errors": self.save_errors,
+            "unsaved": len(self._unsaved),
+        }
+
+
+# Global preference models for the recommendation endpoints
+preference_models = PreferenceStore(
+    learning_rate=settings.RECS_PREFERENCE_LEARNING_RATE,
+    l2=settings.RECS_PREFERENCE_L2,
+)
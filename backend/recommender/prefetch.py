@@ -0,0 +1,128 @@
+"""
+Speculative prefetch of the next swipe card.
+
+After a recommendation is served, the most likely next request is the same
+dislike set plus the item just shown (a left swipe). We start that Claude call
+in the background so the swipe can be answered from the finished task.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config import settings
+from .rec_cache import CacheKey
+
+
+class SwipePrefetcher:
+    """Per-user background recommendation tasks keyed by cache key"""
+
+    def __init__(self, max_per_user: int = 2, enabled: bool = True):
+        self.max_per_user = max_per_user
+        self.enabled = enabled
+        self._tasks: Dict[str, "OrderedDict[CacheKey, asyncio.Task]"] = {}
+        # Restaurant each user's prefetches belong to
+        self._restaurants: Dict[str, str] = {}
+        self.scheduled = 0
+        self.used = 0
+        self.wasted = 0
+        self.cancelled = 0
+
+    def schedule(
+        self,
+        user_id: str,
+        restaurant_id: str,
+        key: CacheKey,
+        factory: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> bool:
+        """Start a background recommendation for a predicted next request"""
+        if not self.enabled or self.max_per_user <= 0:
+            return False
+
+        self.visit(user_id, restaurant_id)
+        tasks = self._tasks.setdefault(user_id, OrderedDict())
+        if key in tasks:
+            return False
+
+        # Enforce the per-user cap by dropping the oldest speculation
+        while len(tasks) >= self.max_per_user:
+            _, oldest = tasks.popitem(last=False)
+            self._discard(oldest)
+
+        task = asyncio.create_task(factory())
+        task.add_done_callback(_consume_exception)
+        tasks[key] = task
+        self.scheduled += 1
+        return True
+
+    def visit(self, user_id: str, restaurant_id: str) -> None:
+        """Record where a user is swiping; moving to another restaurant cancels old prefetches"""
+        if self._restaurants.get(user_id) not in (None, restaurant_id):
+            self.cancel_user(user_id)
+        self._restaurants[user_id] = restaurant_id
+
+    async def take(self, user_id: str, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Claim the prefetched result for a key, awaiting it if still running"""
+        tasks = self._tasks.get(user_id)
+        task = tasks.pop(key, None) if tasks else None
+        if task is None:
+            return None
+
+        try:
+            result = await asyncio.shield(task)
+        except Exception:
+            self.wasted += 1
+            return None
+
+        # A mock/fallback answer is not worth serving over a fresh attempt
+        if result.get("fallback"):
+            self.wasted += 1
+            return None
+
+        self.used += 1
+        return result
+
+    def cancel_user(self, user_id: str, restaurant_id: Optional[str] = None) -> int:
+        """Cancel a user's prefetches (optionally only for one restaurant)"""
+        if restaurant_id and self._restaurants.get(user_id) != restaurant_id:
+            return 0
+
+        tasks = self._tasks.pop(user_id, None) or {}
+        self._restaurants.pop(user_id, None)
+        for task in tasks.values():
+            self._discard(task)
+        return len(tasks)
+
+    def stats(self) -> Dict[str, Any]:
+        finished = self.used + self.wasted + self.cancelled
+        return {
+            "enabled": self.enabled,
+            "max_per_user": self.max_per_user,
+            "in_flight": sum(len(tasks) for tasks in self._tasks.values()),
+            "scheduled": self.scheduled,
+            "used": self.used,
+            "wasted": self.wasted,
+            "cancelled": self.cancelled,
+            "hit_rate": self.used / finished if finished else 0.0,
+        }
+
+    def _discard(self, task: asyncio.Task) -> None:
+        """Drop a prefetch nobody claimed"""
+        if task.done():
+            self.wasted += 1
+        else:
+            task.cancel()
+            self.cancelled += 1
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    """Retrieve background exceptions so asyncio doesn't log them as unhandled"""
+    if not task.cancelled():
+        task.exception()
+
+
+# Global prefetcher shared by the recommendation endpoints
+swipe_prefetcher = SwipePrefetcher(
+    max_per_user=settings.RECS_PREFETCH_MAX_PER_USER,
+    enabled=settings.RECS_PREFETCH_ENABLED,
+)
@@ -0,0 +1,298 @@
+"""
+Local candidate pre-ranking for the recommender.
+
+Scores every menu item against the user's profile and the restaurant's social
+signals so only the top-K candidates are sent to Claude. This keeps the prompt
+roughly the same size no matter how long the menu is.
+
+The weights, and the translation of a profile into them (profile_weights),
+are shared with the vectorized local engine (local_engine.py), so both rank
+a menu the same way.
+"""
+
+import re
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from food_info.menu_index import parse_price
+
+# Words in an item that conflict with a dietary restriction (matched as substrings
+# of the restriction name, e.g. "gluten-free" -> "gluten")
+RESTRICTION_CONFLICTS: Dict[str, Set[str]] = {
+    "vegetarian": {
+        "chicken", "beef", "pork", "lamb", "bacon", "ham", "sausage", "steak",
+        "turkey", "duck", "fish", "shrimp", "crab", "lobster", "salmon", "tuna",
+        "pepperoni", "meat", "meatball", "anchovy", "clam", "squid", "calamari",
+    },
+    "vegan": {
+        "chicken", "beef", "pork", "lamb", "bacon", "ham", "sausage", "steak",
+        "turkey", "duck", "fish", "shrimp", "crab", "lobster", "salmon", "tuna",
+        "pepperoni", "meat", "meatball", "anchovy", "clam", "squid", "calamari",
+        "cheese", "milk", "cream", "butter", "egg", "eggs", "yogurt", "honey",
+        "mozzarella", "parmesan", "ricotta", "mayo", "mayonnaise",
+    },
+    "pescetarian": {
+        "chicken", "beef", "pork", "lamb", "bacon", "ham", "sausage", "steak",
+        "turkey", "duck", "pepperoni", "meat", "meatball",
+    },
+    "gluten": {"bread", "bun", "pasta", "noodle", "noodles", "flour", "wheat",
+               "breaded", "crust", "pizza", "dumpling", "wonton", "tortilla"},
+    "dairy": {"cheese", "milk", "cream", "butter", "yogurt", "mozzarella",
+              "parmesan", "ricotta", "latte"},
+    "lactose": {"cheese", "milk", "cream", "butter", "yogurt", "mozzarella",
+                "parmesan", "ricotta", "latte"},
+    "nut": {"peanut", "peanuts", "almond", "almonds", "cashew", "cashews",
+            "walnut", "pecan", "pistachio", "hazelnut", "satay", "pesto"},
+    "shellfish": {"shrimp", "crab", "lobster", "clam", "mussel", "oyster",
+                  "scallop", "prawn"},
+    "pork": {"pork", "bacon", "ham", "sausage", "pepperoni", "prosciutto",
+             "chorizo"},
+    "halal": {"pork", "bacon", "ham", "pepperoni", "prosciutto", "wine"},
+    "egg": {"egg", "eggs", "omelette", "mayo", "mayonnaise"},
+    "soy": {"soy", "tofu", "edamame", "miso", "tempeh", "teriyaki"},
+    "sesame": {"sesame", "tahini", "hummus"},
+}
+
+# Words that signal a flavor, keyed by FlavorProfile field
+FLAVOR_KEYWORDS: Dict[str, Set[str]] = {
+    "spicy_tolerance": {"spicy", "hot", "chili", "chilli", "jalapeno", "sriracha",
+                        "curry", "buffalo", "szechuan", "sichuan", "harissa", "pepper"},
+    "sweet_preference": {"sweet", "honey", "caramel", "chocolate", "dessert",
+                         "cake", "syrup", "teriyaki", "mango", "sugar"},
+    "salty_preference": {"salted", "salty", "fries", "bacon", "soy", "pretzel",
+                         "chips", "pickles", "feta"},
+    "sour_preference": {"sour", "lime", "lemon", "tamarind", "vinegar",
+                        "pickled", "tangy", "citrus"},
+    "umami_preference": {"mushroom", "soy", "miso", "parmesan", "broth",
+                         "ramen", "truffle", "anchovy", "seaweed", "beef"},
+    "bitter_tolerance": {"coffee", "espresso", "arugula", "kale", "bitter",
+                         "grapefruit", "radicchio", "broccoli"},
+}
+
+# Categories/words for drinks, which make poor swipe cards
+DRINK_WORDS = {"drink", "drinks", "beverage", "beverages", "soda", "coke",
+               "sprite", "water", "juice", "liquors", "beer", "wine", "tea",
+               "coffee", "lemonade"}
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Severity of a dietary restriction -> penalty for a conflicting item
+SEVERITY_PENALTY = {"allergy": 20.0, "intolerance": 8.0, "preference": 4.0}
+DEFAULT_SEVERITY_PENALTY = SEVERITY_PENALTY["preference"]
+# Per preference level above or below neutral (3), for cuisines and flavors
+PREFERENCE_LEVEL_WEIGHT = 0.5
+# Cuisines listed without a preference level
+CUISINE_WEIGHT = 0.5
+# Per item word shared with a liked / disliked food
+LIKED_WORD_WEIGHT = 1.5
+DISLIKED_WORD_WEIGHT = -2.0
+# Beli favorite (scaled down with its rank), per review mention (up to
+# MAX_MENTIONS), "most ordered" items, and drinks the user doesn't like
+COMMUNITY_WEIGHT = 2.0
+MENTION_WEIGHT = 0.5
+MAX_MENTIONS = 3
+MOST_ORDERED_BONUS = 0.75
+DRINK_WEIGHT = -1.0
+# Price preference -> weight of the item's price position within the menu
+PRICE_WEIGHTS = {"budget": -1.5, "mid-range": 0.0, "upscale": 1.0}
+
+
+class ProfileWeights(NamedTuple):
+    """A user profile turned into item scoring weights"""
+
+    # Added once per matching item word (cuisines, liked and disliked foods)
+    words: Dict[str, float]
+    # Added once if the item has any of the words (restrictions, flavors)
+    keyword_groups: List[Tuple[FrozenSet[str], float]]
+    # Drinks sharing a word with a liked food aren't penalized
+    liked_words: Set[str]
+    # Multiplies the item's price position (-1 cheapest .. 1 priciest)
+    price: float
+
+
+def text_words(text: Any) -> Set[str]:
+    """Lowercased word set of a string (non-strings yield no words)"""
+    if not isinstance(text, str):
+        return set()
+    return set(_WORD_RE.findall(text.lower()))
+
+
+def item_words(item: Dict[str, Any]) -> Set[str]:
+    """Words of a menu item's name, description and category"""
+    return (
+        text_words(item.get("name"))
+        | text_words(item.get("description"))
+        | text_words(item.get("category"))
+    )
+
+
+def entry_names(entries: Iterable[Any], key: str = "name") -> List[str]:
+    """Lowercased names from a list of dicts or strings"""
+    names = []
+    for entry in entries or []:
+        name = entry.get(key, "") if isinstance(entry, dict) else entry
+        if isinstance(name, str) and name.strip():
+            names.append(name.strip().lower())
+    return names
+
+
+def rating_score(rating: Any) -> float:
+    """Turn DoorDash ratings like '84% (53)' into a small bonus"""
+    if not isinstance(rating, str) or "%" not in rating:
+        return 0.0
+    try:
+        percent = float(rating.split("%", 1)[0])
+    except ValueError:
+        return 0.0
+    return (percent - 75.0) / 25.0
+
+
+def popularity_score(item: Dict[str, Any]) -> float:
+    """Rating bonus plus MOST_ORDERED_BONUS for DoorDash "Most Ordered" items"""
+    most_ordered = item.get("most_ordered") or "most ordered" in str(
+        item.get("category", "")
+    ).lower()
+    bonus = MOST_ORDERED_BONUS if most_ordered else 0.0
+    return rating_score(item.get("rating")) + bonus
+
+
+def community_score(name: str, favorite_names: List[str]) -> float:
+    """1 for the top Beli favorite, less for later ones, 0 if not a favorite"""
+    for rank, favorite in enumerate(favorite_names):
+        if favorite == name or favorite in name or name in favorite:
+            return 1.0 / (1.0 + 0.25 * rank)
+    return 0.0
+
+
+def review_mentions(name: str, review_texts: List[str]) -> int:
+    """Reviews (lowercased) mentioning the item, capped at MAX_MENTIONS"""
+    return min(sum(1 for text in review_texts if name in text), MAX_MENTIONS)
+
+
+def is_drink(words: Set[str]) -> bool:
+    """Whether an item's words mark it as a drink (poor swipe cards)"""
+    return bool(words & DRINK_WORDS)
+
+
+def price_positions(items: List[Dict[str, Any]]) -> List[float]:
+    """Each item's price scaled to [-1, 1] within the list (unknown -> 0)"""
+    prices = [parse_price(item.get("price")) for item in items]
+    known = [p for p in prices if p is not None]
+    if not known or max(known) == min(known):
+        return [0.0] * len(items)
+    low, high = min(known), max(known)
+    return [0.0 if p is None else 2.0 * (p - low) / (high - low) - 1.0 for p in prices]
+
+
+def profile_weights(user_profile: Dict[str, Any]) -> ProfileWeights:
+    """Scoring weights for a profile dict as built by get_user_profile_data"""
+    words: Dict[str, float] = {}
+
+    def add(profile_words: Iterable[str], weight: float) -> None:
+        for word in profile_words:
+            words[word] = words.get(word, 0.0) + weight
+
+    keyword_groups = []
+    for restriction in user_profile.get("dietary_restrictions", []):
+        if isinstance(restriction, dict):
+            name = restriction.get("name", "")
+            penalty = SEVERITY_PENALTY.get(
+                restriction.get("severity"), DEFAULT_SEVERITY_PENALTY
+            )
+        else:
+            name, penalty = restriction, DEFAULT_SEVERITY_PENALTY
+        name = str(name).lower()
+        for key, conflicts in RESTRICTION_CONFLICTS.items():
+            if key in name:
+                keyword_groups.append((frozenset(conflicts), -penalty))
+
+    for cuisine in user_profile.get("cuisine_preferences", []):
+        if isinstance(cuisine, dict):
+            level = cuisine.get("preference_level", 3)
+            add(
+                text_words(cuisine.get("cuisine_type")),
+                (level - 3) * PREFERENCE_LEVEL_WEIGHT,
+            )
+        else:
+            add(text_words(cuisine), CUISINE_WEIGHT)
+
+    flavor_profile = user_profile.get("flavor_profile") or {}
+    if isinstance(flavor_profile, dict):
+        for field, keywords in FLAVOR_KEYWORDS.items():
+            level = flavor_profile.get(field)
+            if isinstance(level, (int, float)):
+                keyword_groups.append(
+                    (frozenset(keywords), (level - 3) * PREFERENCE_LEVEL_WEIGHT)
+                )
+
+    liked_words: Set[str] = set()
+    for name in entry_names(user_profile.get("liked_foods")):
+        liked_words |= text_words(name)
+        add(text_words(name), LIKED_WORD_WEIGHT)
+    for name in entry_names(user_profile.get("disliked_foods")):
+        add(text_words(name), DISLIKED_WORD_WEIGHT)
+
+    price = PRICE_WEIGHTS.get(
+        str(user_profile.get("price_range_preference") or "").lower(), 0.0
+    )
+    return ProfileWeights(words, keyword_groups, liked_words, price)
+
+
+def prerank_menu_items(
+    menu_items: List[Dict[str, Any]],
+    user_profile: Dict[str, Any],
+    current_dislikes: List[str],
+    community_favorites: List[Dict[str, Any]],
+    reviews: List[str],
+    top_k: int,
+    learned_scores: Optional[Dict[str, float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Keep the top-K menu items most likely to suit the user.
+
+    Args:
+        menu_items: Full restaurant menu
+        user_profile: Profile dict as built by get_user_profile_data
+        current_dislikes: Item names rejected this session (dropped entirely)
+        community_favorites: Beli top items
+        reviews: Review texts, scanned for item mentions
+        top_k: Number of candidates to keep (<= 0 keeps the whole menu)
+        learned_scores: Extra score per lowercased item name, from the user's
+            swipe-learned preference model
+
+    Returns:
+        Candidate items, best first
+    """
+    if top_k <= 0 or not menu_items:
+        return menu_items
+
+    rejected = {name.strip().lower() for name in current_dislikes}
+    weights = profile_weights(user_profile)
+    favorite_names = entry_names(community_favorites)
+    review_texts = [r.lower() for r in reviews if isinstance(r, str)]
+    prices = price_positions(menu_items)
+
+    scored = []
+    seen = set()
+    for index, item in enumerate(menu_items):
+        name = str(item.get("name", "")).strip().lower()
+        # DoorDash menus repeat "Most Ordered" items in their own category
+        if not name or name in rejected or name in seen:
+            continue
+        seen.add(name)
+
+        words = item_words(item)
+        score = sum(weights.words.get(word, 0.0) for word in words)
+        score += sum(w for keywords, w in weights.keyword_groups if words & keywords)
+        score += COMMUNITY_WEIGHT * community_score(name, favorite_names)
+        score += MENTION_WEIGHT * review_mentions(name, review_texts)
+        score += popularity_score(item)
+        if is_drink(words) and not words & weights.liked_words:
+            score += DRINK_WEIGHT
+        score += weights.price * prices[index]
+        if learned_scores:
+            score += learned_scores.get(name, 0.0)
+
+        scored.append((score, index, item))
+
+    scored.sort(key=lambda entry: (-entry[0], entry[1]))
+    return [item for _, _, item in scored[:top_k]]
@@ -0,0 +1,135 @@
+"""
+In-memory TTL + LRU cache for Claude recommendation results
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from config import settings
+
+CacheKey = Tuple[str, str, str, int, FrozenSet[str], int]
+
+
+def profile_fingerprint(user_profile: Dict[str, Any]) -> str:
+    """Stable hash of a user profile dict (as built by get_user_profile_data)"""
+    payload = json.dumps(user_profile, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def normalize_dislikes(dislikes: Iterable[str]) -> FrozenSet[str]:
+    """Order-independent, case-insensitive set of rejected item names"""
+    return frozenset(d.strip().lower() for d in dislikes if d and d.strip())
+
+
+def make_cache_key(
+    user_id: str,
+    profile_hash: str,
+    restaurant_id: str,
+    catalog_version: int,
+    dislikes: Iterable[str],
+    num_items: int = 1,
+) -> CacheKey:
+    """
+    Build the cache key for a recommendation request
+
+    Rankings depend on the user's swipe-learned preference model as well as
+    the profile, so users with the same profile don't share entries.
+    """
+    return (
+        user_id,
+        profile_hash,
+        restaurant_id,
+        catalog_version,
+        normalize_dislikes(dislikes),
+        num_items,
+    )
+
+
+class RecommendationCache:
+    """LRU cache with per-entry TTL for raw Claude recommendation responses"""
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 900):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at, user_id, response)
+        self._entries: "OrderedDict[CacheKey, Tuple[float, str, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: CacheKey, record: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached response for a key, or None on miss/expiry.
+
+        Pass record=False for internal probes that shouldn't count as lookups.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            if record:
+                self.misses += 1
+            return None
+
+        expires_at, _, response = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            if record:
+                self.misses += 1
+            return None
+
+        if record:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return response
+
+    def put(self, key: CacheKey, response: Dict[str, Any], user_id: str) -> None:
+        """Store a response, evicting the least recently used entries if full"""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, user_id, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate_user(self, user_id: str) -> int:
+        """Drop every entry stored for a user (e.g. after a profile update)"""
+        stale = [k for k, (_, uid, _) in self._entries.items() if uid == user_id]
+        return self._drop(stale)
+
+    def invalidate_restaurant(self, restaurant_id: str) -> int:
+        """Drop every entry for a restaurant (e.g. after its menu is replaced)"""
+        stale = [k for k in self._entries if k[2] == restaurant_id]
+        return self._drop(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _drop(self, keys) -> int:
+        for key in keys:
+            del self._entries[key]
+        self.invalidations += len(keys)
+        return len(keys)
+
+
+# Global cache instance shared by the recommendation endpoints
+recommendation_cache = RecommendationCache(
+    max_entries=settings.RECS_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RECS_CACHE_TTL_SECONDS,
+)
@@ -1,27 +1,86 @@
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import StreamingResponse
 from .types.recs_types import (
     RecommendationRequest,
     RecommendationResponse,
     FoodItemRecommendation,
     RecommendationContext,
+    NearbyRecommendation,
+    NearbyRecommendationRequest,
+    NearbyRecommendationResponse,
 )
 from auth.auth_api import get_current_user
 from auth.types.auth_types import UserResponse
 from config import settings
 from user_profile.profile_api import MOCK_PROFILES_DB
-from food_info.info_api import get_restaurant_by_id
+from food_info.info_api import (
+    get_restaurant_by_id,
+    get_catalog_version,
+    get_dietary_index,
+    get_menu_index,
+    get_restaurant_summaries,
+)
+from food_info.item_vectors import item_vectors
+from food_info.menu_index import DEFAULT_PRICE, MenuEntry, MenuIndex, normalize_name
 from util.chat.gpt_client import ClaudeClient
+from util.singleflight import SingleFlight
+from .rec_cache import (
+    CacheKey,
+    recommendation_cache,
+    profile_fingerprint,
+    make_cache_key,
+)
+from .prefetch import swipe_prefetcher
+from .sessions import SwipeSession, swipe_sessions
+from .ranking import prerank_menu_items
+from .local_engine import local_recommender
+from .preference_model import preference_models
+from .audit import recommendation_audit
+from .nearby import fan_out, rank_restaurants
 import uuid
-from typing import List, Optional, Dict, Any
+import json
+import asyncio
+import functools
+import numpy as np
+from typing import AsyncIterator, List, Optional, Dict, Any
 
 router = APIRouter(prefix="/recs", tags=["recommendations"])
 
 # Initialize Claude client
 claude_client = ClaudeClient(settings.ANTHROPIC_API_KEY)
 
+# Concurrent identical requests (double taps, retries) share one generation
+recommendation_flights = SingleFlight()
+
+# Counters for /recs/metrics
+RECOMMENDATION_STATS: Dict[str, int] = {
+    "hallucinated_items_dropped": 0,
+    "latency_budget_exceeded": 0,
+    "background_completions": 0,
+    "nearby_restaurant_timeouts": 0,
+    "dietary_filtered_requests": 0,
+    "dietary_filter_exhausted": 0,
+    "unsafe_items_dropped": 0,
+}
+
+
+def get_user_profile_data(
+    user_id: str, session_likes: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Get user profile data from database and convert to dict format.
+
+    Items liked in the current swipe session are appended to liked_foods.
+    """
+    profile = _stored_profile_data(user_id)
+    if session_likes:
+        profile["liked_foods"] = profile["liked_foods"] + [
+            {"name": name, "tags": ["liked this session"]} for name in session_likes
+        ]
+    return profile
+
 
-def get_user_profile_data(user_id: str) -> Dict[str, Any]:
-    """Get user profile data from database and convert to dict format"""
+def _stored_profile_data(user_id: str) -> Dict[str, Any]:
     user_profile_data = MOCK_PROFILES_DB.get(user_id)
 
     if not user_profile_data:
@@ -31,6 +90,7 @@ def get_user_profile_data(user_id: str) -> Dict[str, Any]:
             "flavor_profile": {},
             "liked_foods": [],
             "disliked_foods": [],
+            "price_range_preference": None,
         }
 
     # Convert Pydantic models to dicts safely
@@ -57,6 +117,7 @@ def get_user_profile_data(user_id: str) -> Dict[str, Any]:
             df.dict() if hasattr(df, "dict") else df
             for df in user_profile_data.disliked_foods
         ],
+        "price_range_preference": user_profile_data.price_range_preference,
     }
 
 
@@ -65,13 +126,48 @@ def get_restaurant_data(restaurant_id: str) -> Optional[Dict[str, Any]]:
     return get_restaurant_by_id(restaurant_id)
 
 
+def dietary_allowed(
+    restaurant_id: str, user_profile: Dict[str, Any], record: bool = True
+) -> Optional[np.ndarray]:
+    """
+    Menu items (by item_id) that are safe for the user's dietary restrictions
+
+    None when the restrictions rule nothing out, or rule out the whole menu
+    (they then only lower item scores, as before). Pass record=False for
+    repeat lookups within a request that shouldn't count in the stats.
+    """
+    dietary_index = get_dietary_index(restaurant_id)
+    mask = dietary_index.safe_mask(user_profile.get("dietary_restrictions", []))
+    if mask == dietary_index.all_items:
+        return None
+    if not mask:
+        if record:
+            RECOMMENDATION_STATS["dietary_filter_exhausted"] += 1
+        return None
+    if record:
+        RECOMMENDATION_STATS["dietary_filtered_requests"] += 1
+    return dietary_index.allowed(mask)
+
+
+def is_allowed(item: Dict[str, Any], allowed: Optional[np.ndarray]) -> bool:
+    """Whether a dietary_allowed mask lets a menu item through"""
+    item_id = item.get("item_id")
+    if allowed is None or not isinstance(item_id, int) or item_id >= len(allowed):
+        return True
+    return bool(allowed[item_id])
+
+
 def gather_recommendation_context(
-    user_id: str, restaurant_id: str, curr_dislikes: List[str]
+    user_id: str,
+    restaurant_id: str,
+    curr_dislikes: List[str],
+    curr_likes: Optional[List[str]] = None,
 ) -> RecommendationContext:
     """Gather all context needed for AI recommendation"""
+    curr_likes = curr_likes or []
 
     # Get user profile
-    user_profile = get_user_profile_data(user_id)
+    user_profile = get_user_profile_data(user_id, curr_likes)
 
     # Get restaurant data from cache
     restaurant_data = get_restaurant_data(restaurant_id)
@@ -84,21 +180,557 @@ def gather_recommendation_context(
             restaurant_reviews=[],
             top_community_items=[],
             current_dislikes=curr_dislikes,
-            session_history=[],
+            session_history=curr_likes,
         )
 
     # Extract data from the cached restaurant data
-    restaurant_items = restaurant_data.get("menu_items", [])
     restaurant_reviews = restaurant_data.get("reviews", [])
     top_community_items = restaurant_data.get("top_items", [])
 
+    # Only the best local candidates go to Claude, so prompt size stays flat.
+    # Liked items were already served, so they aren't candidates either.
+    seen = curr_dislikes + curr_likes
+    top_k = settings.RECS_PRERANK_TOP_K
+    demote_similar = settings.RECS_DISLIKE_SIMILARITY_THRESHOLD > 0 and curr_dislikes
+    # Rank a wider pool so demoted items can be replaced by the next best ones
+    pool_size = top_k * 2 if demote_similar and top_k > 0 else top_k
+    # What the user's swipes taught us so far (None before their first swipe)
+    preference = preference_models.get(user_id)
+    # Items conflicting with a dietary restriction never reach the prompt
+    allowed = dietary_allowed(restaurant_id, user_profile)
+    features = local_recommender.get_features(
+        restaurant_id, restaurant_data, get_catalog_version(restaurant_id)
+    )
+    if settings.RECS_ENGINE_MODE == "hybrid" and top_k > 0:
+        restaurant_items = local_recommender.rank(
+            features, user_profile, seen, pool_size, preference, allowed
+        )
+    else:
+        learned = local_recommender.learned_scores(features, preference)
+        menu_items = restaurant_data.get("menu_items", [])
+        if allowed is not None:
+            menu_items = [item for item in menu_items if is_allowed(item, allowed)]
+        restaurant_items = prerank_menu_items(
+            menu_items,
+            user_profile,
+            seen,
+            top_community_items,
+            restaurant_reviews,
+            pool_size,
+            dict(zip(features.names, learned.tolist())) if learned.any() else None,
+        )
+
+    # A rejected "Pad Thai" makes "Pad See Ew" a worse bet too
+    if demote_similar:
+        restaurant_items = item_vectors.demote_similar(
+            restaurant_id,
+            restaurant_items,
+            curr_dislikes,
+            settings.RECS_DISLIKE_SIMILARITY_THRESHOLD,
+        )
+        if top_k > 0:
+            restaurant_items = restaurant_items[:top_k]
+
     return RecommendationContext(
         user_profile=user_profile,
         restaurant_items=restaurant_items,
         restaurant_reviews=restaurant_reviews,
         top_community_items=top_community_items,
         current_dislikes=curr_dislikes,
-        session_history=[],
+        session_history=curr_likes,
+    )
+
+
+def build_claude_request(
+    user_id: str,
+    restaurant_id: str,
+    restaurant_data: Dict[str, Any],
+    curr_dislikes: List[str],
+    num_items: int = 1,
+    curr_likes: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Gather context and build the arguments for a ClaudeClient call"""
+    context = gather_recommendation_context(
+        user_id, restaurant_id, curr_dislikes, curr_likes
+    )
+
+    # Get restaurant name from cached data
+    restaurant_name = restaurant_data.get("name", f"Restaurant {restaurant_id}")
+
+    return {
+        "user_profile": context.user_profile,
+        "restaurant_items": context.restaurant_items,
+        "reviews": context.restaurant_reviews,
+        "community_favorites": context.top_community_items,
+        "current_dislikes": context.current_dislikes,
+        "restaurant_name": restaurant_name,
+        "menu_items": restaurant_data.get("menu_items", []),
+        "num_items": num_items,
+        # The menu, reviews and favorites only change with the catalog version
+        "catalog_key": (restaurant_id, get_catalog_version(restaurant_id)),
+    }
+
+
+def generate_local_response(
+    user_id: str,
+    restaurant_id: str,
+    restaurant_data: Dict[str, Any],
+    curr_dislikes: List[str],
+    num_items: int = 1,
+    source: str = "local",
+    curr_likes: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Recommend with the local engine, in the same shape as a Claude response"""
+    curr_likes = curr_likes or []
+    user_profile = get_user_profile_data(user_id, curr_likes)
+    features = local_recommender.get_features(
+        restaurant_id, restaurant_data, get_catalog_version(restaurant_id)
+    )
+    response = local_recommender.recommend(
+        features,
+        user_profile,
+        curr_dislikes + curr_likes,
+        num_items,
+        preference_models.get(user_id),
+        dietary_allowed(restaurant_id, user_profile),
+    )
+    response["source"] = source
+    # Stand-ins for an LLM answer are never cached
+    if source != "local":
+        response["fallback"] = True
+    return response
+
+
+async def generate_claude_response(
+    user_id: str,
+    restaurant_id: str,
+    restaurant_data: Dict[str, Any],
+    curr_dislikes: List[str],
+    num_items: int = 1,
+    curr_likes: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Gather context and ask Claude (or the local engine) for the next recommendation"""
+    if settings.RECS_ENGINE_MODE == "local":
+        return generate_local_response(
+            user_id,
+            restaurant_id,
+            restaurant_data,
+            curr_dislikes,
+            num_items,
+            curr_likes=curr_likes,
+        )
+
+    response = await claude_client.generate_food_recommendation(
+        **build_claude_request(
+            user_id,
+            restaurant_id,
+            restaurant_data,
+            curr_dislikes,
+            num_items,
+            curr_likes=curr_likes,
+        )
+    )
+    if response.get("fallback"):
+        # No API key or Claude failed: the local engine beats the canned mock
+        return generate_local_response(
+            user_id,
+            restaurant_id,
+            restaurant_data,
+            curr_dislikes,
+            num_items,
+            source="local_fallback",
+            curr_likes=curr_likes,
+        )
+    return {**response, "source": "llm"}
+
+
+async def generate_within_budget(
+    user_id: str,
+    restaurant_id: str,
+    restaurant_data: Dict[str, Any],
+    curr_dislikes: List[str],
+    num_items: int,
+    cache_key: CacheKey,
+    curr_likes: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Prefetched or freshly generated recommendation, bounded by RECS_LATENCY_BUDGET_MS.
+
+    If the deadline passes, the local engine answers instead (source
+    "local_deadline"). With RECS_BACKGROUND_COMPLETION the LLM call keeps
+    running and its answer is cached for the next identical request.
+    """
+
+    async def fetch() -> Dict[str, Any]:
+        # The previous card may have speculatively computed this request
+        response = await swipe_prefetcher.take(user_id, cache_key)
+        if response is None:
+            response = await generate_claude_response(
+                user_id,
+                restaurant_id,
+                restaurant_data,
+                curr_dislikes,
+                num_items,
+                curr_likes=curr_likes,
+            )
+        return response
+
+    budget_ms = settings.RECS_LATENCY_BUDGET_MS
+    if budget_ms <= 0 or settings.RECS_ENGINE_MODE == "local":
+        return await fetch()
+
+    task = asyncio.create_task(fetch())
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), budget_ms / 1000)
+    except asyncio.TimeoutError:
+        RECOMMENDATION_STATS["latency_budget_exceeded"] += 1
+
+    if settings.RECS_BACKGROUND_COMPLETION:
+
+        def warm_cache(finished: "asyncio.Task") -> None:
+            if finished.cancelled() or finished.exception() is not None:
+                return
+            response = finished.result()
+            if not response.get("fallback"):
+                recommendation_cache.put(cache_key, response, user_id)
+                RECOMMENDATION_STATS["background_completions"] += 1
+
+        task.add_done_callback(warm_cache)
+    else:
+        task.cancel()
+
+    return generate_local_response(
+        user_id,
+        restaurant_id,
+        restaurant_data,
+        curr_dislikes,
+        num_items,
+        source="local_deadline",
+        curr_likes=curr_likes,
+    )
+
+
+async def get_or_generate_response(
+    user_id: str,
+    restaurant_id: str,
+    restaurant_data: Dict[str, Any],
+    curr_dislikes: List[str],
+    num_items: int,
+    cache_key: CacheKey,
+    curr_likes: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Cached response for cache_key, else generate it (once for concurrent duplicates)"""
+    claude_response = recommendation_cache.get(cache_key)
+    if claude_response is not None:
+        return claude_response
+
+    async def resolve() -> Dict[str, Any]:
+        response = await generate_within_budget(
+            user_id,
+            restaurant_id,
+            restaurant_data,
+            curr_dislikes,
+            num_items,
+            cache_key,
+            curr_likes=curr_likes,
+        )
+        # Don't pin mock/fallback answers for the whole TTL
+        if not response.get("fallback"):
+            recommendation_cache.put(cache_key, response, user_id)
+        return response
+
+    # The key covers user, profile, restaurant, catalog and dislike set, so
+    # concurrent duplicates await the same call
+    return await recommendation_flights.do(cache_key, resolve)
+
+
+def schedule_next_card_prefetch(
+    user_id: str,
+    restaurant_id: str,
+    restaurant_data: Dict[str, Any],
+    profile_hash: str,
+    catalog_version: int,
+    curr_dislikes: List[str],
+    served_items: List[str],
+    num_items: int = 1,
+    curr_likes: Optional[List[str]] = None,
+) -> None:
+    """Speculate that the user swipes left on every card just served"""
+    next_dislikes = curr_dislikes + served_items
+    next_key = make_cache_key(
+        user_id, profile_hash, restaurant_id, catalog_version, next_dislikes, num_items
+    )
+    if recommendation_cache.get(next_key, record=False) is not None:
+        return
+
+    swipe_prefetcher.schedule(
+        user_id,
+        restaurant_id,
+        next_key,
+        lambda: generate_claude_response(
+            user_id,
+            restaurant_id,
+            restaurant_data,
+            next_dislikes,
+            num_items,
+            curr_likes=curr_likes,
+        ),
+    )
+
+
+async def resolve_swipe_session(
+    user_id: str, restaurant_id: str, request: RecommendationRequest
+) -> SwipeSession:
+    """
+    Load (or start) the request's swipe session and record the latest swipe
+
+    Each newly recorded swipe also updates the user's preference model.
+    Requests without a session_id continue the user's latest session at the
+    restaurant while their rejected list still contains its dislikes.
+    """
+    if request.session_id:
+        session = swipe_sessions.resolve(request.session_id, user_id, restaurant_id)
+    else:
+        # Clients without session support resend the whole rejected list on
+        # every swipe; a list that drops earlier dislikes is a fresh visit
+        session = swipe_sessions.latest(user_id, restaurant_id)
+        resent = {normalize_name(name) for name in request.curr_dislikes}
+        if session is None or not all(
+            normalize_name(name) in resent for name in session.dislikes
+        ):
+            session = swipe_sessions.create(user_id, restaurant_id)
+
+    # Read the user's preference model (off the event loop) before learning
+    await preference_models.load(user_id)
+    swipes = [(name, False) for name in request.curr_dislikes]
+    if request.last_swipe is not None:
+        name = request.last_swipe.item_name or session.last_served
+        if name:
+            swipes.append((name, request.last_swipe.liked))
+
+    # Only learn from swipes the session hasn't seen (resent names are repeats)
+    menu_index = get_menu_index(restaurant_id)
+    for name, liked in swipes:
+        if session.record(name, liked):
+            entry = menu_index.find(name)
+            if entry is not None:
+                preference_models.record_swipe(user_id, entry.item, liked)
+
+    return session
+
+
+def resolve_menu_entry(
+    recommendation: Dict[str, Any], menu_index: MenuIndex
+) -> Optional[MenuEntry]:
+    """
+    Menu entry for a recommendation, by item_id when one was given, else by name
+
+    Names that are slightly off (e.g. a dropped size prefix) resolve to the
+    closest menu item.
+    """
+    item_id = recommendation.get("item_id")
+    if item_id is not None:
+        return menu_index.get(item_id)
+    return menu_index.find_closest(recommendation.get("recommended_item", ""))
+
+
+def select_menu_recommendations(
+    claude_response: Dict[str, Any],
+    menu_index: MenuIndex,
+    curr_dislikes: List[str],
+    allowed: Optional[np.ndarray] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Ranked recommendations from a Claude response that are really on the menu.
+
+    Hallucinated names, duplicates, already-rejected items and items the
+    user's dietary restrictions rule out (allowed, see dietary_allowed) are
+    dropped. If nothing survives, the original top pick is kept so the client
+    still gets a card, unless it was ruled out: then the result is empty.
+    """
+    seen = {normalize_name(name) for name in curr_dislikes}
+    selected = []
+    top_pick_unsafe = False
+    for position, entry in enumerate(
+        [claude_response] + claude_response.get("alternatives", [])
+    ):
+        menu_entry = resolve_menu_entry(entry, menu_index)
+        if menu_entry is None:
+            RECOMMENDATION_STATS["hallucinated_items_dropped"] += 1
+            continue
+        if not is_allowed(menu_entry.item, allowed):
+            RECOMMENDATION_STATS["unsafe_items_dropped"] += 1
+            top_pick_unsafe = top_pick_unsafe or position == 0
+            continue
+        key = normalize_name(menu_entry.item.get("name"))
+        if key in seen:
+            continue
+        seen.add(key)
+        selected.append(entry)
+
+    if selected or top_pick_unsafe:
+        return selected
+    return [claude_response]
+
+
+def audit_served_recommendations(
+    user_id: str,
+    restaurant_id: str,
+    picks: List[Dict[str, Any]],
+    menu_index: MenuIndex,
+    session_id: Optional[str],
+    source: str,
+) -> None:
+    """Queue audit rows for the served picks, named as they appear on the menu"""
+    for pick in picks:
+        menu_entry = resolve_menu_entry(pick, menu_index)
+        if menu_entry is not None:
+            pick = {
+                **pick,
+                "recommended_item": menu_entry.item.get("name"),
+                "item_id": menu_entry.item.get("item_id"),
+            }
+        recommendation_audit.record(user_id, restaurant_id, pick, session_id, source)
+
+
+def build_food_item_recommendation(
+    claude_response: Dict[str, Any], menu_index: MenuIndex
+) -> FoodItemRecommendation:
+    """Convert a Claude response into a FoodItemRecommendation resolved against the menu"""
+    menu_entry = resolve_menu_entry(claude_response, menu_index)
+    found_item = menu_entry.item if menu_entry else {}
+    name = found_item.get("name") or claude_response.get(
+        "recommended_item", "Chef's Special"
+    )
+
+    return FoodItemRecommendation(
+        id=f"claude_rec_{uuid.uuid4()}",
+        name=name,
+        description="AI-recommended item based on your preferences",
+        price=menu_entry.display_price if menu_entry else DEFAULT_PRICE,
+        image_url=found_item.get("image_url", "https://example.com/default_image.jpg"),
+        category=found_item.get("category", "AI Recommendation"),
+        ingredients=[],
+        allergens=[],
+        calories=300,
+        reviews=[],
+        reasoning=claude_response.get(
+            "reasoning", "Recommended by our AI based on your taste profile"
+        ),
+    )
+
+
+@router.post(
+    "/nearby",
+    response_model=NearbyRecommendationResponse,
+    summary="Get Recommendations Nearby",
+    description="Recommend dishes across the best-fitting restaurants near a location, without picking a restaurant first",
+    response_description="Dishes from nearby restaurants merged into one ranked list",
+)
+async def get_nearby_recommendations(
+    request: NearbyRecommendationRequest,
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Recommend dishes from several nearby restaurants in one call.
+
+    Restaurants are ranked locally by distance and profile fit; the top ones
+    are asked for recommendations in parallel (at most RECS_NEARBY_CONCURRENCY
+    at a time) within RECS_NEARBY_DEADLINE_MS. Restaurants that miss the
+    deadline are listed in `timed_out_restaurants` and the rest are returned.
+    """
+    user_profile = get_user_profile_data(current_user.id)
+    await preference_models.load(current_user.id)
+    max_restaurants = min(
+        request.max_restaurants or settings.RECS_NEARBY_MAX_RESTAURANTS,
+        settings.RECS_NEARBY_MAX_RESTAURANTS,
+    )
+    restaurants = rank_restaurants(
+        get_restaurant_summaries(),
+        request.latitude,
+        request.longitude,
+        user_profile,
+        request.max_distance_km or settings.RECS_NEARBY_RADIUS_KM,
+        max_restaurants,
+    )
+
+    profile_hash = profile_fingerprint(user_profile)
+    calls = {}
+    for restaurant in restaurants:
+        restaurant_id = restaurant.summary["id"]
+        restaurant_data = get_restaurant_data(restaurant_id)
+        if not restaurant_data:
+            continue
+        cache_key = make_cache_key(
+            current_user.id,
+            profile_hash,
+            restaurant_id,
+            get_catalog_version(restaurant_id),
+            [],
+            request.items_per_restaurant,
+        )
+        calls[restaurant_id] = functools.partial(
+            get_or_generate_response,
+            current_user.id,
+            restaurant_id,
+            restaurant_data,
+            [],
+            request.items_per_restaurant,
+            cache_key,
+        )
+
+    # Calls cut off by the deadline keep running behind the single-flight
+    # shield and still warm the cache for the next request
+    responses, timed_out = await fan_out(
+        calls,
+        settings.RECS_NEARBY_CONCURRENCY,
+        settings.RECS_NEARBY_DEADLINE_MS / 1000,
+    )
+    RECOMMENDATION_STATS["nearby_restaurant_timeouts"] += len(timed_out)
+
+    recommendations = []
+    for restaurant in restaurants:
+        restaurant_id = restaurant.summary["id"]
+        claude_response = responses.get(restaurant_id)
+        if claude_response is None:
+            continue
+        menu_index = get_menu_index(restaurant_id)
+        picks = select_menu_recommendations(
+            claude_response,
+            menu_index,
+            [],
+            dietary_allowed(restaurant_id, user_profile, record=False),
+        )
+        if not picks:
+            continue
+        audit_served_recommendations(
+            current_user.id,
+            restaurant_id,
+            picks,
+            menu_index,
+            None,
+            claude_response.get("source", "llm"),
+        )
+        for pick in picks:
+            confidence = pick.get("confidence", 0.85)
+            recommendations.append(
+                NearbyRecommendation(
+                    restaurant_id=restaurant_id,
+                    restaurant_name=restaurant.summary.get("name") or restaurant_id,
+                    distance_km=round(restaurant.distance_km, 2),
+                    item=build_food_item_recommendation(pick, menu_index),
+                    confidence_score=confidence,
+                    score=round(0.7 * confidence + 0.3 * restaurant.fit, 4),
+                    source=claude_response.get("source", "llm"),
+                )
+            )
+    recommendations.sort(key=lambda rec: rec.score, reverse=True)
+
+    return NearbyRecommendationResponse(
+        recommendations=recommendations,
+        restaurants_considered=len(calls),
+        timed_out_restaurants=timed_out,
+        partial=bool(timed_out),
     )
 
 
@@ -128,69 +760,90 @@ async def get_recommendation(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant not found"
             )
 
-        # Gather all context for the recommendation
-        context = gather_recommendation_context(
-            current_user.id, restaurant_id, request.curr_dislikes
-        )
+        swipe_prefetcher.visit(current_user.id, restaurant_id)
+        session = await resolve_swipe_session(current_user.id, restaurant_id, request)
+        curr_dislikes = list(session.dislikes)
+        curr_likes = list(session.likes)
 
-        # Get restaurant name from cached data
-        restaurant_name = restaurant_data.get("name", f"Restaurant {restaurant_id}")
+        # Same user and profile (incl. session likes) + restaurant + catalog +
+        # dislike set -> same answer
+        num_items = request.num_recommendations
+        user_profile = get_user_profile_data(current_user.id, curr_likes)
+        profile_hash = profile_fingerprint(user_profile)
+        catalog_version = get_catalog_version(restaurant_id)
+        cache_key = make_cache_key(
+            current_user.id,
+            profile_hash,
+            restaurant_id,
+            catalog_version,
+            curr_dislikes,
+            num_items,
+        )
+        claude_response = await get_or_generate_response(
+            current_user.id,
+            restaurant_id,
+            restaurant_data,
+            curr_dislikes,
+            num_items,
+            cache_key,
+            curr_likes=curr_likes,
+        )
 
-        # Generate recommendation using Claude
-        claude_response = await claude_client.generate_food_recommendation(
-            user_profile=context.user_profile,
-            restaurant_items=context.restaurant_items,
-            reviews=context.restaurant_reviews,
-            community_favorites=context.top_community_items,
-            current_dislikes=context.current_dislikes,
-            restaurant_name=restaurant_name,
+        # Ranked picks that are really on the menu (top pick first)
+        menu_index = get_menu_index(restaurant_id)
+        allowed = dietary_allowed(restaurant_id, user_profile, record=False)
+        picks = select_menu_recommendations(
+            claude_response, menu_index, curr_dislikes + curr_likes, allowed
         )
+        if not picks:
+            # Everything Claude named conflicts with a dietary restriction
+            claude_response = generate_local_response(
+                current_user.id,
+                restaurant_id,
+                restaurant_data,
+                curr_dislikes,
+                num_items,
+                source="local_fallback",
+                curr_likes=curr_likes,
+            )
+            picks = select_menu_recommendations(
+                claude_response, menu_index, curr_dislikes + curr_likes, allowed
+            )
+        session.last_served = picks[0].get("recommended_item")
 
-        # Extract recommended item name from Claude respons
-        found_item = {}
-        item_name = (
-            claude_response.get("recommended_item", "Chef's Special").strip().lower()
+        schedule_next_card_prefetch(
+            current_user.id,
+            restaurant_id,
+            restaurant_data,
+            profile_hash,
+            catalog_version,
+            curr_dislikes,
+            [pick.get("recommended_item", "Chef's Special") for pick in picks],
+            num_items,
+            curr_likes=curr_likes,
         )
-        for item in restaurant_data.get("menu_items", []):
-            if item["name"].strip().lower() == item_name:
-                found_item = item
 
-        try:
-            price = found_item["price"]
-            price = (
-                price.replace("$", "")
-                .replace("$$", "")
-                .replace("or", "")
-                .replace(" ", "")
-            )
-            price = float(price)
-        except:
-            price = 15.99
+        audit_served_recommendations(
+            current_user.id,
+            restaurant_id,
+            picks,
+            menu_index,
+            session.session_id,
+            claude_response.get("source", "llm"),
+        )
 
         # Convert Claude response to FoodItemRecommendation
-        recommendation = FoodItemRecommendation(
-            id=f"claude_rec_{uuid.uuid4()}",
-            name=claude_response.get("recommended_item", "Chef's Special"),
-            description="AI-recommended item based on your preferences",
-            price=price,
-            image_url=found_item.get(
-                "image_url", "https://example.com/default_image.jpg"
-            ),
-            category=found_item.get("category", "AI Recommendation"),
-            ingredients=[],
-            allergens=[],
-            calories=300,
-            reviews=[],
-            reasoning=claude_response.get(
-                "reasoning", "Recommended by our AI based on your taste profile"
-            ),
-        )
+        recommendation = build_food_item_recommendation(picks[0], menu_index)
 
         return RecommendationResponse(
             item=recommendation,
-            confidence_score=claude_response.get("confidence", 0.85),
-            session_id=str(uuid.uuid4()),
-            alternatives=[],
+            confidence_score=picks[0].get("confidence", 0.85),
+            session_id=session.session_id,
+            alternatives=[
+                build_food_item_recommendation(pick, menu_index)
+                for pick in picks[1:]
+            ],
+            source=claude_response.get("source", "llm"),
         )
 
     except HTTPException:
@@ -202,6 +855,263 @@ async def get_recommendation(
         )
 
 
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post(
+    "/{restaurant_id}/stream",
+    summary="Stream AI Food Recommendation",
+    description="Server-sent-events variant of the recommendation endpoint that emits the recommended item as soon as Claude names it",
+    response_description="text/event-stream with `item`, `reasoning` and `done` events",
+)
+async def stream_recommendation(
+    restaurant_id: str,
+    request: RecommendationRequest,
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Stream a personalized food recommendation.
+
+    Events, in order:
+    - `item`: the recommended menu item (resolved against the menu), sent as
+      soon as Claude names one of the candidates
+    - `reasoning`: chunks of the reasoning text (`{"text": ...}`)
+    - `done`: the full recommendation with confidence score, price and session id.
+      Always the item announced by `item`, even if Claude fails afterwards.
+
+    Always streams a single item; `num_recommendations` is ignored here.
+    """
+    restaurant_data = get_restaurant_data(restaurant_id)
+    if not restaurant_data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant not found"
+        )
+
+    swipe_prefetcher.visit(current_user.id, restaurant_id)
+    session = await resolve_swipe_session(current_user.id, restaurant_id, request)
+    curr_dislikes = list(session.dislikes)
+    curr_likes = list(session.likes)
+
+    user_profile = get_user_profile_data(current_user.id, curr_likes)
+    profile_hash = profile_fingerprint(user_profile)
+    catalog_version = get_catalog_version(restaurant_id)
+    cache_key = make_cache_key(
+        current_user.id, profile_hash, restaurant_id, catalog_version, curr_dislikes
+    )
+    claude_response = recommendation_cache.get(cache_key)
+    if claude_response is None:
+        # A non-streaming request for the same card may already be running
+        claude_response = await recommendation_flights.join(cache_key)
+    if claude_response is None:
+        claude_response = await swipe_prefetcher.take(current_user.id, cache_key)
+    if claude_response is None and settings.RECS_ENGINE_MODE == "local":
+        claude_response = generate_local_response(
+            current_user.id,
+            restaurant_id,
+            restaurant_data,
+            curr_dislikes,
+            curr_likes=curr_likes,
+        )
+        recommendation_cache.put(cache_key, claude_response, current_user.id)
+    menu_index = get_menu_index(restaurant_id)
+    seen = curr_dislikes + curr_likes
+    allowed = dietary_allowed(restaurant_id, user_profile, record=False)
+
+    async def events() -> AsyncIterator[str]:
+        response = claude_response
+        # The pick announced in the `item` event, which `done` must agree with
+        streamed_pick: Optional[Dict[str, Any]] = None
+        reasoning_chunks: List[str] = []
+
+        if response is None:
+            try:
+                claude_request = build_claude_request(
+                    current_user.id,
+                    restaurant_id,
+                    restaurant_data,
+                    curr_dislikes,
+                    curr_likes=curr_likes,
+                )
+                # The stream parser handles a single JSON object
+                claude_request.pop("num_items")
+                # Only a candidate is certain to survive select_menu_recommendations,
+                # so nothing else is announced before the answer is complete
+                candidates = {
+                    normalize_name(item.get("name"))
+                    for item in claude_request["restaurant_items"]
+                }
+                async for kind, name, value in claude_client.stream_food_recommendation(
+                    **claude_request
+                ):
+                    if kind == "field" and name == "recommended_item" and streamed_pick is None:
+                        menu_entry = menu_index.find_closest(value)
+                        if menu_entry is not None and (
+                            normalize_name(menu_entry.item.get("name")) in candidates
+                        ):
+                            streamed_pick = {
+                                "recommended_item": menu_entry.item.get("name"),
+                                "item_id": menu_entry.item.get("item_id"),
+                            }
+                            item = build_food_item_recommendation(
+                                {**streamed_pick, "reasoning": ""}, menu_index
+                            )
+                            yield _sse("item", item.dict(exclude={"reasoning"}))
+                    elif kind == "delta" and name == "reasoning":
+                        yield _sse("reasoning", {"text": value})
+                        reasoning_chunks.append(value)
+                    elif kind == "result":
+                        response = {**value, "source": "llm"}
+            except Exception as e:
+                if streamed_pick is None:
+                    yield _sse(
+                        "error", {"detail": f"Failed to generate recommendation: {str(e)}"}
+                    )
+                    return
+                response = None
+
+            if response is None or response.get("fallback"):
+                if streamed_pick is None:
+                    response = generate_local_response(
+                        current_user.id,
+                        restaurant_id,
+                        restaurant_data,
+                        curr_dislikes,
+                        source="local_fallback",
+                        curr_likes=curr_likes,
+                    )
+                else:
+                    # Claude failed after naming the item: keep the announced card
+                    response = {
+                        **streamed_pick,
+                        "reasoning": "".join(reasoning_chunks),
+                        "alternatives": [],
+                        "source": "llm",
+                        "fallback": True,
+                    }
+            # Don't pin mock/fallback answers for the whole TTL
+            if not response.get("fallback"):
+                recommendation_cache.put(cache_key, response, current_user.id)
+
+        # Same filtering as the non-streaming endpoint
+        picks = select_menu_recommendations(response, menu_index, seen, allowed)
+        if not picks:
+            # Everything Claude named conflicts with a dietary restriction
+            response = generate_local_response(
+                current_user.id,
+                restaurant_id,
+                restaurant_data,
+                curr_dislikes,
+                source="local_fallback",
+                curr_likes=curr_likes,
+            )
+            picks = select_menu_recommendations(response, menu_index, seen, allowed)
+        pick = picks[0]
+        if streamed_pick is not None:
+            menu_entry = resolve_menu_entry(pick, menu_index)
+            if menu_entry is None or normalize_name(
+                menu_entry.item.get("name")
+            ) != normalize_name(streamed_pick["recommended_item"]):
+                pick = {**streamed_pick, "reasoning": "".join(reasoning_chunks)}
+        if not pick.get("reasoning"):
+            pick = {**pick, "reasoning": "Recommended by our AI based on your taste profile"}
+
+        recommendation = build_food_item_recommendation(pick, menu_index)
+        session.last_served = recommendation.name
+        audit_served_recommendations(
+            current_user.id,
+            restaurant_id,
+            [pick],
+            menu_index,
+            session.session_id,
+            response.get("source", "llm"),
+        )
+        if streamed_pick is None:
+            yield _sse("item", recommendation.dict(exclude={"reasoning"}))
+        if not reasoning_chunks:
+            yield _sse("reasoning", {"text": recommendation.reasoning})
+
+        schedule_next_card_prefetch(
+            current_user.id,
+            restaurant_id,
+            restaurant_data,
+            profile_hash,
+            catalog_version,
+            curr_dislikes,
+            [recommendation.name],
+            curr_likes=curr_likes,
+        )
+
+        yield _sse(
+            "done",
+            {
+                "item": recommendation.dict(),
+                "confidence_score": pick.get("confidence", 0.85),
+                "price": recommendation.price,
+                "session_id": session.session_id,
+                "source": response.get("source", "llm"),
+            },
+        )
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/metrics",
+    summary="Get Recommendation Metrics",
+    description="Counters for the recommendation caches (useful for monitoring)",
+    response_description="Hit/miss counters and sizes of the recommendation caches",
+)
+async def get_recommendation_metrics():
+    """Get recommendation cache, prefetch and LLM token usage counters."""
+    return {
+        "cache": recommendation_cache.stats(),
+        "prefetch": swipe_prefetcher.stats(),
+        "llm": claude_client.usage_stats,
+        "llm_recent_calls": list(claude_client.call_log),
+        "llm_parse": {
+            mode: {
+                **counts,
+                "failure_rate": (
+                    counts["failures"] / counts["responses"] if counts["responses"] else 0.0
+                ),
+            }
+            for mode, counts in claude_client.parse_stats.items()
+        },
+        "recommendations": RECOMMENDATION_STATS,
+        # Each coalesced request is an LLM call saved
+        "singleflight": recommendation_flights.stats(),
+        "sessions": swipe_sessions.stats(),
+        "prompt_sections": claude_client.prompt_builder.stats(),
+        "item_vectors": item_vectors.stats(),
+        "preference_models": preference_models.stats(),
+        "audit": recommendation_audit.stats(),
+    }
+
+
+@router.delete(
+    "/{restaurant_id}/prefetch",
+    summary="Leave Restaurant",
+    description="Cancel speculative recommendations for a restaurant the user has left",
+    response_description="Number of cancelled prefetches",
+)
+async def cancel_recommendation_prefetch(
+    restaurant_id: str, current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Cancel background prefetches for the current user at a restaurant.
+
+    Clients should call this when the user leaves the swipe view.
+    """
+    cancelled = swipe_prefetcher.cancel_user(current_user.id, restaurant_id)
+    return {"cancelled": cancelled}
+
+
 @router.get(
     "/{restaurant_id}/context",
     summary="Get Recommendation Context",
@@ -224,6 +1134,7 @@ async def get_recommendation_context(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant not found"
             )
 
+        await preference_models.load(current_user.id)
         context = gather_recommendation_context(current_user.id, restaurant_id, [])
 
         return {
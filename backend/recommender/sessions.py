@@ -0,0 +1,130 @@
+"""
+Server-side swipe sessions.
+
+A session accumulates the likes and dislikes of one user at one restaurant,
+so clients only send the latest swipe instead of the whole rejected list.
+Sessions expire after a sliding TTL and the store is bounded LRU-style.
+"""
+
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+
+
+class SwipeSession:
+    """Swipe history of one user at one restaurant"""
+
+    def __init__(self, session_id: str, user_id: str, restaurant_id: str, max_swipes: int):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.restaurant_id = restaurant_id
+        self.max_swipes = max_swipes
+        self.likes: List[str] = []
+        self.dislikes: List[str] = []
+        # Top pick of the last response, the target of a swipe without an item name
+        self.last_served: Optional[str] = None
+        self.expires_at = 0.0
+
+    def record(self, item_name: str, liked: bool) -> bool:
+        """Record a swipe; repeats are ignored and a changed mind moves the item"""
+        item_name = item_name.strip()
+        key = item_name.lower()
+        if not key:
+            return False
+
+        target, other = (self.likes, self.dislikes) if liked else (self.dislikes, self.likes)
+        if any(name.lower() == key for name in target):
+            return False
+        other[:] = [name for name in other if name.lower() != key]
+        if len(self.likes) + len(self.dislikes) >= self.max_swipes:
+            return False
+        target.append(item_name)
+        return True
+
+    @property
+    def seen(self) -> List[str]:
+        """Items not to serve again (rejected or already liked)"""
+        return self.dislikes + self.likes
+
+
+class SessionStore:
+    """Bounded in-memory store of swipe sessions with a sliding TTL"""
+
+    def __init__(self, max_sessions: int = 10000, ttl_seconds: float = 1800, max_swipes: int = 500):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_swipes = max_swipes
+        self._sessions: "OrderedDict[str, SwipeSession]" = OrderedDict()
+        # (user_id, restaurant_id) -> id of the user's latest session there
+        self._latest: Dict[Tuple[str, str], str] = {}
+        self.created = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get(self, session_id: str, user_id: str) -> Optional[SwipeSession]:
+        """Live session owned by user_id, extending its TTL"""
+        session = self._sessions.get(session_id)
+        if session is None or session.user_id != user_id:
+            return None
+        now = time.monotonic()
+        if session.expires_at <= now:
+            del self._sessions[session_id]
+            self._forget(session)
+            self.expired += 1
+            return None
+        session.expires_at = now + self.ttl_seconds
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def create(self, user_id: str, restaurant_id: str) -> SwipeSession:
+        """Start a new session, evicting the least recently used ones if full"""
+        while self._sessions and len(self._sessions) >= self.max_sessions:
+            _, evicted = self._sessions.popitem(last=False)
+            self._forget(evicted)
+            self.evictions += 1
+
+        session = SwipeSession(str(uuid.uuid4()), user_id, restaurant_id, self.max_swipes)
+        session.expires_at = time.monotonic() + self.ttl_seconds
+        self._sessions[session.session_id] = session
+        self._latest[(user_id, restaurant_id)] = session.session_id
+        self.created += 1
+        return session
+
+    def latest(self, user_id: str, restaurant_id: str) -> Optional[SwipeSession]:
+        """The user's most recently started live session at a restaurant"""
+        session_id = self._latest.get((user_id, restaurant_id))
+        return self.get(session_id, user_id) if session_id else None
+
+    def resolve(
+        self, session_id: Optional[str], user_id: str, restaurant_id: str
+    ) -> SwipeSession:
+        """The requested session if it is live and for this restaurant, else a new one"""
+        session = self.get(session_id, user_id) if session_id else None
+        if session is None or session.restaurant_id != restaurant_id:
+            session = self.create(user_id, restaurant_id)
+        return session
+
+    def _forget(self, session: SwipeSession) -> None:
+        key = (session.user_id, session.restaurant_id)
+        if self._latest.get(key) == session.session_id:
+            del self._latest[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "created": self.created,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
+
+
+# Global session store for the recommendation endpoints
+swipe_sessions = SessionStore(
+    max_sessions=settings.RECS_SESSION_MAX,
+    ttl_seconds=settings.RECS_SESSION_TTL_SECONDS,
+    max_swipes=settings.RECS_SESSION_MAX_SWIPES,
+)
@@ -1,10 +1,23 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
 
+class SwipeEvent(BaseModel):
+    # Defaults to the top pick of the session's previous response
+    item_name: Optional[str] = None
+    liked: bool
+
+
 class RecommendationRequest(BaseModel):
+    # Session from the previous response; omit to start a new one
+    session_id: Optional[str] = None
+    # The swipe on the previous card (recorded in the session)
+    last_swipe: Optional[SwipeEvent] = None
+    # Legacy: full list of rejected items, merged into the session
     curr_dislikes: List[str] = []
+    # >1 asks Claude for a ranked list in one call; extras become `alternatives`
+    num_recommendations: int = Field(default=1, ge=1, le=10)
 
 
 class FoodItemRecommendation(BaseModel):
@@ -26,6 +39,39 @@ class RecommendationResponse(BaseModel):
     confidence_score: float  # 0-1 scale
     session_id: str
     alternatives: List[FoodItemRecommendation] = []
+    # "llm", "local", "local_fallback" (Claude unavailable or failed) or
+    # "local_deadline" (Claude missed RECS_LATENCY_BUDGET_MS)
+    source: str = "llm"
+
+
+class NearbyRecommendationRequest(BaseModel):
+    latitude: float = Field(ge=-90, le=90)
+    longitude: float = Field(ge=-180, le=180)
+    # Defaults to RECS_NEARBY_RADIUS_KM
+    max_distance_km: Optional[float] = Field(default=None, gt=0)
+    # Restaurants to ask for recommendations (capped at RECS_NEARBY_MAX_RESTAURANTS)
+    max_restaurants: Optional[int] = Field(default=None, ge=1)
+    # Items recommended per restaurant before merging
+    items_per_restaurant: int = Field(default=1, ge=1, le=5)
+
+
+class NearbyRecommendation(BaseModel):
+    restaurant_id: str
+    restaurant_name: str
+    distance_km: float
+    item: FoodItemRecommendation
+    confidence_score: float
+    # Merged ranking score (item confidence and restaurant fit)
+    score: float
+    source: str = "llm"
+
+
+class NearbyRecommendationResponse(BaseModel):
+    recommendations: List[NearbyRecommendation]
+    restaurants_considered: int
+    # Restaurants that missed the deadline; non-empty means the list is partial
+    timed_out_restaurants: List[str] = []
+    partial: bool = False
 
 
 class RecommendationContext(BaseModel):
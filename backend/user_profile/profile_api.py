@@ -6,6 +6,7 @@ from .types.profile_types import (
 )
 from auth.auth_api import get_current_user
 from auth.types.auth_types import UserResponse
+from recommender.rec_cache import recommendation_cache
 from datetime import datetime
 from typing import Dict
 
@@ -206,6 +207,7 @@ async def update_user_profile(
 
     existing_profile.updated_at = datetime.utcnow()
     MOCK_PROFILES_DB[user_id] = existing_profile
+    recommendation_cache.invalidate_user(user_id)
 
     print(f"DEBUG: Profile after update: {existing_profile.dict()}")
     print(f"DEBUG: MOCK_PROFILES_DB keys: {list(MOCK_PROFILES_DB.keys())}")
@@ -277,6 +279,7 @@ async def delete_user_profile(
 
     if user_id in MOCK_PROFILES_DB:
         del MOCK_PROFILES_DB[user_id]
+        recommendation_cache.invalidate_user(user_id)
         return {"message": "Profile deleted successfully"}
     else:
         raise HTTPException(
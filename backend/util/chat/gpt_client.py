@@ -1,19 +1,98 @@
 import anthropic
-from typing import List, Dict, Any, Optional
+from collections import deque
+from typing import AsyncIterator, Deque, List, Dict, Any, Optional, Tuple
 import os
 import json
+import time
+
+from util.chat.json_stream import JsonFieldStream, StreamEvent
+from util.chat.token_budget import estimate_tokens, output_token_budget
+from util.formatting.prompt_builder import RECOMMEND_TOOL, CatalogKey, PromptBuilder
+
+CLAUDE_MODEL = "claude-sonnet-4-20250514"
+
+# One AsyncAnthropic client per API key (and base URL) for the whole process.
+# Each client keeps a pooled keep-alive HTTP connection, so sharing it avoids a
+# new TLS handshake on every recommendation.
+_ASYNC_CLIENTS: Dict[Tuple[str, Optional[str]], anthropic.AsyncAnthropic] = {}
+
+
+def get_async_anthropic_client(
+    api_key: str, base_url: Optional[str] = None
+) -> anthropic.AsyncAnthropic:
+    """
+    Get (or lazily create) the shared AsyncAnthropic client for an API key
+
+    base_url points the client at another server, e.g. fake_llm_server.py
+    for load tests (None uses the SDK default).
+    """
+    client = _ASYNC_CLIENTS.get((api_key, base_url))
+    if client is None:
+        client = anthropic.AsyncAnthropic(api_key=api_key, base_url=base_url)
+        _ASYNC_CLIENTS[(api_key, base_url)] = client
+    return client
+
+
+async def close_async_anthropic_clients() -> None:
+    """Close every shared AsyncAnthropic client (called on app shutdown)"""
+    clients = list(_ASYNC_CLIENTS.values())
+    _ASYNC_CLIENTS.clear()
+    for client in clients:
+        await client.close()
 
 
 class ClaudeClient:
     def __init__(self, api_key: Optional[str] = None):
         """Initialize Claude client with API key"""
-        self.api_key = os.getenv("ANTHROPIC_API_KEY")
+        self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+        # Alternative API server, e.g. the local fake one for load tests
+        self.base_url = os.getenv("ANTHROPIC_BASE_URL") or None
         # print(self.api_key)
         if self.api_key:
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+            self.client = get_async_anthropic_client(self.api_key, self.base_url)
             # print("client on init", self.client)
         else:
             self.client = None
+        self.prompt_caching = (
+            os.getenv("ANTHROPIC_PROMPT_CACHING", "true").lower() == "true"
+        )
+        # Estimated prompt size to stay under, and output allowance per item
+        self.input_token_budget = int(
+            os.getenv("ANTHROPIC_INPUT_TOKEN_BUDGET", "8000")
+        )
+        self.output_tokens_per_item = int(
+            os.getenv("ANTHROPIC_OUTPUT_TOKENS_PER_ITEM", "300")
+        )
+        # Ask for recommendations through a forced tool call whose schema
+        # only allows menu item ids, instead of free-form JSON text
+        self.structured_output = (
+            os.getenv("ANTHROPIC_STRUCTURED_OUTPUT", "true").lower() == "true"
+        )
+        # Restaurant sections are rendered once per catalog version
+        self.prompt_builder = PromptBuilder(
+            input_token_budget=self.input_token_budget,
+            prompt_caching=self.prompt_caching,
+        )
+        # Responses and parse failures per output mode ("tool" / "json")
+        self.parse_stats: Dict[str, Dict[str, int]] = {
+            "tool": {"responses": 0, "failures": 0, "non_candidate_picks": 0},
+            "json": {"responses": 0, "failures": 0},
+        }
+        self.usage_stats: Dict[str, float] = {
+            "calls": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_read_input_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "cache_hit_calls": 0,
+            "cache_hit_latency_seconds": 0.0,
+            "cache_miss_calls": 0,
+            "cache_miss_latency_seconds": 0.0,
+            "estimated_input_tokens": 0,
+            "max_tokens_stops": 0,
+        }
+        # Per-call token usage of the most recent calls
+        self.call_log: Deque[Dict[str, Any]] = deque(maxlen=100)
 
     async def generate_food_recommendation(
         self,
@@ -23,38 +102,79 @@ class ClaudeClient:
         community_favorites: List[Dict[str, Any]],
         current_dislikes: List[str],
         restaurant_name: str,
+        menu_items: Optional[List[Dict[str, Any]]] = None,
+        num_items: int = 1,
+        catalog_key: Optional[CatalogKey] = None,
     ) -> Dict[str, Any]:
-        """Generate food recommendation using Claude Haiku 3"""
+        """
+        Generate food recommendation using Claude
 
-        # Build the prompt
-        prompt = self._build_recommendation_prompt(
+        Args:
+            restaurant_items: Candidate items Claude should choose from
+            menu_items: Full restaurant menu for the cached prompt prefix
+                (defaults to restaurant_items)
+            num_items: Ask for a ranked list of this many items in one call;
+                everything after the first is returned under "alternatives"
+            catalog_key: (restaurant_id, catalog_version) the restaurant
+                sections of the prompt are memoized under
+        """
+
+        tool = self._recommendation_tool(
+            menu_items or restaurant_items, num_items, catalog_key
+        )
+        system = self.prompt_builder.build_system(
             user_profile,
             restaurant_items,
             reviews,
             community_favorites,
             current_dislikes,
             restaurant_name,
+            menu_items,
+            num_items,
+            structured=tool is not None,
+            catalog_key=catalog_key,
         )
         try:
             # Mock response if no API key
             print("client on call", self.client)
             if self.client == None:
                 print("MOCKED API RESPONSE")
-                return self._mock_claude_response(restaurant_items, current_dislikes)
+                return self._mock_claude_response(
+                    restaurant_items, current_dislikes, num_items
+                )
 
-            # Actual Claude API call
-            response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=5000,
+            # Actual Claude API call (awaited so the event loop keeps serving
+            # other requests during the round trip)
+            max_tokens = output_token_budget(num_items, self.output_tokens_per_item)
+            started = time.perf_counter()
+            response = await self.client.messages.create(
+                model=CLAUDE_MODEL,
+                max_tokens=max_tokens,
                 temperature=0.7,
-                system=prompt,
+                system=system,
                 messages=[{"role": "user", "content": "generate next recommendation"}],
+                **self._tool_kwargs(tool),
+            )
+            self._record_usage(
+                response,
+                time.perf_counter() - started,
+                self._estimate_system_tokens(system),
+                max_tokens,
             )
 
             print("received api response")
 
-            res = self._parse_claude_response(response.content[0].text)
+            if tool is not None:
+                res = self._parse_tool_response(
+                    response, menu_items or restaurant_items, num_items, restaurant_items
+                )
+            else:
+                res = self._parse_claude_response(response.content[0].text, num_items)
             print(res)
+            if res is None:
+                return self._mock_claude_response(
+                    restaurant_items, current_dislikes, num_items
+                )
             return res
 
         except Exception as e:
@@ -64,9 +184,11 @@ class ClaudeClient:
             tb_str = traceback.format_exc()
             print(f"Claude API error: {e}\nTraceback:\n{tb_str}")
             # print(f"Claude API error: {e.with_traceback(TracebackType)}")
-            return self._mock_claude_response(restaurant_items, current_dislikes)
+            return self._mock_claude_response(
+                restaurant_items, current_dislikes, num_items
+            )
 
-    def _build_recommendation_prompt(
+    async def stream_food_recommendation(
         self,
         user_profile: Dict[str, Any],
         restaurant_items: List[Dict[str, Any]],
@@ -74,73 +196,142 @@ class ClaudeClient:
         community_favorites: List[Dict[str, Any]],
         current_dislikes: List[str],
         restaurant_name: str,
-    ) -> str:
-        """Build the Claude prompt for food recommendation"""
-
-        prompt = f"""
-You are a food recommendation expert helping a user choose their next meal at {restaurant_name}.
-
-USER PROFILE:
-- Dietary restrictions: {user_profile.get('dietary_restrictions', [])}
-- Cuisine preferences: {user_profile.get('cuisine_preferences', [])}
-- Flavor profile: {user_profile.get('flavor_profile', {})}
-- Liked foods: {user_profile.get('liked_foods', [])}
-- Disliked foods: {user_profile.get('disliked_foods', [])}
-
-RESTAURANT MENU ITEMS:
-{self._format_menu_items(restaurant_items)}
-
-CUSTOMER REVIEWS:
-{self._format_reviews(reviews)}
-
-COMMUNITY FAVORITES:
-{self._format_community_favorites(community_favorites)}
-
-ITEMS USER HAS ALREADY REJECTED THIS SESSION:
-{', '.join(current_dislikes) if current_dislikes else 'None'}
-
-Please recommend ONE menu item that would be perfect for this user. Respond in JSON format:
-{{
-    "recommended_item": "exact menu item name",
-    "reasoning": "detailed explanation of why this item matches the user's preferences",
-    "confidence": 0.85,
-    "id": "menu_item_id"
-}}
-
-Make sure to:
-1. Avoid items the user has already rejected
-2. Consider their dietary restrictions and preferences
-3. Factor in positive reviews and community favorites
-4. Provide a compelling reason for your recommendation
-5. Use ALL available information to make the best recommendation, especially also factor in popularity and user feedback
-"""
-        return prompt
-
-    def _format_menu_items(self, items: List[Dict[str, Any]]) -> str:
-        """Format menu items for the prompt"""
-        formatted = []
-        for i, item in enumerate(items):
-            formatted.append(
-                f"- id: {i+1} name: {item.get('name', 'Unknown')} "
-                f"description: {item.get('description', '')} "
-                f"price: (${item.get('price', 0)}) "
-                f"category: {item.get('category', 'Unknown')}"
+        menu_items: Optional[List[Dict[str, Any]]] = None,
+        catalog_key: Optional[CatalogKey] = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Stream a food recommendation as Claude generates it
+
+        Yields JsonFieldStream events as fields of the JSON answer complete
+        ("field") and as the reasoning text arrives ("delta"), then a final
+        ("result", "", parsed_response) event with the same dict that
+        generate_food_recommendation would return. With structured output
+        the streamed item_id is reported as a "recommended_item" field.
+        """
+        tool = self._recommendation_tool(menu_items or restaurant_items, 1, catalog_key)
+        system = self.prompt_builder.build_system(
+            user_profile,
+            restaurant_items,
+            reviews,
+            community_favorites,
+            current_dislikes,
+            restaurant_name,
+            menu_items,
+            structured=tool is not None,
+            catalog_key=catalog_key,
+        )
+        # Only a candidate pick is reported before the answer is complete
+        candidates_by_id = self._items_by_id(restaurant_items)
+        if self.client is None:
+            yield ("result", "", self._mock_claude_response(restaurant_items, current_dislikes))
+            return
+
+        parser = JsonFieldStream(streamed_fields={"reasoning"})
+        chunks = []
+        max_tokens = output_token_budget(1, self.output_tokens_per_item)
+        try:
+            started = time.perf_counter()
+            async with self.client.messages.stream(
+                model=CLAUDE_MODEL,
+                max_tokens=max_tokens,
+                temperature=0.7,
+                system=system,
+                messages=[{"role": "user", "content": "generate next recommendation"}],
+                **self._tool_kwargs(tool),
+            ) as stream:
+                async for stream_event in stream:
+                    # Tool input arrives as input_json_delta, plain answers as text_delta
+                    if stream_event.type != "content_block_delta":
+                        continue
+                    delta = stream_event.delta
+                    text = getattr(delta, "partial_json", None) or getattr(delta, "text", None)
+                    if not text:
+                        continue
+                    chunks.append(text)
+                    for event in parser.feed(text):
+                        if event[0] == "field" and event[1] == "item_id":
+                            item = candidates_by_id.get(event[2])
+                            if item is not None:
+                                yield ("field", "recommended_item", item.get("name"))
+                        yield event
+                final_message = await stream.get_final_message()
+            self._record_usage(
+                final_message,
+                time.perf_counter() - started,
+                self._estimate_system_tokens(system),
+                max_tokens,
             )
-        return "\n".join(formatted)
+        except Exception as e:
+            import traceback
+
+            print(f"Claude streaming error: {e}\nTraceback:\n{traceback.format_exc()}")
+            yield ("result", "", self._mock_claude_response(restaurant_items, current_dislikes))
+            return
+
+        if tool is not None:
+            result = self._parse_tool_response(
+                final_message, menu_items or restaurant_items, 1, restaurant_items
+            )
+        else:
+            result = self._parse_claude_response("".join(chunks))
+        if result is None:
+            result = self._mock_claude_response(restaurant_items, current_dislikes)
+        yield ("result", "", result)
+
+    def _estimate_system_tokens(self, system: Any) -> int:
+        """Local estimate of a system prompt's size (string or text blocks)"""
+        if isinstance(system, str):
+            return estimate_tokens(system)
+        return sum(estimate_tokens(block.get("text", "")) for block in system)
 
-    def _format_reviews(self, reviews: List[str]) -> str:
-        """Format reviews for the prompt"""
-        return "\n".join(reviews)
+    def _record_usage(
+        self,
+        response: Any,
+        latency: float,
+        estimated_input_tokens: int = 0,
+        max_tokens: int = 0,
+    ) -> None:
+        """Accumulate token usage, including prompt cache reads/writes"""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        input_tokens = getattr(usage, "input_tokens", 0) or 0
+        output_tokens = getattr(usage, "output_tokens", 0) or 0
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        hit_max_tokens = getattr(response, "stop_reason", None) == "max_tokens"
 
-    def _format_community_favorites(self, favorites: List[Dict[str, Any]]) -> str:
-        """Format community favorites for the prompt"""
-        formatted = []
-        for fav in favorites:
-            formatted.append(f"- name: {fav.get('name', 'Unknown')}")
-        return "\n".join(formatted)
+        stats = self.usage_stats
+        stats["calls"] += 1
+        stats["input_tokens"] += input_tokens
+        stats["output_tokens"] += output_tokens
+        stats["cache_read_input_tokens"] += cache_read
+        stats["cache_creation_input_tokens"] += cache_write
+        stats["estimated_input_tokens"] += estimated_input_tokens
+        stats["max_tokens_stops"] += int(hit_max_tokens)
+        # Split latency by cache outcome to compare cached vs uncached calls
+        bucket = "cache_hit" if cache_read else "cache_miss"
+        stats[f"{bucket}_calls"] += 1
+        stats[f"{bucket}_latency_seconds"] += latency
+
+        self.call_log.append(
+            {
+                "estimated_input_tokens": estimated_input_tokens,
+                # Total prompt size, however it was billed
+                "input_tokens": input_tokens + cache_read + cache_write,
+                "cache_read_input_tokens": cache_read,
+                "output_tokens": output_tokens,
+                "max_tokens": max_tokens,
+                "hit_max_tokens": hit_max_tokens,
+                "latency_seconds": round(latency, 3),
+            }
+        )
 
     def _mock_claude_response(
-        self, restaurant_items: List[Dict[str, Any]], current_dislikes: List[str]
+        self,
+        restaurant_items: List[Dict[str, Any]],
+        current_dislikes: List[str],
+        num_items: int = 1,
     ) -> Dict[str, Any]:
         """Mock Claude response for testing"""
         available_items = [
@@ -150,16 +341,19 @@ Make sure to:
         ]
 
         if available_items:
-            selected = available_items[0]
-            return {
-                "recommended_item": selected.get("name", "Chef Special"),
-                "reasoning": (
-                    f"MOCK MF Based on your taste preferences, {selected.get('name', 'this item')} "
-                    "offers the perfect balance of flavors you enjoy. The fresh ingredients "
-                    "and expert preparation make it a standout choice."
-                ),
-                "confidence": 0.85,
-            }
+            picks = [
+                {
+                    "recommended_item": selected.get("name", "Chef Special"),
+                    "reasoning": (
+                        f"MOCK MF Based on your taste preferences, {selected.get('name', 'this item')} "
+                        "offers the perfect balance of flavors you enjoy. The fresh ingredients "
+                        "and expert preparation make it a standout choice."
+                    ),
+                    "confidence": 0.85,
+                }
+                for selected in available_items[: max(num_items, 1)]
+            ]
+            return {**picks[0], "alternatives": picks[1:], "fallback": True}
 
         return {
             "recommended_item": "Chef's Special",
@@ -168,33 +362,175 @@ Make sure to:
                 "trying the chef's special - it represents the restaurant's creativity and expertise."
             ),
             "confidence": 0.75,
+            "alternatives": [],
+            "fallback": True,
+        }
+
+    def _recommendation_tool(
+        self,
+        menu_items: List[Dict[str, Any]],
+        num_items: int,
+        catalog_key: Optional[CatalogKey] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Tool definition whose item_id can only be a menu item (None if unusable)
+
+        The enum covers the whole menu rather than this request's candidates,
+        so the definition stays the same for every swipe at a catalog version
+        and doesn't invalidate the cached prompt prefix. Picks outside the
+        candidates are dropped by _parse_tool_response instead.
+        """
+        if not self.structured_output:
+            return None
+        item_ids = self.prompt_builder.menu_item_ids(menu_items, catalog_key)
+        if not item_ids:
+            return None
+
+        pick = {
+            "type": "object",
+            "properties": {
+                "item_id": {
+                    "type": "integer",
+                    "enum": item_ids,
+                    "description": "id of one of the candidate items",
+                },
+                "reasoning": {
+                    "type": "string",
+                    "description": "why this item matches the user's preferences",
+                },
+                "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+            },
+            "required": ["item_id", "reasoning", "confidence"],
+        }
+        if num_items > 1:
+            schema = {
+                "type": "object",
+                "properties": {
+                    "recommendations": {
+                        "type": "array",
+                        "items": pick,
+                        "minItems": 1,
+                        "maxItems": num_items,
+                        "description": "different items, best first",
+                    }
+                },
+                "required": ["recommendations"],
+            }
+        else:
+            schema = pick
+
+        return {
+            "name": RECOMMEND_TOOL,
+            "description": "Recommend menu items to the user",
+            "input_schema": schema,
+        }
+
+    def _tool_kwargs(self, tool: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """messages.create/stream arguments forcing a call to tool"""
+        if tool is None:
+            return {}
+        return {"tools": [tool], "tool_choice": {"type": "tool", "name": tool["name"]}}
+
+    def _items_by_id(self, items: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        return {
+            item["item_id"]: item for item in items if item.get("item_id") is not None
         }
 
-    def _parse_claude_response(self, response_text: str) -> Dict[str, Any]:
-        """Parse Claude response text into structured data"""
+    def _parse_tool_response(
+        self,
+        response: Any,
+        menu_items: List[Dict[str, Any]],
+        num_items: int = 1,
+        candidate_items: Optional[List[Dict[str, Any]]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Recommendations from a forced tool call (None if it can't be used)
+
+        Picks that aren't among candidate_items (already rejected, ruled out by
+        a dietary restriction, or just not shortlisted) are dropped.
+        """
+        self.parse_stats["tool"]["responses"] += 1
+        tool_input = next(
+            (
+                block.input
+                for block in getattr(response, "content", [])
+                if getattr(block, "type", None) == "tool_use"
+            ),
+            None,
+        )
+
+        entries = []
+        if isinstance(tool_input, dict):
+            ranked = tool_input.get("recommendations")
+            entries = ranked if isinstance(ranked, list) else [tool_input]
+
+        items_by_id = self._items_by_id(menu_items)
+        candidate_ids = (
+            set(self._items_by_id(candidate_items)) if candidate_items else None
+        )
+        picks = []
+        for entry in entries[: max(num_items, 1)]:
+            item = items_by_id.get(entry.get("item_id")) if isinstance(entry, dict) else None
+            if item is None:
+                continue
+            if candidate_ids and item["item_id"] not in candidate_ids:
+                self.parse_stats["tool"]["non_candidate_picks"] += 1
+                continue
+            picks.append(
+                {
+                    **self._recommendation_fields(entry),
+                    "recommended_item": item.get("name", "Chef's Special"),
+                    "item_id": item["item_id"],
+                }
+            )
+
+        if not picks:
+            self.parse_stats["tool"]["failures"] += 1
+            print(f"Unusable tool call input: {tool_input}")
+            return None
+        return {**picks[0], "alternatives": picks[1:]}
+
+    def _parse_claude_response(
+        self, response_text: str, num_items: int = 1
+    ) -> Optional[Dict[str, Any]]:
+        """Parse Claude response text into structured data (None if it isn't valid JSON)"""
+        self.parse_stats["json"]["responses"] += 1
         try:
-            if (response_text.startswith('`')):
-                start = '```json'
-                end = '```'
-                response_text = response_text[len(start):]
-                response_text = response_text[:-len(end) + 1]
+            # Drop Markdown fences or any other text around the JSON object
+            start = response_text.find("{")
+            end = response_text.rfind("}")
+            if start != -1 and end > start:
+                response_text = response_text[start : end + 1]
             parsed = json.loads(response_text)
             # print(f"Successfully parsed Claude response: {parsed}")
 
+            # Ranked list mode: first entry is the recommendation, the rest alternatives
+            ranked = parsed.get("recommendations") if num_items > 1 else None
+            if isinstance(ranked, list) and ranked:
+                picks = [
+                    self._recommendation_fields(entry)
+                    for entry in ranked[:num_items]
+                    if isinstance(entry, dict)
+                ]
+                if picks:
+                    return {**picks[0], "alternatives": picks[1:]}
+
             # Ensure we have the required fields
-            result = {
-                "recommended_item": parsed.get("recommended_item", "Chef's Special"),
-                "reasoning": parsed.get("reasoning", "AI-generated recommendation"),
-                "confidence": parsed.get("confidence", 0.7),
-            }
+            result = self._recommendation_fields(parsed)
+            result["alternatives"] = []
 
             return result
 
-        except json.JSONDecodeError as e:
+        except (json.JSONDecodeError, AttributeError) as e:
+            self.parse_stats["json"]["failures"] += 1
             print(f"JSON parsing failed: {e}")
             print(f"Raw response text: {response_text}")
-            return {
-                "recommended_item": "Chef's Special",
-                "reasoning": response_text,
-                "confidence": 0.7,
-            }
+            return None
+
+    def _recommendation_fields(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        """Pick the fields we use from one parsed recommendation"""
+        return {
+            "recommended_item": parsed.get("recommended_item", "Chef's Special"),
+            "reasoning": parsed.get("reasoning", "AI-generated recommendation"),
+            "confidence": parsed.get("confidence", 0.7),
+        }
@@ -0,0 +1,195 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+import json
+
+# Event tuples produced by JsonFieldStream.feed:
+#   ("field", name, value)   a top-level scalar field is complete
+#   ("delta", name, text)    more characters of a streamed string field
+#   ("end", name, None)      a streamed string field is complete
+StreamEvent = Tuple[str, str, Any]
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+# Marker for values (nested objects/arrays) that are skipped rather than reported
+_SKIPPED = object()
+
+
+class JsonFieldStream:
+    """
+    Incrementally extract top-level fields from a JSON object as it streams in.
+
+    Built for LLM output: text before the opening brace (e.g. a ```json fence)
+    is ignored, scalar fields are reported once complete, and the string fields
+    listed in `streamed_fields` are reported character by character.
+    Nested objects/arrays are skipped.
+    """
+
+    def __init__(self, streamed_fields: Optional[Set[str]] = None):
+        self.streamed_fields = streamed_fields or set()
+        self.fields: Dict[str, Any] = {}
+        self._buf = ""
+        self._pos = 0
+        self._started = False
+        self._done = False
+        self._key: Optional[str] = None
+        # Whether we're inside a streamed string value
+        self._in_stream = False
+
+    def feed(self, chunk: str) -> List[StreamEvent]:
+        """Add a chunk of text and return the events it completes"""
+        self._buf += chunk
+        events: List[StreamEvent] = []
+
+        while not self._done:
+            if not self._started:
+                brace = self._buf.find("{", self._pos)
+                if brace == -1:
+                    self._pos = len(self._buf)
+                    break
+                self._pos = brace + 1
+                self._started = True
+
+            if self._in_stream:
+                if not self._read_streamed_string(events):
+                    break
+                continue
+
+            self._skip_separators()
+            if self._pos >= len(self._buf):
+                break
+            if self._buf[self._pos] == "}":
+                self._done = True
+                break
+
+            if self._key is None:
+                key, end = self._read_string(self._pos)
+                if end is None:
+                    break
+                colon = self._buf.find(":", end)
+                if colon == -1:
+                    break
+                self._key = key
+                self._pos = colon + 1
+                continue
+
+            self._skip_whitespace()
+            if self._pos >= len(self._buf):
+                break
+
+            if self._buf[self._pos] == '"' and self._key in self.streamed_fields:
+                self._pos += 1
+                self._in_stream = True
+                self.fields[self._key] = ""
+                continue
+
+            value, end = self._read_value(self._pos)
+            if end is None:
+                break
+            if value is not _SKIPPED:
+                self.fields[self._key] = value
+                events.append(("field", self._key, value))
+            self._key = None
+            self._pos = end
+
+        return events
+
+    def _skip_whitespace(self) -> None:
+        while self._pos < len(self._buf) and self._buf[self._pos].isspace():
+            self._pos += 1
+
+    def _skip_separators(self) -> None:
+        while self._pos < len(self._buf) and (
+            self._buf[self._pos].isspace() or self._buf[self._pos] == ","
+        ):
+            self._pos += 1
+
+    def _read_streamed_string(self, events: List[StreamEvent]) -> bool:
+        """Emit decoded characters of a streamed string; True once it closes"""
+        text, pos, closed = self._decode(self._pos)
+        if text:
+            self.fields[self._key] += text
+            events.append(("delta", self._key, text))
+        self._pos = pos
+        if closed:
+            events.append(("end", self._key, None))
+            self._in_stream = False
+            self._key = None
+        return closed
+
+    def _decode(self, pos: int) -> Tuple[str, int, bool]:
+        """Decode string content from pos; stop early at an incomplete escape"""
+        out = []
+        buf = self._buf
+        while pos < len(buf):
+            char = buf[pos]
+            if char == '"':
+                return "".join(out), pos + 1, True
+            if char != "\\":
+                out.append(char)
+                pos += 1
+                continue
+            if pos + 1 >= len(buf):
+                break
+            code = buf[pos + 1]
+            if code == "u":
+                if pos + 6 > len(buf):
+                    break
+                try:
+                    out.append(chr(int(buf[pos + 2 : pos + 6], 16)))
+                except ValueError:
+                    out.append(buf[pos : pos + 6])
+                pos += 6
+            else:
+                out.append(_ESCAPES.get(code, code))
+                pos += 2
+        return "".join(out), pos, False
+
+    def _read_string(self, pos: int) -> Tuple[Optional[str], Optional[int]]:
+        """Read a complete quoted string starting at pos"""
+        if pos >= len(self._buf) or self._buf[pos] != '"':
+            return None, None
+        text, end, closed = self._decode(pos + 1)
+        return (text, end) if closed else (None, None)
+
+    def _read_value(self, pos: int) -> Tuple[Any, Optional[int]]:
+        """Read a complete scalar value (nested containers are skipped)"""
+        char = self._buf[pos]
+        if char == '"':
+            return self._read_string(pos)
+        if char in "[{":
+            end = self._skip_container(pos)
+            return (_SKIPPED, end) if end is not None else (None, None)
+
+        end = pos
+        while end < len(self._buf) and not (
+            self._buf[end] in ",}" or self._buf[end].isspace()
+        ):
+            end += 1
+        # The literal may continue in the next chunk
+        if end >= len(self._buf):
+            return None, None
+        try:
+            return json.loads(self._buf[pos:end]), end
+        except json.JSONDecodeError:
+            return self._buf[pos:end], end
+
+    def _skip_container(self, pos: int) -> Optional[int]:
+        depth = 0
+        in_string = False
+        while pos < len(self._buf):
+            char = self._buf[pos]
+            if in_string:
+                if char == "\\":
+                    pos += 1
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "[{":
+                depth += 1
+            elif char in "]}":
+                depth -= 1
+                if depth == 0:
+                    return pos + 1
+            pos += 1
+        return None
+
@@ -0,0 +1,48 @@
+"""
+Local token estimates and trimming helpers for recommendation prompts.
+
+Estimates assume ~4 characters per token, which is close enough for English
+menu and review text to budget a prompt without a network round trip.
+"""
+
+from typing import Iterable, List
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a piece of text"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """Shorten text to at most max_chars, preferring a sentence or word boundary"""
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+
+    cut = text[:max_chars]
+    sentence_end = max(cut.rfind(". "), cut.rfind("! "), cut.rfind("? "))
+    if sentence_end >= max_chars // 2:
+        return cut[: sentence_end + 1]
+    space = cut.rfind(" ")
+    return (cut[:space] if space > 0 else cut).rstrip(",;:-") + "..."
+
+
+def fit_lines(lines: Iterable[str], budget_tokens: int) -> List[str]:
+    """Longest leading run of lines whose estimated size fits the budget"""
+    kept = []
+    used = 0
+    for line in lines:
+        # +1 for the joining newline
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget_tokens:
+            break
+        kept.append(line)
+        used += cost
+    return kept
+
+
+def output_token_budget(num_items: int, tokens_per_item: int, overhead: int = 64) -> int:
+    """max_tokens for a JSON answer with num_items recommendations"""
+    return overhead + max(num_items, 1) * tokens_per_item
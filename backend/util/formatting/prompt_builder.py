@@ -1,202 +1,356 @@
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from util.chat.token_budget import estimate_tokens, fit_lines, truncate_text
+
+# Shares of the input token budget for the restaurant-level sections; the
+# rest covers instructions, the user profile and the candidate list
+MENU_BUDGET_SHARE = 0.6
+REVIEW_BUDGET_SHARE = 0.2
+# Longest single review kept in the prompt, and menu descriptions when trimmed
+REVIEW_MAX_CHARS = 400
+DESCRIPTION_MAX_CHARS = 80
+
+# Tool Claude is forced to call when structured output is on
+RECOMMEND_TOOL = "recommend_menu_items"
+
+# (restaurant id, catalog version) identifying one rendering of a restaurant
+CatalogKey = Tuple[str, int]
 
-class PromptBuilder:
-    """Utility class for building structured prompts for GPT recommendations"""
 
-    @staticmethod
-    def build_recommendation_prompt(
+class PromptBuilder:
+    """
+    Builds the system prompt for food recommendations.
+
+    The prompt is a restaurant-level prefix (menu, reviews, community
+    favorites, guidelines) followed by a small per-request suffix (profile,
+    candidates, rejected items, response format). The prefix is rendered once
+    per restaurant catalog version and memoized, so a request only formats
+    its own suffix.
+    """
+
+    def __init__(self, input_token_budget: int = 8000, prompt_caching: bool = True):
+        self.input_token_budget = input_token_budget
+        self.prompt_caching = prompt_caching
+        # restaurant_id -> (catalog_version, prefix, names of the menu items shown)
+        self._restaurant_sections: Dict[str, Tuple[int, str, Set[str]]] = {}
+        # restaurant_id -> (catalog_version, item ids of the menu)
+        self._menu_item_ids: Dict[str, Tuple[int, List[int]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def build_system(
+        self,
         user_profile: Dict[str, Any],
+        candidate_items: List[Dict[str, Any]],
+        reviews: List[str],
+        community_favorites: List[Dict[str, Any]],
+        current_dislikes: List[str],
         restaurant_name: str,
-        menu_items: List[Dict[str, Any]],
-        reviews: List[Dict[str, Any]],
-        community_data: List[Dict[str, Any]],
-        rejected_items: List[str],
-        session_context: Optional[Dict[str, Any]] = None,
-    ) -> str:
-        """Build a comprehensive prompt for food recommendations"""
-
-        prompt_sections = []
+        menu_items: Optional[List[Dict[str, Any]]] = None,
+        num_items: int = 1,
+        structured: bool = False,
+        catalog_key: Optional[CatalogKey] = None,
+    ) -> Any:
+        """
+        Build the system prompt for a recommendation request
+
+        Args:
+            candidate_items: Pre-ranked items the model should choose from
+            menu_items: Full menu for the restaurant prefix (defaults to
+                candidate_items)
+            structured: Describe the recommendation tool call instead of JSON text
+            catalog_key: (restaurant_id, catalog_version) to memoize the
+                restaurant prefix under; None renders it every time
+        """
+        prefix, shown_items = self.restaurant_prefix(
+            restaurant_name,
+            menu_items if menu_items is not None else candidate_items,
+            reviews,
+            community_favorites,
+            catalog_key,
+        )
+        return self.system_blocks(
+            prefix,
+            self.request_suffix(
+                user_profile,
+                candidate_items,
+                current_dislikes,
+                num_items,
+                shown_items,
+                structured,
+            ),
+        )
 
-        # System context
-        prompt_sections.append(
-            f"You are an expert food recommendation AI helping a user choose their next meal at {restaurant_name}. "
-            "Your goal is to recommend ONE perfect menu item based on their preferences, dietary needs, and social proof."
+    def system_blocks(self, prefix: str, suffix: str) -> Any:
+        """Combine prompt parts, marking the restaurant prefix as cacheable"""
+        if not self.prompt_caching:
+            return prefix + suffix
+        return [
+            {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": suffix},
+        ]
+
+    def restaurant_prefix(
+        self,
+        restaurant_name: str,
+        menu_items: List[Dict[str, Any]],
+        reviews: List[str],
+        community_favorites: List[Dict[str, Any]],
+        catalog_key: Optional[CatalogKey] = None,
+    ) -> Tuple[str, Set[str]]:
+        """
+        The restaurant-level part of the prompt and the menu item names it shows
+
+        Must not contain anything user- or swipe-specific, so every request for
+        the restaurant produces the same bytes and hits Anthropic's prompt cache.
+        The menu and reviews are trimmed to their share of the input token budget.
+        """
+        if catalog_key is not None:
+            restaurant_id, catalog_version = catalog_key
+            cached = self._restaurant_sections.get(restaurant_id)
+            if cached is not None and cached[0] == catalog_version:
+                self.hits += 1
+                return cached[1], cached[2]
+            self.misses += 1
+
+        prefix, shown_items = self._render_restaurant_prefix(
+            restaurant_name, menu_items, reviews, community_favorites
         )
+        if catalog_key is not None:
+            # One rendering per restaurant: a newer catalog version replaces it
+            self._restaurant_sections[restaurant_id] = (
+                catalog_version,
+                prefix,
+                shown_items,
+            )
+        return prefix, shown_items
+
+    def menu_item_ids(
+        self, menu_items: List[Dict[str, Any]], catalog_key: Optional[CatalogKey] = None
+    ) -> List[int]:
+        """
+        Distinct integer item ids of a menu, in menu order
+
+        The recommendation tool's item_id enum is built from these. Tools come
+        before the system prompt in Anthropic's cache prefix, so like the
+        restaurant prefix they are memoized per catalog version and never
+        depend on the request.
+        """
+        if catalog_key is not None:
+            restaurant_id, catalog_version = catalog_key
+            cached = self._menu_item_ids.get(restaurant_id)
+            if cached is not None and cached[0] == catalog_version:
+                return cached[1]
+
+        item_ids: List[int] = []
+        seen: Set[int] = set()
+        for item in menu_items:
+            item_id = item.get("item_id")
+            if isinstance(item_id, int) and item_id not in seen:
+                seen.add(item_id)
+                item_ids.append(item_id)
+        if catalog_key is not None:
+            self._menu_item_ids[restaurant_id] = (catalog_version, item_ids)
+        return item_ids
+
+    def _render_restaurant_prefix(
+        self,
+        restaurant_name: str,
+        menu_items: List[Dict[str, Any]],
+        reviews: List[str],
+        community_favorites: List[Dict[str, Any]],
+    ) -> Tuple[str, Set[str]]:
+        menu_text, shown_items = self._fit_menu_items(
+            menu_items, int(self.input_token_budget * MENU_BUDGET_SHARE)
+        )
+        reviews_text = self._format_reviews(
+            reviews, int(self.input_token_budget * REVIEW_BUDGET_SHARE)
+        )
+        return f"""
+You are a food recommendation expert helping a user choose their next meal at {restaurant_name}.
 
-        # User profile section
-        user_section = PromptBuilder._build_user_profile_section(user_profile)
-        prompt_sections.append(user_section)
+RESTAURANT MENU ITEMS:
+{menu_text}
 
-        # Menu items section
-        menu_section = PromptBuilder._build_menu_section(menu_items)
-        prompt_sections.append(menu_section)
+CUSTOMER REVIEWS:
+{reviews_text}
 
-        # Reviews section
-        if reviews:
-            reviews_section = PromptBuilder._build_reviews_section(reviews)
-            prompt_sections.append(reviews_section)
+COMMUNITY FAVORITES:
+{self._format_community_favorites(community_favorites)}
 
-        # Community data section
-        if community_data:
-            community_section = PromptBuilder._build_community_section(community_data)
-            prompt_sections.append(community_section)
+You will be given the user's profile, the candidate items to choose from,
+the items they already rejected and the response format to use.
 
-        # Rejected items section
-        if rejected_items:
-            rejected_section = (
-                f"\nITEMS ALREADY REJECTED THIS SESSION:\n{', '.join(rejected_items)}"
-            )
-            prompt_sections.append(rejected_section)
-
-        # Response format instructions
-        format_section = PromptBuilder._build_response_format_section()
-        prompt_sections.append(format_section)
-
-        return "\n\n".join(prompt_sections)
-
-    @staticmethod
-    def _build_user_profile_section(user_profile: Dict[str, Any]) -> str:
-        """Build the user profile section of the prompt"""
-        sections = ["USER PROFILE:"]
-
-        # Dietary restrictions
-        restrictions = user_profile.get("dietary_restrictions", [])
-        if restrictions:
-            restriction_names = [
-                r.get("name", "") for r in restrictions if isinstance(r, dict)
-            ]
-            if not restriction_names:
-                restriction_names = restrictions
-            sections.append(f"- Dietary restrictions: {', '.join(restriction_names)}")
-
-        # Cuisine preferences
-        cuisines = user_profile.get("cuisine_preferences", [])
-        if cuisines:
-            cuisine_text = []
-            for cuisine in cuisines:
-                if isinstance(cuisine, dict):
-                    name = cuisine.get("cuisine_type", "")
-                    level = cuisine.get("preference_level", 0)
-                    cuisine_text.append(f"{name} ({level}/5)")
-                else:
-                    cuisine_text.append(str(cuisine))
-            sections.append(f"- Cuisine preferences: {', '.join(cuisine_text)}")
-
-        # Flavor profile
-        flavor_profile = user_profile.get("flavor_profile", {})
-        if flavor_profile:
-            flavor_text = []
-            for flavor, level in flavor_profile.items():
-                if isinstance(level, (int, float)):
-                    flavor_text.append(f"{flavor.replace('_', ' ')}: {level}/5")
-            if flavor_text:
-                sections.append(f"- Flavor preferences: {', '.join(flavor_text)}")
-
-        # Liked/disliked foods
-        liked_foods = user_profile.get("liked_foods", [])
-        if liked_foods:
-            food_names = [
-                f.get("name", f) if isinstance(f, dict) else str(f) for f in liked_foods
-            ]
-            sections.append(f"- Previously liked: {', '.join(food_names[:5])}")
-
-        disliked_foods = user_profile.get("disliked_foods", [])
-        if disliked_foods:
-            food_names = [
-                f.get("name", f) if isinstance(f, dict) else str(f)
-                for f in disliked_foods
-            ]
-            sections.append(f"- Previously disliked: {', '.join(food_names[:5])}")
-
-        return "\n".join(sections)
-
-    @staticmethod
-    def _build_menu_section(menu_items: List[Dict[str, Any]]) -> str:
-        """Build the menu items section of the prompt"""
-        sections = ["AVAILABLE MENU ITEMS:"]
+Make sure to:
+1. Avoid items the user has already rejected
+2. Consider their dietary restrictions and preferences
+3. Factor in positive reviews and community favorites
+4. Provide a compelling reason for your recommendation
+5. Use ALL available information to make the best recommendation, especially also factor in popularity and user feedback
+""", shown_items
 
-        for item in menu_items:
-            name = item.get("name", "Unknown Item")
-            description = item.get("description", "")
-            price = item.get("price", 0)
-            category = item.get("category", "")
-
-            item_line = f"- {name}"
-            if category:
-                item_line += f" ({category})"
-            if description:
-                item_line += f": {description}"
-            if price:
-                item_line += f" - ${price}"
-
-            sections.append(item_line)
-
-        return "\n".join(sections)
-
-    @staticmethod
-    def _build_reviews_section(reviews: List[Dict[str, Any]]) -> str:
-        """Build the reviews section of the prompt"""
-        sections = ["CUSTOMER REVIEWS:"]
-
-        for review in reviews[:5]:  # Limit to top 5 reviews
-            rating = review.get("rating", 0)
-            text = review.get("text", "")
-            author = review.get("author_name", "Anonymous")
-
-            if text:
-                sections.append(f"- {author} ({rating}/5): {text[:150]}...")
-
-        return "\n".join(sections)
-
-    @staticmethod
-    def _build_community_section(community_data: List[Dict[str, Any]]) -> str:
-        """Build the community favorites section of the prompt"""
-        sections = ["COMMUNITY FAVORITES:"]
-
-        for item in community_data:
-            name = item.get("item_name", item.get("name", "Unknown"))
-            friend_recs = item.get("friend_recommendations", 0)
-            community_recs = item.get("community_recommendations", 0)
-            avg_rating = item.get("average_rating", 0)
-
-            item_line = f"- {name}"
-            if friend_recs > 0:
-                item_line += f" ({friend_recs} friend recommendations"
-            if community_recs > 0:
-                if friend_recs > 0:
-                    item_line += f", {community_recs} community votes"
-                else:
-                    item_line += f" ({community_recs} community votes"
-            if avg_rating > 0:
-                item_line += f", {avg_rating:.1f}/5 avg rating"
-            if friend_recs > 0 or community_recs > 0:
-                item_line += ")"
-
-            sections.append(item_line)
-
-        return "\n".join(sections)
-
-    @staticmethod
-    def _build_response_format_section() -> str:
-        """Build the response format instructions"""
-        return """RESPONSE FORMAT:
-Please respond with a JSON object containing:
+    def request_suffix(
+        self,
+        user_profile: Dict[str, Any],
+        candidate_items: List[Dict[str, Any]],
+        current_dislikes: List[str],
+        num_items: int = 1,
+        shown_items: Optional[Set[str]] = None,
+        structured: bool = False,
+    ) -> str:
+        """Build the per-user, per-swipe part of the prompt"""
+        return f"""
+USER PROFILE:
+- Dietary restrictions: {user_profile.get('dietary_restrictions', [])}
+- Cuisine preferences: {user_profile.get('cuisine_preferences', [])}
+- Flavor profile: {user_profile.get('flavor_profile', {})}
+- Liked foods: {user_profile.get('liked_foods', [])}
+- Disliked foods: {user_profile.get('disliked_foods', [])}
+
+CANDIDATE ITEMS FOR THIS USER (pre-ranked best first, choose one of these):
+{self._format_candidate_items(candidate_items, shown_items)}
+
+ITEMS USER HAS ALREADY REJECTED THIS SESSION:
+{', '.join(current_dislikes) if current_dislikes else 'None'}
+{self.response_instructions(num_items, structured)}"""
+
+    def response_instructions(self, num_items: int, structured: bool = False) -> str:
+        """Response format for one recommendation or a ranked list of them"""
+        if structured:
+            if num_items <= 1:
+                return f"""
+Recommend ONE candidate item that would be perfect for this user by calling the
+{RECOMMEND_TOOL} tool with its id, two or three sentences of reasoning and your confidence.
+"""
+            return f"""
+Recommend the {num_items} best DIFFERENT candidate items for this user, ranked best first,
+by calling the {RECOMMEND_TOOL} tool with their ids, one or two sentences of reasoning
+each and your confidence.
+"""
+        if num_items <= 1:
+            return """
+Please recommend ONE menu item that would be perfect for this user. Respond in JSON format:
 {
-    "recommended_item": "exact menu item name from the list above",
-    "reasoning": "detailed explanation (2-3 sentences) of why this item matches the user's preferences, incorporating their taste profile, dietary needs, and social proof",
+    "recommended_item": "exact menu item name",
+    "reasoning": "two or three sentences on why this item matches the user's preferences",
     "confidence": 0.85,
-    "backup_recommendation": "alternative item name (optional)"
+    "id": "menu_item_id"
 }
+"""
+        return f"""
+Please recommend the {num_items} best DIFFERENT menu items for this user, ranked
+best first. Respond in JSON format:
+{{
+    "recommendations": [
+        {{
+            "recommended_item": "exact menu item name",
+            "reasoning": "one or two sentences on why this item matches the user's preferences",
+            "confidence": 0.85,
+            "id": "menu_item_id"
+        }}
+    ]
+}}
+"""
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "restaurants": len(self._restaurant_sections),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _format_menu_items(
+        self,
+        items: List[Dict[str, Any]],
+        description_chars: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Format menu items for the prompt, one line per item
+
+        description_chars truncates descriptions (0 drops them).
+        """
+        formatted = []
+        seen = set()
+        for i, item in enumerate(items):
+            # DoorDash menus repeat "Most Ordered" items in their own category
+            name = item.get("name", "Unknown")
+            if name in seen:
+                continue
+            seen.add(name)
+            description = item.get("description") or ""
+            if description_chars is not None:
+                description = truncate_text(description, description_chars)
+            formatted.append(
+                f"- id: {item.get('item_id', i)} name: {item.get('name', 'Unknown')} "
+                + (f"description: {description} " if description_chars != 0 else "")
+                + f"price: (${item.get('price', 0)}) "
+                f"category: {item.get('category', 'Unknown')}"
+            )
+        return formatted
+
+    def _fit_menu_items(
+        self, items: List[Dict[str, Any]], budget_tokens: int
+    ) -> Tuple[str, Set[str]]:
+        """
+        The menu section within budget_tokens, and the item names it shows
+
+        Tries the full menu, then shortened descriptions, then no
+        descriptions, and finally cuts items off the end of the menu.
+        """
+        lines = []
+        for description_chars in (None, DESCRIPTION_MAX_CHARS, 0):
+            lines = self._format_menu_items(items, description_chars)
+            if estimate_tokens("\n".join(lines)) <= budget_tokens:
+                break
+
+        shown = fit_lines(lines, budget_tokens)
+        # Lines follow the de-duplicated menu order
+        names: Set[str] = set()
+        for item in items:
+            if len(names) >= len(shown):
+                break
+            names.add(item.get("name", "Unknown"))
+        if len(shown) < len(lines):
+            shown.append(f"(... {len(lines) - len(shown)} more items not listed)")
+        return "\n".join(shown), names
+
+    def _format_candidate_items(
+        self, items: List[Dict[str, Any]], shown_items: Optional[Set[str]] = None
+    ) -> str:
+        """
+        Format the candidate shortlist compactly (details are in the menu)
+
+        Candidates missing from the budget-trimmed menu get a full line.
+        """
+        formatted = []
+        for i, item in enumerate(items):
+            if shown_items is None or item.get("name", "Unknown") in shown_items:
+                formatted.append(
+                    f"- id: {item.get('item_id', i)} name: {item.get('name', 'Unknown')}"
+                )
+            else:
+                formatted.extend(self._format_menu_items([item], DESCRIPTION_MAX_CHARS))
+        return "\n".join(formatted)
+
+    def _format_reviews(
+        self, reviews: List[str], budget_tokens: Optional[int] = None
+    ) -> str:
+        """Format reviews for the prompt, shortening them to fit budget_tokens"""
+        if budget_tokens is None:
+            return "\n".join(reviews)
+        return "\n".join(
+            fit_lines(
+                (truncate_text(review, REVIEW_MAX_CHARS) for review in reviews if review),
+                budget_tokens,
+            )
+        )
 
-IMPORTANT GUIDELINES:
-1. Only recommend items from the menu list provided
-2. Avoid any items the user has already rejected
-3. Consider dietary restrictions as hard constraints
-4. Weight community favorites and positive reviews heavily
-5. Explain your reasoning clearly, mentioning specific preference matches
-6. Confidence should be 0.6-0.95 based on how well the item matches"""
+    def _format_community_favorites(self, favorites: List[Dict[str, Any]]) -> str:
+        """Format community favorites for the prompt"""
+        formatted = []
+        for fav in favorites:
+            formatted.append(f"- name: {fav.get('name', 'Unknown')}")
+        return "\n".join(formatted)
 
 
 class PromptTemplates:
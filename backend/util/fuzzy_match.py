@@ -1,21 +1,76 @@
-from typing import List, Tuple, Optional
+from collections import Counter, defaultdict
+import heapq
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Set, Tuple, Optional, Union
 import re
 from difflib import SequenceMatcher
 
+import numpy as np
+from scipy import sparse
+
+
+class PreparedCandidate(NamedTuple):
+    """A candidate string with the normalized forms every comparison needs"""
+
+    text: str
+    clean: str
+    words: FrozenSet[str]
+    length: int
+
+
+class PreparedMenuItem(NamedTuple):
+    """A menu item with its name and description prepared for matching"""
+
+    item: dict
+    name: PreparedCandidate
+    description: PreparedCandidate
+
+
+Candidate = Union[str, PreparedCandidate]
+
 
 class FuzzyMatcher:
     """Utility class for fuzzy string matching operations"""
 
+    @staticmethod
+    def prepare(text: str) -> PreparedCandidate:
+        """Clean and tokenize a candidate once, for reuse across queries"""
+        clean = FuzzyMatcher._clean_string(text)
+        return PreparedCandidate(text, clean, frozenset(clean.split()), len(clean))
+
+    @staticmethod
+    def prepare_candidates(candidates: Iterable[Candidate]) -> List[PreparedCandidate]:
+        """Prepare a candidate list once (already prepared entries are kept)"""
+        return [
+            candidate if isinstance(candidate, PreparedCandidate) else FuzzyMatcher.prepare(candidate)
+            for candidate in candidates
+        ]
+
+    @staticmethod
+    def prepare_menu_items(
+        menu_items: Iterable[dict],
+        name_field: str = "name",
+        description_field: str = "description",
+    ) -> List[PreparedMenuItem]:
+        """Prepare the names and descriptions of a menu once, for match_menu_items"""
+        return [
+            PreparedMenuItem(
+                item,
+                FuzzyMatcher.prepare(item.get(name_field, "")),
+                FuzzyMatcher.prepare(item.get(description_field, "")),
+            )
+            for item in menu_items
+        ]
+
     @staticmethod
     def find_best_match(
-        query: str, candidates: List[str], threshold: float = 0.6
+        query: str, candidates: List[Candidate], threshold: float = 0.6
     ) -> Optional[Tuple[str, float]]:
         """
         Find the best fuzzy match for a query string among candidates
 
         Args:
             query: The string to match
-            candidates: List of candidate strings
+            candidates: List of candidate strings (or prepared candidates)
             threshold: Minimum similarity score (0-1)
 
         Returns:
@@ -24,24 +79,18 @@ class FuzzyMatcher:
         if not query or not candidates:
             return None
 
-        query_clean = FuzzyMatcher._clean_string(query)
-        best_match = None
-        best_score = 0.0
-
-        for candidate in candidates:
-            candidate_clean = FuzzyMatcher._clean_string(candidate)
-            score = FuzzyMatcher._calculate_similarity(query_clean, candidate_clean)
-
-            if score > best_score and score >= threshold:
-                best_score = score
-                best_match = candidate
+        matches = FuzzyMatcher._ranked_matches(
+            FuzzyMatcher.prepare(query), FuzzyMatcher.prepare_candidates(candidates), threshold, 1
+        )
+        # A match needs a positive score even when the threshold is 0
+        best_match, best_score = matches[0] if matches and matches[0][1] > 0 else (None, 0.0)
 
         return (best_match, best_score) if best_match else None
 
     @staticmethod
     def find_all_matches(
         query: str,
-        candidates: List[str],
+        candidates: List[Candidate],
         threshold: float = 0.6,
         limit: Optional[int] = None,
     ) -> List[Tuple[str, float]]:
@@ -50,7 +99,7 @@ class FuzzyMatcher:
 
         Args:
             query: The string to match
-            candidates: List of candidate strings
+            candidates: List of candidate strings (or prepared candidates)
             threshold: Minimum similarity score (0-1)
             limit: Maximum number of results to return
 
@@ -60,28 +109,17 @@ class FuzzyMatcher:
         if not query or not candidates:
             return []
 
-        query_clean = FuzzyMatcher._clean_string(query)
-        matches = []
-
-        for candidate in candidates:
-            candidate_clean = FuzzyMatcher._clean_string(candidate)
-            score = FuzzyMatcher._calculate_similarity(query_clean, candidate_clean)
-
-            if score >= threshold:
-                matches.append((candidate, score))
-
-        # Sort by score descending
-        matches.sort(key=lambda x: x[1], reverse=True)
-
-        if limit:
-            matches = matches[:limit]
-
-        return matches
+        return FuzzyMatcher._ranked_matches(
+            FuzzyMatcher.prepare(query),
+            FuzzyMatcher.prepare_candidates(candidates),
+            threshold,
+            limit,
+        )
 
     @staticmethod
     def match_menu_items(
         user_input: str,
-        menu_items: List[dict],
+        menu_items: List[Union[dict, PreparedMenuItem]],
         name_field: str = "name",
         description_field: str = "description",
         threshold: float = 0.5,
@@ -91,7 +129,7 @@ class FuzzyMatcher:
 
         Args:
             user_input: User's search query
-            menu_items: List of menu item dictionaries
+            menu_items: List of menu item dictionaries (or prepared menu items)
             name_field: Field name for item name
             description_field: Field name for item description
             threshold: Minimum similarity score
@@ -102,38 +140,189 @@ class FuzzyMatcher:
         if not user_input or not menu_items:
             return []
 
-        user_input_clean = FuzzyMatcher._clean_string(user_input)
+        query_prepared = FuzzyMatcher.prepare(user_input)
         matches = []
 
-        for item in menu_items:
-            name = item.get(name_field, "")
-            description = item.get(description_field, "")
+        for menu_item in menu_items:
+            if not isinstance(menu_item, PreparedMenuItem):
+                menu_item = FuzzyMatcher.prepare_menu_items(
+                    [menu_item], name_field, description_field
+                )[0]
+            combined_score = FuzzyMatcher._score_menu_item(query_prepared, menu_item)
+            if combined_score >= threshold:
+                matches.append((menu_item.item, combined_score))
 
-            # Calculate scores for name and description
-            name_score = FuzzyMatcher._calculate_similarity(
-                user_input_clean, FuzzyMatcher._clean_string(name)
-            )
+        # Sort by score descending
+        matches.sort(key=lambda x: x[1], reverse=True)
+        return matches
 
-            desc_score = FuzzyMatcher._calculate_similarity(
-                user_input_clean, FuzzyMatcher._clean_string(description)
-            )
+    @staticmethod
+    def match_many(
+        queries: List[str],
+        candidates: List[Candidate],
+        top_k: int = 5,
+        threshold: float = 0.6,
+        shortlist_size: Optional[int] = None,
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Top fuzzy matches of every query among the same candidates
 
-            # Weight name matches higher than description matches
-            combined_score = max(name_score * 1.0, desc_score * 0.7)
+        Word overlap and trigram Jaccard similarity of all query/candidate
+        pairs come from sparse matrix products; only each query's
+        shortlist_size best pairs by that measure are scored with the usual
+        similarity. Candidates outside the shortlist are never scored, so
+        this trades exactness for throughput against find_all_matches.
 
-            # Also check for partial word matches
-            partial_score = FuzzyMatcher._check_partial_matches(
-                user_input_clean, name, description
+        Args:
+            queries: The strings to match
+            candidates: List of candidate strings (or prepared candidates)
+            top_k: Maximum number of matches per query
+            threshold: Minimum similarity score (0-1)
+            shortlist_size: Pairs scored per query (default max(4 * top_k, 20))
+
+        Returns:
+            One list of (match, score) tuples per query, sorted by score descending
+        """
+        if not queries:
+            return []
+        if not candidates:
+            return [[] for _ in queries]
+
+        prepared = FuzzyMatcher.prepare_candidates(candidates)
+        query_prepared = [FuzzyMatcher.prepare(query) for query in queries]
+        shortlist_size = min(shortlist_size or max(4 * top_k, 20), len(prepared))
+
+        word_vocabulary: Dict[str, int] = {}
+        gram_vocabulary: Dict[str, int] = {}
+        candidate_words, candidate_word_counts = _feature_matrix(
+            (candidate.words for candidate in prepared), word_vocabulary, grow=True
+        )
+        candidate_grams, candidate_gram_counts = _feature_matrix(
+            (_trigrams(candidate.clean) for candidate in prepared), gram_vocabulary, grow=True
+        )
+        query_words, query_word_counts = _feature_matrix(
+            (query.words for query in query_prepared), word_vocabulary
+        )
+        query_grams, query_gram_counts = _feature_matrix(
+            (_trigrams(query.clean) for query in query_prepared), gram_vocabulary
+        )
+        candidate_words_t = candidate_words.T.tocsr()
+        candidate_grams_t = candidate_grams.T.tocsr()
+
+        results = []
+        # Dense similarity blocks of at most ~4M pairs
+        chunk = max(1, 4_000_000 // len(prepared))
+        for start in range(0, len(query_prepared), chunk):
+            rows = slice(start, start + chunk)
+            similarity = np.maximum(
+                _jaccard(
+                    query_grams[rows] @ candidate_grams_t,
+                    query_gram_counts[rows],
+                    candidate_gram_counts,
+                ),
+                0.8
+                * _jaccard(
+                    query_words[rows] @ candidate_words_t,
+                    query_word_counts[rows],
+                    candidate_word_counts,
+                ),
             )
-            combined_score = max(combined_score, partial_score)
+            if shortlist_size < len(prepared):
+                shortlists = np.argpartition(-similarity, shortlist_size - 1, axis=1)[
+                    :, :shortlist_size
+                ]
+            else:
+                shortlists = np.tile(np.arange(len(prepared)), (similarity.shape[0], 1))
+
+            for query, shortlist in zip(query_prepared[rows], shortlists):
+                matches = []
+                # Candidate order breaks ties, as in find_all_matches
+                for column in np.sort(shortlist):
+                    score = FuzzyMatcher._prepared_similarity(query, prepared[column])
+                    if score >= threshold:
+                        matches.append((prepared[column].text, score))
+                matches.sort(key=lambda x: x[1], reverse=True)
+                results.append(matches[:top_k])
+
+        return results
 
-            if combined_score >= threshold:
-                matches.append((item, combined_score))
+    @staticmethod
+    def _ranked_matches(
+        query: PreparedCandidate,
+        candidates: Iterable[PreparedCandidate],
+        threshold: float,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Candidates scoring at least threshold, best first (earlier candidates first on ties)
+
+        SequenceMatcher.ratio() is by far the most expensive part of a score,
+        so it is skipped whenever its cheap upper bounds (the length-only
+        real_quick_ratio(), then the character-count quick_ratio()) together
+        with the exact word overlap show the candidate can't reach the
+        threshold, or with a limit, beat the current limit-th best match
+        kept in a heap. The result is the same as scoring every candidate.
+        """
+        query_chars = Counter(query.clean)
+        query_length = query.length
+        # Min-heap of the best matches so far; on equal scores the later candidate is evicted
+        heap: List[Tuple[float, int, str]] = []
+        matches = []
+
+        for position, candidate in enumerate(candidates):
+            full = bool(limit) and len(heap) >= limit
+            # With a full heap, merely tying the limit-th best can't displace it
+            floor = max(threshold, heap[0][0]) if full else threshold
+
+            if query.clean and candidate.clean:
+                total_length = query_length + candidate.length
+                word_score = (
+                    len(query.words & candidate.words) / len(query.words | candidate.words) * 0.8
+                )
+                length_bound = 2.0 * min(query_length, candidate.length) / total_length
+                if _cannot_reach(max(length_bound, word_score), floor, full):
+                    continue
+                common_chars = sum(
+                    min(count, query_chars[char])
+                    for char, count in Counter(candidate.clean).items()
+                )
+                if _cannot_reach(max(2.0 * common_chars / total_length, word_score), floor, full):
+                    continue
+
+            score = FuzzyMatcher._prepared_similarity(query, candidate)
+            if _cannot_reach(score, floor, full):
+                continue
+            if not limit:
+                matches.append((candidate.text, score))
+            elif full:
+                heapq.heapreplace(heap, (score, -position, candidate.text))
+            else:
+                heapq.heappush(heap, (score, -position, candidate.text))
+
+        if limit:
+            heap.sort(reverse=True)
+            return [(text, score) for score, _, text in heap]
 
         # Sort by score descending
         matches.sort(key=lambda x: x[1], reverse=True)
         return matches
 
+    @staticmethod
+    def _score_menu_item(query: PreparedCandidate, menu_item: PreparedMenuItem) -> float:
+        """Relevance of one prepared menu item to a prepared query"""
+        # Calculate scores for name and description
+        name_score = FuzzyMatcher._prepared_similarity(query, menu_item.name)
+        desc_score = FuzzyMatcher._prepared_similarity(query, menu_item.description)
+
+        # Weight name matches higher than description matches
+        combined_score = max(name_score * 1.0, desc_score * 0.7)
+
+        # Also check for partial word matches
+        partial_score = FuzzyMatcher._check_partial_matches(
+            query.clean, menu_item.name.clean, menu_item.description.clean
+        )
+        return max(combined_score, partial_score)
+
     @staticmethod
     def _clean_string(text: str) -> str:
         """Clean and normalize string for comparison"""
@@ -153,30 +342,33 @@ class FuzzyMatcher:
 
     @staticmethod
     def _calculate_similarity(str1: str, str2: str) -> float:
-        """Calculate similarity score between two strings"""
-        if not str1 or not str2:
+        """Calculate similarity score between two cleaned strings"""
+        return FuzzyMatcher._prepared_similarity(
+            PreparedCandidate(str1, str1, frozenset(str1.split()), len(str1)),
+            PreparedCandidate(str2, str2, frozenset(str2.split()), len(str2)),
+        )
+
+    @staticmethod
+    def _prepared_similarity(first: PreparedCandidate, second: PreparedCandidate) -> float:
+        """Calculate similarity score between two prepared strings"""
+        if not first.clean or not second.clean:
             return 0.0
 
         # Use SequenceMatcher for basic similarity
-        basic_score = SequenceMatcher(None, str1, str2).ratio()
+        basic_score = SequenceMatcher(None, first.clean, second.clean).ratio()
 
         # Bonus for exact word matches
-        words1 = set(str1.split())
-        words2 = set(str2.split())
-
-        if words1 and words2:
-            word_overlap = len(words1.intersection(words2)) / len(words1.union(words2))
+        if first.words and second.words:
+            word_overlap = len(first.words & second.words) / len(first.words | second.words)
             # Combine scores with word overlap getting some weight
             return max(basic_score, word_overlap * 0.8)
 
         return basic_score
 
     @staticmethod
-    def _check_partial_matches(query: str, name: str, description: str) -> float:
-        """Check for partial word matches in name and description"""
+    def _check_partial_matches(query: str, name_clean: str, desc_clean: str) -> float:
+        """Check for partial word matches in a cleaned name and description"""
         query_words = query.split()
-        name_clean = FuzzyMatcher._clean_string(name)
-        desc_clean = FuzzyMatcher._clean_string(description)
 
         name_matches = 0
         desc_matches = 0
@@ -253,3 +445,250 @@ class RestaurantMatcher:
                 safe_items.append(item)
 
         return safe_items
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Trigrams of a cleaned string, padded so that short strings have some too"""
+    if not text:
+        return set()
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _cannot_reach(bound: float, floor: float, strict: bool) -> bool:
+    """Whether a score bound rules a candidate out (strict: it must beat floor)"""
+    return bound <= floor if strict else bound < floor
+
+
+def _feature_matrix(
+    feature_sets: Iterable[Iterable[str]], vocabulary: Dict[str, int], grow: bool = False
+) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    Binary (rows x vocabulary) matrix of feature sets, with each set's size
+
+    Features missing from the vocabulary are added when grow is set and
+    otherwise left out of the matrix (they still count towards the size).
+    """
+    indptr = [0]
+    columns: List[int] = []
+    sizes = []
+    for features in feature_sets:
+        features = set(features)
+        sizes.append(len(features))
+        for feature in features:
+            column = vocabulary.get(feature)
+            if column is None and grow:
+                column = vocabulary[feature] = len(vocabulary)
+            if column is not None:
+                columns.append(column)
+        indptr.append(len(columns))
+    matrix = sparse.csr_matrix(
+        (np.ones(len(columns), dtype=np.float32), np.asarray(columns, dtype=np.int32), indptr),
+        shape=(len(sizes), max(len(vocabulary), 1)),
+    )
+    return matrix, np.asarray(sizes, dtype=np.float32)
+
+
+def _jaccard(
+    intersections: sparse.csr_matrix, row_sizes: np.ndarray, column_sizes: np.ndarray
+) -> np.ndarray:
+    """Dense Jaccard similarities from intersection counts and set sizes"""
+    intersections = intersections.toarray()
+    unions = row_sizes[:, None] + column_sizes[None, :] - intersections
+    return np.divide(
+        intersections, unions, out=np.zeros_like(intersections), where=unions > 0
+    )
+
+
+# Character count columns; everything else shares the last one, which still
+# bounds the number of common characters from above
+_CHAR_COLUMNS = {char: column for column, char in enumerate("abcdefghijklmnopqrstuvwxyz0123456789 ")}
+_OTHER_CHARS = len(_CHAR_COLUMNS)
+
+
+def _char_counts(text: str) -> Dict[int, int]:
+    counts: Dict[int, int] = defaultdict(int)
+    for char, count in Counter(text).items():
+        counts[_CHAR_COLUMNS.get(char, _OTHER_CHARS)] += count
+    return counts
+
+
+class FuzzyIndex:
+    """
+    Inverted index over a fixed list of candidate strings for fuzzy lookups
+
+    Candidates are kept sorted by length with per-character counts, so a
+    query only looks at the length band that can reach the threshold, drops
+    the candidates whose SequenceMatcher.quick_ratio() is below it (one
+    vectorized pass per query character), adds those sharing a word through
+    the word posting lists, and scores what is left. Both filters are upper
+    bounds of the score, so results (ties and ordering included) are exactly
+    FuzzyMatcher's. Trigram posting lists answer substring lookups.
+    """
+
+    def __init__(self, candidates: Iterable[Candidate]):
+        self._prepared = FuzzyMatcher.prepare_candidates(candidates)
+        self.candidates = [candidate.text for candidate in self._prepared]
+        lengths = np.fromiter(
+            (candidate.length for candidate in self._prepared),
+            dtype=np.int64,
+            count=len(self._prepared),
+        )
+        # Position in length order -> candidate row
+        self._order = np.argsort(lengths, kind="stable")
+        self._sorted_lengths = lengths[self._order]
+        self._word_counts = np.zeros(len(self._prepared), dtype=np.int64)
+        # One row of counts per character column, in length order
+        self._char_counts = np.zeros((_OTHER_CHARS + 1, len(self._prepared)), dtype=np.int32)
+        gram_rows: Dict[str, List[int]] = defaultdict(list)
+        word_positions: Dict[str, List[int]] = defaultdict(list)
+        for position, row in enumerate(self._order):
+            candidate = self._prepared[row]
+            for column, count in _char_counts(candidate.clean).items():
+                self._char_counts[column, position] = count
+            self._word_counts[position] = len(candidate.words)
+            for word in candidate.words:
+                word_positions[word].append(position)
+        for row, candidate in enumerate(self._prepared):
+            for gram in _trigrams(candidate.clean):
+                gram_rows[gram].append(row)
+        self._gram_postings = {
+            gram: np.asarray(rows, dtype=np.int32) for gram, rows in gram_rows.items()
+        }
+        self._word_postings = {
+            word: np.asarray(positions, dtype=np.int32)
+            for word, positions in word_positions.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def shortlist(self, query_clean: str, threshold: float) -> np.ndarray:
+        """Rows (ascending) of the candidates that can score at least threshold"""
+        if threshold <= 0:
+            return np.arange(len(self.candidates))
+        if not query_clean or threshold > 1:
+            return np.zeros(0, dtype=np.int64)
+
+        # ratio() <= 2 * shorter length / total length, which bounds the length band
+        query_length = len(query_clean)
+        start = np.searchsorted(
+            self._sorted_lengths, query_length * threshold / (2 - threshold) - 1e-9, "left"
+        )
+        end = np.searchsorted(
+            self._sorted_lengths, query_length * (2 - threshold) / threshold + 1e-9, "right"
+        )
+        # ratio() <= quick_ratio() = 2 * common characters / total length
+        common_chars = np.zeros(max(end - start, 0), dtype=np.int64)
+        for column, count in _char_counts(query_clean).items():
+            common_chars += np.minimum(self._char_counts[column, start:end], count)
+        bound = 2.0 * common_chars / (self._sorted_lengths[start:end] + query_length)
+        positions = [start + np.flatnonzero(bound >= threshold)]
+
+        # Word overlap counts for 0.8 at most; it is computed exactly from the postings
+        query_words = set(query_clean.split())
+        word_postings = [
+            self._word_postings[word] for word in query_words if word in self._word_postings
+        ]
+        if word_postings and threshold <= 0.8:
+            sharing, shared = np.unique(np.concatenate(word_postings), return_counts=True)
+            union = len(query_words) + self._word_counts[sharing] - shared
+            positions.append(sharing[shared / union * 0.8 >= threshold])
+
+        return np.unique(self._order[np.concatenate(positions)])
+
+    def rows_containing(self, word: str) -> np.ndarray:
+        """Rows whose cleaned text may contain word as a substring (a superset)"""
+        rows = None
+        for start in range(len(word) - 2):
+            postings = self._gram_postings.get(word[start : start + 3])
+            if postings is None:
+                return np.zeros(0, dtype=np.int32)
+            rows = postings if rows is None else np.intersect1d(rows, postings)
+        return rows if rows is not None else np.zeros(0, dtype=np.int32)
+
+    def _ranked(
+        self, query: str, threshold: float, limit: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        query_prepared = FuzzyMatcher.prepare(query)
+        return FuzzyMatcher._ranked_matches(
+            query_prepared,
+            (self._prepared[row] for row in self.shortlist(query_prepared.clean, threshold)),
+            threshold,
+            limit,
+        )
+
+    def find_best_match(
+        self, query: str, threshold: float = 0.6
+    ) -> Optional[Tuple[str, float]]:
+        """Indexed FuzzyMatcher.find_best_match over this index's candidates"""
+        if not query or not self.candidates:
+            return None
+
+        matches = self._ranked(query, threshold, 1)
+        best_match, best_score = matches[0] if matches and matches[0][1] > 0 else (None, 0.0)
+
+        return (best_match, best_score) if best_match else None
+
+    def find_all_matches(
+        self, query: str, threshold: float = 0.6, limit: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """Indexed FuzzyMatcher.find_all_matches over this index's candidates"""
+        if not query or not self.candidates:
+            return []
+
+        return self._ranked(query, threshold, limit)
+
+
+class MenuFuzzyIndex:
+    """Indexed FuzzyMatcher.match_menu_items over one fixed menu"""
+
+    def __init__(
+        self,
+        menu_items: Iterable[Union[dict, PreparedMenuItem]],
+        name_field: str = "name",
+        description_field: str = "description",
+    ):
+        self._prepared = [
+            menu_item
+            if isinstance(menu_item, PreparedMenuItem)
+            else FuzzyMatcher.prepare_menu_items([menu_item], name_field, description_field)[0]
+            for menu_item in menu_items
+        ]
+        self.menu_items = [menu_item.item for menu_item in self._prepared]
+        self.names = FuzzyIndex(menu_item.name for menu_item in self._prepared)
+        self.descriptions = FuzzyIndex(menu_item.description for menu_item in self._prepared)
+
+    def shortlist(self, user_input_clean: str, threshold: float) -> np.ndarray:
+        """Rows (ascending) of the items that can score at least threshold"""
+        if threshold <= 0:
+            return np.arange(len(self.menu_items))
+
+        rows = [
+            self.names.shortlist(user_input_clean, threshold),
+            # Description similarity is weighted by 0.7 (rounded down to stay a superset)
+            self.descriptions.shortlist(user_input_clean, threshold / 0.7 - 1e-9),
+        ]
+        # Partial matches need a query word of 3+ characters inside the name or description
+        for word in set(user_input_clean.split()):
+            if len(word) >= 3:
+                rows.append(self.names.rows_containing(word))
+                rows.append(self.descriptions.rows_containing(word))
+        return np.unique(np.concatenate(rows))
+
+    def match_menu_items(
+        self, user_input: str, threshold: float = 0.5
+    ) -> List[Tuple[dict, float]]:
+        """Menu items matching user_input, as FuzzyMatcher.match_menu_items returns them"""
+        if not user_input or not self.menu_items:
+            return []
+
+        query_prepared = FuzzyMatcher.prepare(user_input)
+        matches = []
+        for row in self.shortlist(query_prepared.clean, threshold):
+            combined_score = FuzzyMatcher._score_menu_item(query_prepared, self._prepared[row])
+            if combined_score >= threshold:
+                matches.append((self.menu_items[row], combined_score))
+
+        matches.sort(key=lambda x: x[1], reverse=True)
+        return matches
@@ -0,0 +1,58 @@
+"""
+In-flight call deduplication ("singleflight").
+
+Concurrent callers asking for the same key share one running task instead of
+each starting their own, e.g. double taps and client retries of the same
+recommendation request share a single LLM call.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class SingleFlight:
+    """Run at most one task per key; later callers await the running one"""
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result for key, starting factory() only if nothing is in flight"""
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.create_task(factory())
+            task.add_done_callback(lambda finished: self._forget(key, finished))
+            self._in_flight[key] = task
+            self.calls += 1
+
+        # A cancelled caller must not cancel the call other callers are waiting on
+        return await asyncio.shield(task)
+
+    async def join(self, key: Hashable) -> Optional[Any]:
+        """Await the in-flight call for key if there is one (None otherwise or on error)"""
+        task = self._in_flight.get(key)
+        if task is None:
+            return None
+        self.coalesced += 1
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            return None
+
+    def _forget(self, key: Hashable, finished: asyncio.Task) -> None:
+        if self._in_flight.get(key) is finished:
+            del self._in_flight[key]
+        # Retrieve the exception so abandoned failures aren't logged as unhandled
+        if not finished.cancelled():
+            finished.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._in_flight),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
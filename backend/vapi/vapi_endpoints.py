@@ -3,7 +3,7 @@ from pydantic import BaseModel
 from fastapi import FastAPI, Request
 from typing import Dict, List, Any, Optional
 import json
-from food_info.info_api import get_restaurant_by_id, RESTAURANTS_LIST_CACHE
+from food_info.info_api import get_restaurant_by_id, get_menu_index, RESTAURANTS_LIST_CACHE
 
 
 router = APIRouter(prefix="/vapi", tags=["vapi"])
@@ -128,12 +128,8 @@ async def add_item_to_cart(request: VapiRequest):
         raise HTTPException(status_code=404, detail=f"Restaurant with ID {restaurant_id} not found")
 
     # Find the item in the specific restaurant
-    item_details = None
-    if "menu_items" in restaurant_data:
-        for item in restaurant_data["menu_items"]:
-            if item.get("item_id") == item_id:
-                item_details = item
-                break
+    menu_entry = get_menu_index(restaurant_id).get(item_id)
+    item_details = menu_entry.item if menu_entry else None
 
     if not item_details:
         raise HTTPException(